@@ -0,0 +1,110 @@
+"""Content-Type negotiation between JSON and binary request bodies."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+from app.domain import (
+    SCORES_MEDIA_TYPE,
+    TELEMETRY_MEDIA_TYPE,
+    BinaryFormatError,
+    TelemetryFrame,
+)
+from app.domain.binary import decode_telemetry_frame
+
+BinaryEndpoint = Callable[[Request], Awaitable[Response]]
+
+
+def media_type(request: Request) -> str:
+    """Return the request's media type without parameters."""
+
+    return request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+def accepts_binary_scores(request: Request) -> bool:
+    """Whether the client asked for score frames instead of JSON."""
+
+    return SCORES_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def read_telemetry_frame(request: Request) -> TelemetryFrame:
+    """Read the body as a telemetry frame; arrays are views over the body bytes."""
+
+    try:
+        return decode_telemetry_frame(await request.body())
+    except BinaryFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def model_version_param(request: Request) -> str | None:
+    """Return the ``model_version`` query parameter used by binary requests."""
+
+    model_version = request.query_params.get("model_version") or None
+    if model_version is not None and len(model_version) > 128:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="model_version must be at most 128 characters",
+        )
+    return model_version
+
+
+def sharded_param(request: Request) -> bool:
+    """Return the ``sharded`` query parameter used by binary ``/ingest`` requests."""
+
+    value = request.query_params.get("sharded", "false").lower()
+    if value not in ("true", "false", "1", "0"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sharded must be true or false",
+        )
+    return value in ("true", "1")
+
+
+def binary_variant(
+    binary_endpoint: BinaryEndpoint,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Attach a handler for ``TELEMETRY_MEDIA_TYPE`` bodies to a JSON endpoint.
+
+    Must be applied below the router decorator so the route sees it when it is
+    registered.
+    """
+
+    def decorator(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        endpoint.__binary_endpoint__ = binary_endpoint
+        return endpoint
+
+    return decorator
+
+
+class BinaryNegotiatingRoute(APIRoute):
+    """APIRoute that dispatches binary telemetry bodies to an alternate handler.
+
+    JSON requests go through FastAPI's normal validation and serialisation;
+    requests whose ``Content-Type`` is ``TELEMETRY_MEDIA_TYPE`` skip body
+    parsing entirely and are handed the raw ``Request``.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, endpoint, **kwargs)
+        if getattr(endpoint, "__binary_endpoint__", None) is not None:
+            extra = self.openapi_extra or {}
+            content = extra.setdefault("requestBody", {}).setdefault("content", {})
+            content[TELEMETRY_MEDIA_TYPE] = {"schema": {"type": "string", "format": "binary"}}
+            self.openapi_extra = extra
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        json_handler = super().get_route_handler()
+        binary_endpoint: BinaryEndpoint | None = getattr(self.endpoint, "__binary_endpoint__", None)
+        if binary_endpoint is None:
+            return json_handler
+
+        async def handler(request: Request) -> Response:
+            if media_type(request) == TELEMETRY_MEDIA_TYPE:
+                return await binary_endpoint(request)
+            return await json_handler(request)
+
+        return handler
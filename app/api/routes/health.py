@@ -2,10 +2,12 @@
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 
 from app.config import settings
-from app.core.database import check_database_health
+from app.core.database import get_database_health
+from app.services.warmup import get_warm_up_state
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -23,14 +25,40 @@ async def health_check():
 
 @router.get("/health/ready")
 async def readiness_check():
-    """Readiness check endpoint that includes database connectivity."""
-    db_status = await check_database_health()
-    return {
-        "status": "ready",
+    """Readiness check endpoint that includes database connectivity.
+
+    Returns 503 until the startup model warm-up has succeeded, and keeps
+    returning it if the warm-up failed. Reports the result of the last
+    background database check and its age rather than querying the database
+    on every probe.
+    """
+    warm_up = get_warm_up_state()
+    db_health = get_database_health()
+    if not settings.database_url:
+        database = "not configured"
+    elif db_health is None:
+        database = "unknown"
+    else:
+        database = "connected" if db_health.healthy else "unavailable"
+    if warm_up.ready:
+        readiness = "ready"
+    else:
+        readiness = "warm_up_failed" if warm_up.status == "failed" else "warming_up"
+    body = {
+        "status": readiness,
         "version": settings.app_version,
         "environment": settings.environment,
-        "database": "connected" if db_status and settings.database_url else "not configured",
+        "database": database,
+        "database_checked_seconds_ago": (
+            round(db_health.age_seconds, 3) if db_health is not None else None
+        ),
+        "warm_up": warm_up.status,
+        "model_version": warm_up.model_version,
+        "warm_up_error": warm_up.error,
     }
+    if not warm_up.ready:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    return body
 
 
 @router.get("/healthz")
@@ -4,27 +4,240 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from app.domain import ModelTrainingResponse, TelemetryBatch
+from app.api.negotiation import (
+    BinaryNegotiatingRoute,
+    binary_variant,
+    model_version_param,
+    read_telemetry_frame,
+    sharded_param,
+)
+from app.config import settings
+from app.domain import SweepRequest, TelemetryBatch, TrainingJobStatus
 from app.services.scoring import IsolationForestScoringService, get_scoring_service
+from app.services.streaming import (
+    NDJSON_MEDIA_TYPE,
+    TelemetryStreamError,
+    read_feature_reservoir,
+)
+from app.services.telemetry_store import (
+    frame_rows,
+    persist_telemetry,
+    record_rows,
+    stream_rows,
+)
+from app.services.training_jobs import (
+    TrainingJobManager,
+    TrainingQueueFullError,
+    get_training_job_manager,
+)
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=BinaryNegotiatingRoute)
 
 
-@router.post("/ingest", response_model=ModelTrainingResponse, status_code=status.HTTP_201_CREATED)
+def _queue_full(exc: TrainingQueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(exc),
+        headers={"Retry-After": "5"},
+    )
+
+
+async def _ingest_binary(request: Request) -> Response:
+    frame = await read_telemetry_frame(request)
+    model_version = model_version_param(request)
+    try:
+        job = get_training_job_manager().submit_frame(
+            get_scoring_service(), frame, model_version, sharded=sharded_param(request)
+        )
+    except TrainingQueueFullError as exc:
+        logger.warning("Telemetry frame rejected: %s", exc)
+        raise _queue_full(exc) from exc
+
+    await persist_telemetry(frame_rows("ingest", frame, model_version))
+    logger.info("Binary telemetry ingestion queued as job %s", job.job_id)
+    return Response(
+        job.model_dump_json(), status_code=status.HTTP_202_ACCEPTED, media_type="application/json"
+    )
+
+
+@router.post("/ingest", response_model=TrainingJobStatus, status_code=status.HTTP_202_ACCEPTED)
+@binary_variant(_ingest_binary)
 async def ingest_telemetry(
-    batch: TelemetryBatch, service: IsolationForestScoringService = Depends(get_scoring_service)
-) -> ModelTrainingResponse:
-    """Train or update the anomaly detection model with a batch of telemetry data."""
+    batch: TelemetryBatch,
+    service: IsolationForestScoringService = Depends(get_scoring_service),
+    jobs: TrainingJobManager = Depends(get_training_job_manager),
+) -> TrainingJobStatus:
+    """Queue a training job for a batch of telemetry data and return its job id."""
 
     try:
-        result = service.train(batch)
-    except ValueError as exc:  # pragma: no cover - defensive guard
+        job = jobs.submit(service, batch)
+    except TrainingQueueFullError as exc:
         logger.warning("Telemetry batch rejected: %s", exc)
+        raise _queue_full(exc) from exc
+
+    await persist_telemetry(record_rows("ingest", batch.records, batch.model_version))
+    logger.info("Telemetry ingestion queued as job %s", job.job_id)
+    return job
+
+
+@router.post(
+    "/ingest/update", response_model=TrainingJobStatus, status_code=status.HTTP_202_ACCEPTED
+)
+async def update_model(
+    batch: TelemetryBatch,
+    base_version: str | None = Query(default=None, max_length=128),
+    service: IsolationForestScoringService = Depends(get_scoring_service),
+    jobs: TrainingJobManager = Depends(get_training_job_manager),
+) -> TrainingJobStatus:
+    """Queue an incremental update that refreshes part of an existing model's forest.
+
+    Fresh trees are grown on the batch and replace the oldest trees of
+    ``base_version`` (default: the latest model); the result is published as a
+    new version.
+    """
+
+    try:
+        job = jobs.submit_update(service, batch, base_version)
+    except TrainingQueueFullError as exc:
+        logger.warning("Telemetry update rejected: %s", exc)
+        raise _queue_full(exc) from exc
+
+    await persist_telemetry(record_rows("ingest", batch.records, base_version))
+    logger.info("Incremental model update queued as job %s", job.job_id)
+    return job
+
+
+@router.post(
+    "/ingest/sweep", response_model=TrainingJobStatus, status_code=status.HTTP_202_ACCEPTED
+)
+async def sweep_hyperparameters(
+    request: SweepRequest,
+    service: IsolationForestScoringService = Depends(get_scoring_service),
+    jobs: TrainingJobManager = Depends(get_training_job_manager),
+) -> TrainingJobStatus:
+    """Queue a sweep that fits every configuration of a grid and publishes the best.
+
+    The job result lists every candidate with its evaluation score, fit
+    time, scoring latency and model size; only one version is published.
+    """
+
+    if request.grid.size > settings.sweep_max_candidates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Grid has {request.grid.size} candidates, "
+                f"the limit is {settings.sweep_max_candidates}"
+            ),
+        )
+    try:
+        job = jobs.submit_sweep(service, request, settings.sweep_max_workers)
+    except TrainingQueueFullError as exc:
+        logger.warning("Hyperparameter sweep rejected: %s", exc)
+        raise _queue_full(exc) from exc
+
+    await persist_telemetry(record_rows("ingest", request.records, request.model_version))
+    logger.info(
+        "Hyperparameter sweep of %d candidates queued as job %s", request.grid.size, job.job_id
+    )
+    return job
+
+
+@router.post(
+    "/ingest/stream",
+    response_model=TrainingJobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def ingest_telemetry_stream(
+    request: Request,
+    model_version: str | None = Query(default=None, max_length=128),
+    sharded: bool = Query(default=False),
+    service: IsolationForestScoringService = Depends(get_scoring_service),
+    jobs: TrainingJobManager = Depends(get_training_job_manager),
+) -> TrainingJobStatus:
+    """Queue a training job from an NDJSON body of telemetry records, one per line.
+
+    Records are parsed incrementally without building a model object per
+    row, and a uniform sample of ``TRAINING_RESERVOIR_SIZE`` of them is kept
+    for fitting, so memory stays bounded however long the stream is. Rolling
+    features and, with ``sharded``, shard models are built as for ``/ingest``.
+    Records are persisted as they are parsed.
+    """
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type != NDJSON_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected Content-Type {NDJSON_MEDIA_TYPE}",
+        )
+
+    async def persist(
+        vehicle_ids: list[str], timestamps: list[float], feature_vectors: list[list[float]]
+    ) -> None:
+        await persist_telemetry(
+            stream_rows("ingest", vehicle_ids, timestamps, feature_vectors, model_version)
+        )
+
+    try:
+        sample = await read_feature_reservoir(
+            request.stream(),
+            service.config.reservoir_size,
+            service.config.random_state,
+            rolling=service.stream_rolling_engine,
+            on_records=persist,
+        )
+    except TelemetryStreamError as exc:
+        logger.warning("Telemetry stream rejected: %s", exc)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    reservoir = sample.reservoir
+    if reservoir.n_seen == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Telemetry stream contained no records"
+        )
+
+    try:
+        job = jobs.submit_matrix(
+            service,
+            reservoir.sample(),
+            model_version,
+            records_seen=reservoir.n_seen,
+            vehicle_ids=reservoir.sample_vehicle_ids() if sharded else None,
+            feature_layout=sample.feature_layout,
+        )
+    except TrainingQueueFullError as exc:
+        logger.warning("Telemetry stream rejected: %s", exc)
+        raise _queue_full(exc) from exc
+
+    logger.info("Streamed telemetry ingestion queued as job %s", job.job_id)
+    return job
+
+
+# The job routes are plain functions: FastAPI runs them in its thread pool,
+# since a shared job status store answers over the network.
+@router.get("/ingest/jobs", response_model=list[TrainingJobStatus])
+def list_training_jobs(
+    jobs: TrainingJobManager = Depends(get_training_job_manager),
+) -> list[TrainingJobStatus]:
+    """List recent training jobs, oldest first."""
+
+    return jobs.list()
+
 
-    logger.info("Telemetry ingestion completed for version %s", result.model_version)
-    return result
+@router.get("/ingest/jobs/{job_id}", response_model=TrainingJobStatus)
+def get_training_job(
+    job_id: str, jobs: TrainingJobManager = Depends(get_training_job_manager)
+) -> TrainingJobStatus:
+    """Return the state, duration and result of a training job."""
 
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown job '{job_id}'")
+    return job
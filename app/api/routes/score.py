@@ -4,34 +4,155 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
-from app.domain import ScoreRequest, ScoreResponse
+from app.api.negotiation import (
+    BinaryNegotiatingRoute,
+    accepts_binary_scores,
+    binary_variant,
+    model_version_param,
+    read_telemetry_frame,
+)
+from app.api.responses import batch_scores_response, model_response
+from app.domain import (
+    SCORES_MEDIA_TYPE,
+    BatchScoreRequest,
+    BatchScoreResponse,
+    ScoreRequest,
+    ScoreResponse,
+    TelemetryFrame,
+)
+from app.domain.binary import encode_scores
 from app.services.scoring import IsolationForestScoringService, get_scoring_service
+from app.services.telemetry_store import frame_rows, persist_telemetry
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=BinaryNegotiatingRoute)
+
+
+def _score_frame(
+    frame: TelemetryFrame, model_version: str | None
+) -> tuple[str, list[str], np.ndarray]:
+    try:
+        return get_scoring_service().score_matrix(
+            frame.features, model_version, frame.vehicle_ids, frame.timestamps
+        )
+    except FileNotFoundError as exc:
+        logger.error("Model version not available: %s", exc)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+async def _score_binary(request: Request) -> Response:
+    frame = await read_telemetry_frame(request)
+    if frame.n_records != 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="POST /score takes exactly one record; use /score/batch for more",
+        )
+    model_version = model_version_param(request)
+    await get_scoring_service().ensure_loaded(model_version, frame.vehicle_ids)
+    model_version, row_versions, anomaly_scores = _score_frame(frame, model_version)
+    rows = frame_rows(
+        "score", frame, anomaly_scores=anomaly_scores.tolist(), row_versions=row_versions
+    )
+    await persist_telemetry(rows)
+    if accepts_binary_scores(request):
+        return Response(encode_scores(model_version, anomaly_scores), media_type=SCORES_MEDIA_TYPE)
+
+    anomaly_score = float(anomaly_scores[0])
+    response = ScoreResponse(
+        vehicle_id=frame.vehicle_ids[0],
+        timestamp=frame.timestamp(0),
+        model_version=row_versions[0],
+        anomaly_score=anomaly_score,
+        is_anomaly=anomaly_score < 0,
+    )
+    return model_response(response)
+
+
+async def _score_batch_binary(request: Request) -> Response:
+    frame = await read_telemetry_frame(request)
+    model_version = model_version_param(request)
+    await get_scoring_service().ensure_loaded(model_version, frame.vehicle_ids)
+    model_version, row_versions, anomaly_scores = _score_frame(frame, model_version)
+    rows = frame_rows(
+        "score", frame, anomaly_scores=anomaly_scores.tolist(), row_versions=row_versions
+    )
+    await persist_telemetry(rows)
+    if accepts_binary_scores(request):
+        return Response(encode_scores(model_version, anomaly_scores), media_type=SCORES_MEDIA_TYPE)
+
+    timestamps = [frame.timestamp(index) for index in range(frame.n_records)]
+    return batch_scores_response(frame.vehicle_ids, timestamps, row_versions, anomaly_scores)
 
 
 @router.post("/score", response_model=ScoreResponse, status_code=status.HTTP_200_OK)
+@binary_variant(_score_binary)
 async def score_telemetry(
     request: ScoreRequest, service: IsolationForestScoringService = Depends(get_scoring_service)
-) -> ScoreResponse:
+) -> Response:
     """Score a telemetry record for anomalies using the configured isolation forest model."""
 
+    await service.ensure_loaded(request.model_version, [request.vehicle_id])
     try:
-        response = service.score(request)
+        if service.micro_batcher is not None:
+            response = await service.micro_batcher.score(request)
+        else:
+            response = service.score(request)
     except FileNotFoundError as exc:
         logger.error("Model version not available: %s", exc)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
-    except (TypeError, ValueError) as exc:  # pragma: no cover - defensive guard
+    except (TypeError, ValueError) as exc:
         logger.exception("Failed to score telemetry")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    logger.info(
+    await persist_telemetry(
+        [
+            (
+                "score",
+                request.vehicle_id,
+                request.timestamp,
+                request.feature_vector,
+                response.model_version,
+                response.anomaly_score,
+            )
+        ]
+    )
+    logger.debug(
         "Telemetry scored for vehicle %s with version %s",
         response.vehicle_id,
         response.model_version,
     )
-    return response
+    return model_response(response)
 
+
+@router.post("/score/batch", response_model=BatchScoreResponse, status_code=status.HTTP_200_OK)
+@binary_variant(_score_batch_binary)
+async def score_telemetry_batch(
+    batch: BatchScoreRequest, service: IsolationForestScoringService = Depends(get_scoring_service)
+) -> Response:
+    """Score many telemetry records at once, reporting per-record validation errors."""
+
+    await service.ensure_batch_loaded(batch)
+    response = service.score_batch(batch)
+    await persist_telemetry(
+        (
+            "score",
+            result.vehicle_id,
+            result.timestamp,
+            [float(value) for value in batch.records[result.index]["feature_vector"]],
+            result.model_version,
+            result.anomaly_score,
+        )
+        for result in response.results
+        if result.error is None
+    )
+    logger.info(
+        "Telemetry batch scored: %d records, %d errors",
+        response.scored_count,
+        response.error_count,
+    )
+    return model_response(response)
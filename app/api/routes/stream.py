@@ -0,0 +1,245 @@
+"""Streaming anomaly scoring over a long-lived WebSocket."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from fastapi import APIRouter, WebSocket, status
+from jose import JWTError
+
+from app.api.responses import encode_json
+from app.config import settings
+from app.core.auth import decode_token
+from app.core.metrics import STREAM_BATCH_MESSAGES, STREAM_SESSIONS
+from app.domain import BatchScoreRequest
+from app.services.scoring import IsolationForestScoringService, get_scoring_service
+from app.services.telemetry_store import persist_telemetry
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@dataclass(slots=True)
+class _Message:
+    """One client message: records to score, or the reason it was rejected."""
+
+    id: Any = None
+    records: list[Any] | None = None
+    error: str | None = None
+
+
+def _authenticate(websocket: WebSocket, token: str | None) -> dict | None:
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    if not token:
+        return None
+    try:
+        return decode_token(token)
+    except JWTError:
+        return None
+
+
+def _parse_message(payload: str | bytes, max_records: int) -> _Message:
+    try:
+        body = orjson.loads(payload)
+    except orjson.JSONDecodeError as exc:
+        return _Message(error=f"Message is not valid JSON: {exc}")
+    if not isinstance(body, dict):
+        return _Message(error="Message must be a JSON object")
+
+    message_id = body.get("id")
+    records = body.get("records")
+    if records is None:
+        # A bare record is shorthand for a batch of one.
+        records = [{key: value for key, value in body.items() if key != "id"}]
+    if not isinstance(records, list) or not records:
+        return _Message(message_id, error="records must be a non-empty list")
+    if len(records) > max_records:
+        msg = f"Message holds {len(records)} records, the limit is {max_records}"
+        return _Message(message_id, error=msg)
+    for record in records:
+        if isinstance(record, dict):
+            # The session's model version applies to every record.
+            record.pop("model_version", None)
+    return _Message(message_id, records)
+
+
+class _StreamSession:
+    """Reader and scorer of one connection, joined by a bounded queue.
+
+    The reader stops receiving while ``max_pending`` messages are queued, so
+    a client that sends faster than it is scored is slowed down by the
+    transport instead of growing server memory. The scorer takes the first
+    queued message, waits up to ``window`` seconds for more (until
+    ``max_records`` are collected), scores them in one pass and replies to
+    each message in the order received.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        service: IsolationForestScoringService,
+        model_version: str,
+        window: float,
+        max_records: int,
+        max_pending: int,
+    ):
+        self.websocket = websocket
+        self.service = service
+        self.model_version = model_version
+        self.window = window
+        self.max_records = max_records
+        self.queue: asyncio.Queue[_Message] = asyncio.Queue(max(1, max_pending))
+
+    async def run(self) -> None:
+        reader = asyncio.create_task(self._read_loop())
+        scorer = asyncio.create_task(self._score_loop())
+        try:
+            done, _ = await asyncio.wait({reader, scorer}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # Once the client has gone (or a reply failed) neither side can proceed.
+            for task in (reader, scorer):
+                task.cancel()
+            await asyncio.gather(reader, scorer, return_exceptions=True)
+        if scorer in done and not scorer.cancelled() and scorer.exception() is not None:
+            logger.warning("Score stream ended: %r", scorer.exception())
+
+    async def _read_loop(self) -> None:
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            payload = message.get("text")
+            if payload is None:
+                payload = message.get("bytes", b"")
+            await self.queue.put(_parse_message(payload, self.max_records))
+
+    async def _score_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            messages = [await self.queue.get()]
+            n_records = len(messages[0].records or ())
+            deadline = loop.time() + self.window
+            while n_records < self.max_records:
+                try:
+                    if self.queue.empty():
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        message = await asyncio.wait_for(self.queue.get(), remaining)
+                    else:
+                        message = self.queue.get_nowait()
+                except TimeoutError:
+                    break
+                messages.append(message)
+                n_records += len(message.records or ())
+            await self._score(messages)
+
+    async def _score(self, messages: list[_Message]) -> None:
+        STREAM_BATCH_MESSAGES.observe(len(messages))
+        records = [record for message in messages for record in message.records or ()]
+        results = []
+        if records:
+            # Skip re-validating the envelope; score_batch validates each record.
+            batch = BatchScoreRequest.model_construct(
+                records=records, model_version=self.model_version
+            )
+            response = await asyncio.to_thread(self.service.score_batch, batch)
+            results = response.results
+
+        offset = 0
+        for message in messages:
+            if message.error is not None:
+                await self._send({"type": "error", "id": message.id, "detail": message.error})
+                continue
+            count = len(message.records)
+            replies = []
+            for result in results[offset : offset + count]:
+                reply = result.model_dump()
+                reply["index"] -= offset
+                replies.append(reply)
+            offset += count
+            error_count = sum(1 for reply in replies if reply["error"] is not None)
+            await self._send(
+                {
+                    "type": "scores",
+                    "id": message.id,
+                    "results": replies,
+                    "scored_count": count - error_count,
+                    "error_count": error_count,
+                }
+            )
+
+        await persist_telemetry(
+            (
+                "score",
+                result.vehicle_id,
+                result.timestamp,
+                [float(value) for value in records[result.index]["feature_vector"]],
+                result.model_version,
+                result.anomaly_score,
+            )
+            for result in results
+            if result.error is None
+        )
+
+    async def _send(self, content: dict[str, Any]) -> None:
+        await self.websocket.send_text(encode_json(content).decode())
+
+
+@router.websocket("/score/stream")
+async def score_stream(
+    websocket: WebSocket, model_version: str | None = None, token: str | None = None
+) -> None:
+    """Score a continuous feed of telemetry records over one WebSocket session.
+
+    The client authenticates once when connecting and the session is pinned
+    to ``model_version`` (default: LATEST at connect time). Each message is a
+    record or ``{"id": ..., "records": [...]}`` and is answered, in order,
+    with a ``scores`` message shaped like a batch scoring response.
+    """
+
+    if settings.stream_auth_required and _authenticate(websocket, token) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    service = get_scoring_service()
+    await websocket.accept()
+    try:
+        # Reading the version's metadata may download it from S3.
+        pinned_version = await asyncio.to_thread(service.pin_version, model_version)
+    except FileNotFoundError as exc:
+        await websocket.send_text(encode_json({"type": "error", "detail": str(exc)}).decode())
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    await service.ensure_loaded(pinned_version)
+    await websocket.send_text(
+        encode_json(
+            {
+                "type": "ready",
+                "model_version": pinned_version,
+                "max_records": settings.stream_max_batch_records,
+                "max_pending_messages": settings.stream_max_pending_messages,
+            }
+        ).decode()
+    )
+
+    session = _StreamSession(
+        websocket,
+        service,
+        pinned_version,
+        window=settings.stream_batch_window_seconds,
+        max_records=settings.stream_max_batch_records,
+        max_pending=settings.stream_max_pending_messages,
+    )
+    STREAM_SESSIONS.inc()
+    try:
+        await session.run()
+    finally:
+        STREAM_SESSIONS.dec()
+    logger.debug("Score stream for model version %s closed", pinned_version)
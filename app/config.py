@@ -15,9 +15,25 @@ class Settings(BaseSettings):
     environment: str = "development"
     debug: bool = True
     log_level: str = "INFO"
+    log_json: bool = False  # One JSON object per log line instead of plain text
+    log_queue_size: int = 10_000  # Records buffered for the log writer thread before dropping
+    access_log_sample_rates: dict[str, float] = {}  # e.g. {"/score": 0.01}; 5xx always logged
 
     # Database
     database_url: str | None = None
+    database_pool_size: int = 5  # Connections kept open per task
+    database_max_overflow: int = 10  # Extra connections allowed under burst load
+    database_pool_timeout_seconds: float = 30.0  # Wait for a free connection before erroring
+    database_pool_recycle_seconds: int = 1800  # Replace connections older than this
+    database_pool_pre_ping: bool = False  # Ping on every checkout (costs a round trip)
+    database_health_check_interval_seconds: float = 15.0  # Background readiness check period
+
+    # Telemetry persistence (only active when DATABASE_URL is set)
+    telemetry_persistence_enabled: bool = True
+    telemetry_flush_rows: int = 1_000  # Buffered rows that trigger a flush
+    telemetry_flush_interval_seconds: float = 1.0  # Max age of a buffered row before flushing
+    telemetry_buffer_max_rows: int = 50_000  # Buffered + in-flight rows before writers wait
+    telemetry_enqueue_timeout_seconds: float = 0.5  # Wait for buffer space before dropping rows
 
     # Security
     secret_key: str = ""  # Will be generated if empty
@@ -30,10 +46,21 @@ class Settings(BaseSettings):
     s3_bucket_name: str = ""  # S3 bucket for model storage
     aws_region: str = "us-east-1"
     use_local_storage: bool = True  # Use local storage if True, S3 if False
+    s3_prefix: str = "models/"  # Key prefix for artifacts and the LATEST pointer
+    s3_multipart_threshold_bytes: int = 8 * 1024 * 1024  # Larger objects use multipart transfer
+    s3_multipart_chunk_bytes: int = 8 * 1024 * 1024
+    s3_max_concurrency: int = 8  # Parallel part transfers per object
+    s3_prefetch_interval_seconds: float = 15.0  # Remote LATEST poll period
+    artifact_cache_dir: str = "artifact-cache"  # Local copies of artifacts fetched from S3
+    artifact_cache_max_bytes: int = 1024 * 1024 * 1024
+    artifact_cache_revalidate_seconds: float = 60.0  # Reuse cached files this long without a HEAD
     
     # Rate Limiting
     rate_limit_enabled: bool = True
     rate_limit_per_minute: int = 60
+    rate_limit_backend: str = "memory"  # "memory" (per task) or "redis" (shared across tasks)
+    rate_limit_redis_url: str | None = None
+    rate_limit_trusted_proxy_hops: int = 1  # Proxies (e.g. the ALB) appending to X-Forwarded-For
 
     # Sentry
     sentry_dsn: str | None = None
@@ -41,8 +68,64 @@ class Settings(BaseSettings):
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
+    web_workers: int = 1  # gunicorn worker processes; state and metrics are per worker
+    preload_recent_versions: int = 0  # Versions besides LATEST loaded before forking workers
     model_artifact_dir: str = "artifacts"
 
+    # Model cache
+    model_cache_max_entries: int = 4  # Number of model versions kept in memory
+    model_cache_max_bytes: int = 256 * 1024 * 1024  # Approximate memory budget for cached models
+
+    # Training jobs
+    training_max_concurrent_jobs: int = 1  # Worker processes fitting models in parallel
+    training_max_pending_jobs: int = 8  # Queued + running jobs before /ingest returns 503
+    training_job_history: int = 100  # Finished jobs kept for status queries
+    training_job_store: str = "memory"  # "memory" (per worker) or "redis" (shared by workers)
+    training_job_redis_url: str | None = None
+    training_job_ttl_seconds: int = 86_400  # How long the redis store keeps a job's status
+    training_window_size: int = 10_000  # Recent rows kept per model lineage
+    incremental_update_trees: int = 20  # Trees replaced by each /ingest/update
+    training_max_samples: int = 0  # Rows drawn per tree; 0 means min(256, rows)
+    training_max_features: float = 1.0  # Fraction of features drawn per tree
+    training_n_jobs: int = -1  # Threads fitting the trees of one job; -1 uses every core
+    training_reservoir_size: int = 100_000  # Rows sampled from /ingest/stream bodies
+    sweep_max_workers: int = 0  # Processes fitting sweep candidates; 0 means one per CPU
+    sweep_max_candidates: int = 64  # Largest grid /ingest/sweep accepts
+
+    # Sharding
+    shard_by: str = "vehicle_id"  # Shard key for sharded training: vehicle_id or segment
+    shard_segment_pattern: str = r"^([A-Za-z]+)"  # Segment = first group matched on vehicle_id
+    shard_min_records: int = 50  # Shards with fewer records are scored by the global model
+    shard_cache_max_entries: int = 256  # Shard models kept in memory, loaded again on demand
+    shard_cache_max_bytes: int = 256 * 1024 * 1024
+
+    # Streaming (/score/stream WebSocket)
+    stream_auth_required: bool = True  # JWT checked once at connect (?token= or Bearer header)
+    stream_batch_window_seconds: float = 0.005  # Messages arriving within it share a forest pass
+    stream_max_batch_records: int = 1_000  # Records per message; a pass stops adding past this
+    stream_max_pending_messages: int = 32  # Queued messages before the server stops reading
+
+    # Rolling features
+    rolling_window: int = 0  # Records per vehicle behind rolling statistics; 0 disables them
+    rolling_stats: list[str] = ["mean", "var", "min", "max", "rate"]  # Appended in this order
+    rolling_max_bytes: int = 64 * 1024 * 1024  # Memory budget for live per-vehicle windows
+    rolling_idle_seconds: float = 3600.0  # Drop a vehicle's window after this long without data
+
+    # Inference
+    hot_reload_interval_seconds: float = 1.0  # LATEST poll period for hot reload; 0 disables
+    warm_up_enabled: bool = True  # Load and exercise LATEST at startup; not ready until done
+    warm_up_iterations: int = 3  # Synthetic single-row and batch scoring rounds
+    score_cache_enabled: bool = False  # Reuse scores of repeated feature vectors
+    score_cache_max_entries: int = 100_000
+    score_cache_ttl_seconds: float = 60.0  # 0 keeps entries until evicted or LATEST changes
+    score_cache_quantum: float = 0.0  # Round features to this step before hashing; 0 is exact
+    micro_batching_enabled: bool = False  # Coalesce concurrent /score calls into matrix passes
+    micro_batch_max_size: int = 64  # Rows that trigger an immediate flush
+    micro_batch_max_wait_seconds: float = 0.002  # Longest a row waits for others to join
+    # "sklearn", "flat" (compiled NumPy node arrays) or "mmap" (flat arrays
+    # memory-mapped from the .forest artifact and shared between workers)
+    scoring_engine: str = "sklearn"
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Generate a random secret key if not provided
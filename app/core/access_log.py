@@ -0,0 +1,158 @@
+"""Non-blocking logging setup and pure ASGI access-log middleware."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+access_logger = logging.getLogger("app.access")
+
+_listener: QueueListener | None = None
+_queue_handler: _DroppingQueueHandler | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as one JSON object per line, including access-log fields."""
+
+    _FIELDS = ("method", "path", "status", "duration_ms", "client")
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        payload.update({field: getattr(record, field) for field in self._FIELDS if hasattr(record, field)})
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            type(self).dropped += 1
+
+
+def configure_logging(level: str = "INFO", json_format: bool = False, max_queue: int = 10_000) -> None:
+    """Route all logging through a bounded queue drained by a background thread.
+
+    Request handlers only pay for enqueuing a record; formatting and the
+    stdout write happen on the listener thread.
+    """
+
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=max_queue)
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level.upper()))
+    _queue_handler = _DroppingQueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def _restart_after_fork() -> None:
+    """Give a forked worker its own queue and listener thread.
+
+    Threads do not survive ``fork``, and the parent's queue may have been
+    locked mid-operation, so both are replaced rather than reused.
+    """
+
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=_queue_handler.queue.maxsize)
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class AccessLogMiddleware:
+    """Pure ASGI middleware emitting one structured access record per request.
+
+    ``sample_rates`` maps exact request paths to the fraction of successful
+    requests that are logged; responses with status >= 500 are always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rates: dict[str, float] | None = None):
+        self.app = app
+        self.sample_rates = sample_rates or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._log(scope, status_code, time.perf_counter() - started)
+
+    def _log(self, scope: Scope, status_code: int, elapsed: float) -> None:
+        if not access_logger.isEnabledFor(logging.INFO):
+            return
+        path = scope["path"]
+        rate = self.sample_rates.get(path)
+        if rate is not None and status_code < 500 and random.random() >= rate:
+            return
+
+        duration_ms = round(elapsed * 1000, 3)
+        client = scope.get("client")
+        access_logger.info(
+            "%s %s %d %.3fms",
+            scope["method"],
+            path,
+            status_code,
+            duration_ms,
+            extra={
+                "method": scope["method"],
+                "path": path,
+                "status": status_code,
+                "duration_ms": duration_ms,
+                "client": client[0] if client else None,
+            },
+        )
@@ -30,6 +30,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def decode_token(token: str) -> dict:
+    """Decode a JWT, raising ``JWTError`` if it is invalid or expired."""
+    jwt_secret = settings.jwt_secret or settings.secret_key
+    return jwt.decode(token, jwt_secret, algorithms=[settings.jwt_algorithm])
+
+
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Verify and decode JWT token."""
     token = credentials.credentials
@@ -40,9 +46,7 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
     )
     
     try:
-        jwt_secret = settings.jwt_secret or settings.secret_key
-        payload = jwt.decode(token, jwt_secret, algorithms=[settings.jwt_algorithm])
-        return payload
+        return decode_token(token)
     except JWTError:
         raise credentials_exception
 
@@ -1,8 +1,12 @@
 """Database utilities with SQLAlchemy async support."""
 
+import asyncio
 import logging
+import time
+from dataclasses import dataclass
 from typing import AsyncGenerator, Optional
 
+from sqlalchemy import make_url, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool
@@ -16,6 +20,22 @@ engine = None
 async_session_maker = None
 
 
+@dataclass(slots=True, frozen=True)
+class DatabaseHealth:
+    """Result of the most recent background database check."""
+
+    healthy: bool
+    checked_at: float  # time.monotonic() of the check
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.checked_at
+
+
+_health: DatabaseHealth | None = None
+_health_task: asyncio.Task | None = None
+
+
 class Base(DeclarativeBase):
     """Base class for database models."""
 
@@ -35,11 +55,24 @@ def init_database():
     if database_url.startswith("postgres://"):
         database_url = database_url.replace("postgres://", "postgresql+asyncpg://")
 
+    if settings.environment == "test":
+        pool_options = {"poolclass": NullPool}
+    elif make_url(database_url).get_backend_name() == "sqlite":
+        # SQLite picks its own pool per driver and has no server connections to size.
+        pool_options = {}
+    else:
+        pool_options = {
+            "pool_size": settings.database_pool_size,
+            "max_overflow": settings.database_max_overflow,
+            "pool_timeout": settings.database_pool_timeout_seconds,
+            "pool_recycle": settings.database_pool_recycle_seconds,
+        }
+
     engine = create_async_engine(
         database_url,
         echo=settings.debug,
-        poolclass=NullPool if settings.environment == "test" else None,
-        pool_pre_ping=True,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        **pool_options,
     )
     async_session_maker = async_sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
@@ -76,8 +109,7 @@ async def check_database_health() -> bool:
         return False
 
     try:
-        async with engine.begin() as conn:
-            from sqlalchemy import text
+        async with engine.connect() as conn:
             await conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
@@ -85,6 +117,59 @@ async def check_database_health() -> bool:
         return False
 
 
+async def refresh_database_health() -> DatabaseHealth:
+    """Run a health check now and cache its result for readiness probes."""
+    global _health
+    _health = DatabaseHealth(healthy=await check_database_health(), checked_at=time.monotonic())
+    return _health
+
+
+def get_database_health() -> DatabaseHealth | None:
+    """Return the cached health check result, or None if none has run yet."""
+    return _health
+
+
+async def _health_check_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await refresh_database_health()
+
+
+async def start_database_health_checks() -> None:
+    """Check database health once, then keep re-checking in the background."""
+    global _health_task
+    if not engine or _health_task is not None:
+        return
+
+    await refresh_database_health()
+    _health_task = asyncio.create_task(
+        _health_check_loop(settings.database_health_check_interval_seconds),
+        name="database-health-check",
+    )
+
+
+async def stop_database_health_checks() -> None:
+    """Stop the background health check task."""
+    global _health, _health_task
+    if _health_task is not None:
+        _health_task.cancel()
+        try:
+            await _health_task
+        except asyncio.CancelledError:
+            pass
+        _health_task = None
+    _health = None
+
+
+async def create_tables():
+    """Create tables for all imported models that do not exist yet."""
+    if not engine:
+        return
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
 async def close_database():
     """Close database connections."""
     global engine
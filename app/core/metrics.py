@@ -1,12 +1,81 @@
 """Prometheus metrics setup."""
 
 from fastapi import FastAPI
+from prometheus_client import Counter, Gauge, Histogram
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.config import settings
 
+# Model cache; ``pool`` is "models" for global versions and "shards" for shard models
+MODEL_CACHE_HITS = Counter(
+    "model_cache_hits_total", "Model cache lookups served from memory", ["pool"]
+)
+MODEL_CACHE_MISSES = Counter(
+    "model_cache_misses_total", "Model cache lookups that required a load", ["pool"]
+)
+MODEL_CACHE_EVICTIONS = Counter(
+    "model_cache_evictions_total", "Models evicted from the cache", ["pool"]
+)
+MODEL_CACHE_ENTRIES = Gauge("model_cache_entries", "Models currently held in the cache", ["pool"])
+MODEL_CACHE_BYTES = Gauge("model_cache_bytes", "Approximate bytes held by cached models", ["pool"])
+MODEL_CACHE_LOAD_SECONDS = Histogram(
+    "model_cache_load_seconds",
+    "Time spent deserialising a model artifact on a cache miss",
+    ["pool"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# Score cache
+SCORE_CACHE_HITS = Counter("score_cache_hits_total", "Scores answered from the score cache")
+SCORE_CACHE_MISSES = Counter("score_cache_misses_total", "Score cache lookups that ran the model")
+SCORE_CACHE_HIT_RATIO = Gauge(
+    "score_cache_hit_ratio", "Fraction of score cache lookups that hit since startup"
+)
+SCORE_CACHE_ENTRIES = Gauge("score_cache_entries", "Scores currently held in the score cache")
+
+# WebSocket scoring sessions
+STREAM_SESSIONS = Gauge("score_stream_sessions", "Open /score/stream WebSocket sessions")
+STREAM_BATCH_MESSAGES = Histogram(
+    "score_stream_batch_messages",
+    "Stream messages scored together in one forest pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+# Rolling feature windows; ``reason`` is "budget" or "idle"
+ROLLING_FEATURE_VEHICLES = Gauge(
+    "rolling_feature_vehicles", "Vehicles with a rolling feature window in memory"
+)
+ROLLING_FEATURE_EVICTIONS = Counter(
+    "rolling_feature_evictions_total", "Vehicle windows dropped from memory", ["reason"]
+)
+
+# Micro-batching of concurrent /score calls
+MICRO_BATCH_SIZE = Histogram(
+    "micro_batch_size",
+    "Rows scored together by one micro-batch flush",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+MICRO_BATCH_WAIT_SECONDS = Histogram(
+    "micro_batch_wait_seconds",
+    "Time a /score row spent queued before its batch was flushed",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05),
+)
+
+# Telemetry persistence
+TELEMETRY_ROWS_WRITTEN = Counter("telemetry_rows_written_total", "Telemetry rows persisted")
+TELEMETRY_ROWS_DROPPED = Counter(
+    "telemetry_rows_dropped_total",
+    "Telemetry rows discarded because the buffer stayed full or a flush failed",
+    ["reason"],
+)
+TELEMETRY_BUFFER_ROWS = Gauge("telemetry_buffer_rows", "Telemetry rows buffered or being flushed")
+TELEMETRY_FLUSH_SECONDS = Histogram(
+    "telemetry_flush_seconds",
+    "Time spent writing one batch of telemetry rows",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
 
 def setup_metrics(app: FastAPI) -> None:
     """Setup Prometheus metrics instrumentation."""
     Instrumentator().instrument(app).expose(app)
-
@@ -1,62 +1,265 @@
 """Rate limiting middleware."""
 
+import logging
+import math
 import time
-from collections import defaultdict
-from typing import Callable
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
 
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from jose import JWTError
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import settings
+from app.core.auth import decode_token
 
-logger = None
+logger = logging.getLogger(__name__)
 
+EXEMPT_PATH_PREFIXES = ("/health", "/healthz", "/metrics")
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware."""
 
-    def __init__(self, app, calls: int = 60, period: int = 60):
-        super().__init__(app)
+@dataclass(slots=True, frozen=True)
+class RateLimitDecision:
+    """Outcome of charging one request against a client's limit."""
+
+    allowed: bool
+    retry_after: int = 0
+
+
+class RateLimitBackend(ABC):
+    """Stores per-client limiter state; implementations must be O(1) per hit."""
+
+    @abstractmethod
+    async def hit(self, key: str) -> RateLimitDecision:
+        """Charge one request to ``key`` and report whether it is allowed."""
+
+
+class TokenBucketBackend(RateLimitBackend):
+    """Process-local token buckets with idle-key eviction.
+
+    Each key holds ``(tokens, last_seen)`` refilled at ``calls / period`` per
+    second up to ``calls``. Keys are kept in last-access order, so idle keys
+    (whose bucket would be full again) are evicted from the front in amortised
+    O(1) and memory stays proportional to the clients seen in one period.
+    """
+
+    def __init__(self, calls: int, period: float, clock=time.monotonic):
         self.calls = calls
         self.period = period
-        self.clients = defaultdict(list)
-
-    async def dispatch(self, request: Request, call_next):
-        """Process request with rate limiting."""
-        
-        # Skip rate limiting for health checks
-        if request.url.path.startswith(("/health", "/healthz", "/metrics")):
-            return await call_next(request)
-
-        if not settings.rate_limit_enabled:
-            return await call_next(request)
-
-        # Get client identifier
-        client_ip = request.client.host if request.client else "unknown"
-        
-        # Clean old entries
-        current_time = time.time()
-        self.clients[client_ip] = [
-            timestamp
-            for timestamp in self.clients[client_ip]
-            if current_time - timestamp < self.period
-        ]
-        
-        # Check rate limit
-        if len(self.clients[client_ip]) >= self.calls:
-            return JSONResponse(
+        self.rate = calls / period
+        self._clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def hit(self, key: str) -> RateLimitDecision:
+        now = self._clock()
+        self._evict_idle(now)
+
+        tokens, last_seen = self._buckets.pop(key, (float(self.calls), now))
+        tokens = min(float(self.calls), tokens + (now - last_seen) * self.rate)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        self._buckets[key] = (tokens, now)
+
+        if allowed:
+            return RateLimitDecision(allowed=True)
+        retry_after = math.ceil((1.0 - tokens) / self.rate)
+        return RateLimitDecision(allowed=False, retry_after=retry_after)
+
+    def _evict_idle(self, now: float) -> None:
+        while self._buckets:
+            key, (_, last_seen) = next(iter(self._buckets.items()))
+            if now - last_seen < self.period:
+                break
+            del self._buckets[key]
+
+
+class CounterStore(ABC):
+    """Minimal shared counter store (e.g. Redis ``INCR`` + ``EXPIRE``)."""
+
+    @abstractmethod
+    async def incr(self, key: str, ttl: int) -> int:
+        """Atomically increment ``key``, setting ``ttl`` seconds on creation."""
+
+    @abstractmethod
+    async def get(self, key: str) -> int:
+        """Return the current value of ``key`` (0 if missing or expired)."""
+
+
+class InMemoryCounterStore(CounterStore):
+    """In-process ``CounterStore`` stand-in for tests and single-task deployments."""
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        # Every key is created with the same TTL, so insertion order is expiry order.
+        self._counters: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    async def incr(self, key: str, ttl: int) -> int:
+        now = self._clock()
+        self._evict_expired(now)
+        value, expires_at = self._counters.get(key, (0, now + ttl))
+        self._counters[key] = (value + 1, expires_at)
+        return value + 1
+
+    async def get(self, key: str) -> int:
+        value, expires_at = self._counters.get(key, (0, 0.0))
+        return value if expires_at > self._clock() else 0
+
+    def _evict_expired(self, now: float) -> None:
+        while self._counters:
+            key, (_, expires_at) = next(iter(self._counters.items()))
+            if expires_at > now:
+                break
+            del self._counters[key]
+
+
+class RedisCounterStore(CounterStore):
+    """``CounterStore`` backed by Redis so limits are shared across tasks.
+
+    Requires the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str):
+        from redis import asyncio as redis_asyncio
+
+        self._redis = redis_asyncio.from_url(url)
+
+    async def incr(self, key: str, ttl: int) -> int:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl, nx=True)
+            value, _ = await pipe.execute()
+        return int(value)
+
+    async def get(self, key: str) -> int:
+        value = await self._redis.get(key)
+        return int(value) if value is not None else 0
+
+
+class SlidingWindowCounterBackend(RateLimitBackend):
+    """Sliding-window-counter limiter over a shared ``CounterStore``.
+
+    The rate is estimated from the current fixed window's count plus the
+    previous window's count weighted by how much of it still overlaps the
+    sliding window: two counter operations per request, regardless of load.
+    """
+
+    def __init__(self, calls: int, period: int, store: CounterStore, clock=time.time):
+        self.calls = calls
+        self.period = period
+        self.store = store
+        self._clock = clock
+
+    async def hit(self, key: str) -> RateLimitDecision:
+        now = self._clock()
+        window = int(now // self.period)
+        elapsed = now - window * self.period
+
+        current = await self.store.incr(f"ratelimit:{key}:{window}", ttl=2 * self.period)
+        previous = await self.store.get(f"ratelimit:{key}:{window - 1}")
+        estimated = previous * (1.0 - elapsed / self.period) + current
+
+        if estimated <= self.calls:
+            return RateLimitDecision(allowed=True)
+        retry_after = max(1, math.ceil(self.period - elapsed))
+        return RateLimitDecision(allowed=False, retry_after=retry_after)
+
+
+def create_rate_limit_backend(calls: int, period: int) -> RateLimitBackend:
+    """Build the backend selected by ``settings.rate_limit_backend``."""
+
+    if settings.rate_limit_backend == "redis":
+        if not settings.rate_limit_redis_url:
+            msg = "RATE_LIMIT_REDIS_URL is required for the redis rate limit backend"
+            raise ValueError(msg)
+        store = RedisCounterStore(settings.rate_limit_redis_url)
+        return SlidingWindowCounterBackend(calls, period, store)
+    return TokenBucketBackend(calls, period)
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class RateLimitMiddleware:
+    """Pure ASGI rate limiting middleware.
+
+    Clients are keyed by their verified JWT subject when a bearer token is
+    present, otherwise by the address the trusted proxy appended to
+    ``X-Forwarded-For``, falling back to the socket peer.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        calls: int = 60,
+        period: int = 60,
+        backend: RateLimitBackend | None = None,
+        trusted_proxy_hops: int | None = None,
+    ):
+        self.app = app
+        self.calls = calls
+        self.period = period
+        self.backend = backend or create_rate_limit_backend(calls, period)
+        if trusted_proxy_hops is None:
+            trusted_proxy_hops = settings.rate_limit_trusted_proxy_hops
+        self.trusted_proxy_hops = trusted_proxy_hops
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.rate_limit_enabled
+            # Skip rate limiting for health checks
+            or scope["path"].startswith(EXEMPT_PATH_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.backend.hit(self.client_key(scope))
+        if not decision.allowed:
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "detail": f"Rate limit exceeded: {self.calls} requests per {self.period} seconds"
                 },
-                headers={"Retry-After": str(self.period)},
+                headers={"Retry-After": str(decision.retry_after)},
             )
-        
-        # Add current request
-        self.clients[client_ip].append(current_time)
-        
-        # Process request
-        response = await call_next(request)
-        return response
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def client_key(self, scope: Scope) -> str:
+        """Return the identity a request is rate limited under."""
+
+        authorization = _header(scope, b"authorization")
+        if authorization and authorization[:7].lower() == "bearer ":
+            try:
+                payload = decode_token(authorization[7:])
+            except JWTError:
+                pass
+            else:
+                if payload.get("sub"):
+                    return f"sub:{payload['sub']}"
+
+        forwarded_for = _header(scope, b"x-forwarded-for")
+        if forwarded_for and self.trusted_proxy_hops > 0:
+            hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+            # Each trusted proxy appends the address it saw; entries further
+            # left are client-controlled and could be spoofed.
+            if hops:
+                return f"ip:{hops[-min(self.trusted_proxy_hops, len(hops))]}"
 
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
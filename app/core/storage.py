@@ -1,10 +1,19 @@
 """Storage utilities for model artifacts."""
 
+from __future__ import annotations
+
+import hashlib
 import logging
+import os
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 from app.config import settings
@@ -13,6 +22,10 @@ logger = logging.getLogger(__name__)
 
 _s3_client = None
 
+_HASH_CHUNK_BYTES = 1024 * 1024
+# Downloads of keys hashing to the same stripe are serialised
+_KEY_LOCK_STRIPES = 64
+
 
 def get_s3_client():
     """Get or create S3 client."""
@@ -22,55 +35,309 @@ def get_s3_client():
     return _s3_client
 
 
-def save_model(model_path: Path, s3_key: str) -> None:
-    """Save model to S3 if configured, otherwise use local storage."""
-    if settings.use_local_storage:
-        logger.debug(f"Using local storage for {model_path}")
-        return
-    
-    if not settings.s3_bucket_name:
-        logger.warning("S3 bucket not configured, using local storage")
+class ArtifactIntegrityError(ValueError):
+    """Raised when a downloaded artifact does not match its recorded hash."""
+
+
+@dataclass(slots=True, frozen=True)
+class ObjectInfo:
+    """Remote object identity used to validate cached copies."""
+
+    etag: str
+    size: int
+    sha256: str | None = None
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file, read in chunks."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore(ABC):
+    """Remote object store holding published model artifacts, keyed by file name."""
+
+    @abstractmethod
+    def head(self, key: str) -> ObjectInfo | None:
+        """Return the object's identity, or ``None`` if it does not exist."""
+
+    @abstractmethod
+    def download(self, key: str, path: Path) -> None:
+        """Download ``key`` to ``path``."""
+
+    @abstractmethod
+    def upload(self, path: Path, key: str) -> None:
+        """Upload ``path`` as ``key``, recording its SHA-256 for validation."""
+
+    @abstractmethod
+    def read_text(self, key: str) -> str | None:
+        """Return a small text object (e.g. the LATEST pointer), or ``None``."""
+
+    @abstractmethod
+    def write_text(self, key: str, text: str) -> None:
+        """Write a small text object."""
+
+
+class S3ArtifactStore(ArtifactStore):
+    """``ArtifactStore`` on S3 using boto3's managed multipart transfers.
+
+    Objects at or above ``multipart_threshold`` bytes are transferred in
+    ``multipart_chunksize`` parts over up to ``max_concurrency`` threads, in
+    both directions.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client=None,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_chunksize: int = 8 * 1024 * 1024,
+        max_concurrency: int = 8,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = client or get_s3_client()
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def head(self, key: str) -> ObjectInfo | None:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return ObjectInfo(
+            etag=response["ETag"].strip('"'),
+            size=response["ContentLength"],
+            sha256=response.get("Metadata", {}).get("sha256"),
+        )
+
+    def download(self, key: str, path: Path) -> None:
+        self.client.download_file(
+            self.bucket, self._key(key), str(path), Config=self.transfer_config
+        )
+        logger.info("Downloaded s3://%s/%s", self.bucket, self._key(key))
+
+    def upload(self, path: Path, key: str) -> None:
+        self.client.upload_file(
+            str(path),
+            self.bucket,
+            self._key(key),
+            ExtraArgs={"Metadata": {"sha256": file_sha256(path)}},
+            Config=self.transfer_config,
+        )
+        logger.info("Uploaded s3://%s/%s", self.bucket, self._key(key))
+
+    def read_text(self, key: str) -> str | None:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+        return response["Body"].read().decode("utf-8")
+
+    def write_text(self, key: str, text: str) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=text.encode("utf-8"))
+
+
+class FilesystemArtifactStore(ArtifactStore):
+    """Directory-backed ``ArtifactStore`` for tests and single-host deployments.
+
+    ETags are the MD5 of the content, as for single-part S3 uploads.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def head(self, key: str) -> ObjectInfo | None:
+        path = self.root / key
+        if not path.exists():
+            return None
+        sha_path = self.root / f"{key}.sha256"
+        return ObjectInfo(
+            etag=hashlib.md5(path.read_bytes(), usedforsecurity=False).hexdigest(),
+            size=path.stat().st_size,
+            sha256=sha_path.read_text(encoding="utf-8") if sha_path.exists() else None,
+        )
+
+    def download(self, key: str, path: Path) -> None:
+        shutil.copyfile(self.root / key, path)
+
+    def upload(self, path: Path, key: str) -> None:
+        _copy_atomically(path, self.root / key)
+        (self.root / f"{key}.sha256").write_text(file_sha256(path), encoding="utf-8")
+
+    def read_text(self, key: str) -> str | None:
+        path = self.root / key
+        return path.read_text(encoding="utf-8") if path.exists() else None
+
+    def write_text(self, key: str, text: str) -> None:
+        temp_path = self.root / f".{key}.{os.getpid()}.tmp"
+        temp_path.write_text(text, encoding="utf-8")
+        os.replace(temp_path, self.root / key)
+
+
+def _copy_atomically(source: Path, destination: Path) -> None:
+    temp_path = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    shutil.copyfile(source, temp_path)
+    os.replace(temp_path, destination)
+
+
+class ArtifactCache:
+    """Bounded local disk cache in front of an ``ArtifactStore``.
+
+    A cached file is reused while its recorded ETag matches the remote
+    object's, so republished artifacts are fetched again. The ETag is checked
+    with a HEAD request at most once per ``revalidate_seconds`` per file (on
+    every fetch when 0). Downloads land in a temporary file, are checked
+    against the SHA-256 recorded at upload (or the MD5 ETag of single-part
+    objects) and are renamed into place. The least recently used files are
+    deleted once ``max_bytes`` is exceeded; open memory maps of deleted files
+    stay valid.
+    """
+
+    def __init__(
+        self,
+        store: ArtifactStore,
+        cache_dir: str | Path,
+        max_bytes: int,
+        revalidate_seconds: float = 0.0,
+    ):
+        self.store = store
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self._lock = threading.Lock()
+        # A fixed set of locks, so the number of distinct keys fetched over
+        # the process lifetime does not grow memory.
+        self._key_locks = [threading.Lock() for _ in range(_KEY_LOCK_STRIPES)]
+
+    def _etag_path(self, key: str) -> Path:
+        return self.cache_dir / f".{key}.etag"
+
+    def fetch(self, key: str) -> Path:
+        """Return a local path for ``key``, downloading it if stale or missing.
+
+        Blocking: call from a worker thread, not the event loop.
+        """
+
+        path = self.cache_dir / key
+        etag_path = self._etag_path(key)
+        if self.revalidate_seconds > 0 and path.exists():
+            try:
+                validated_at = etag_path.stat().st_mtime
+            except FileNotFoundError:
+                validated_at = 0.0
+            if time.time() - validated_at < self.revalidate_seconds:
+                os.utime(path)  # Mark as recently used
+                return path
+
+        info = self.store.head(key)
+        if info is None:
+            msg = f"Artifact '{key}' is not available"
+            raise FileNotFoundError(msg)
+
+        # One download per key; concurrent callers wait and then reuse it.
+        with self._key_locks[hash(key) % _KEY_LOCK_STRIPES]:
+            if path.exists() and etag_path.exists():
+                if etag_path.read_text(encoding="utf-8") == info.etag:
+                    os.utime(path)  # Mark as recently used
+                    os.utime(etag_path)  # Record the revalidation
+                    return path
+
+            temp_path = self.cache_dir / f".{key}.{os.getpid()}.download"
+            try:
+                self.store.download(key, temp_path)
+                _verify(key, temp_path, info)
+                os.replace(temp_path, path)
+            finally:
+                temp_path.unlink(missing_ok=True)
+            etag_path.write_text(info.etag, encoding="utf-8")
+
+        self._evict(keep=key)
+        return path
+
+    def publish(
+        self, files: list[Path], pointer_key: str | None = None, pointer: str = ""
+    ) -> None:
+        """Upload ``files`` then, only once all are stored, the pointer object, if any."""
+
+        for path in files:
+            self.store.upload(path, path.name)
+        if pointer_key is not None:
+            self.store.write_text(pointer_key, pointer)
+
+    def read_pointer(self, key: str) -> str | None:
+        text = self.store.read_text(key)
+        return text.strip() if text is not None else None
+
+    def _evict(self, keep: str) -> None:
+        with self._lock:
+            entries = [
+                path
+                for path in self.cache_dir.iterdir()
+                if path.is_file() and not path.name.startswith(".")
+            ]
+            total = sum(path.stat().st_size for path in entries)
+            for path in sorted(entries, key=lambda path: path.stat().st_mtime_ns):
+                if total <= self.max_bytes:
+                    break
+                if path.name == keep:
+                    continue
+                total -= path.stat().st_size
+                path.unlink(missing_ok=True)
+                self._etag_path(path.name).unlink(missing_ok=True)
+                logger.info("Evicted cached artifact %s", path.name)
+
+
+def _verify(key: str, path: Path, info: ObjectInfo) -> None:
+    if info.sha256 is not None:
+        actual, expected = file_sha256(path), info.sha256
+    elif "-" not in info.etag:
+        # Single-part S3 ETags are the MD5 of the content.
+        actual = hashlib.md5(path.read_bytes(), usedforsecurity=False).hexdigest()
+        expected = info.etag
+    else:
         return
-    
-    try:
-        s3_client = get_s3_client()
-        s3_client.upload_file(str(model_path), settings.s3_bucket_name, s3_key)
-        logger.info(f"Model saved to S3: s3://{settings.s3_bucket_name}/{s3_key}")
-    except ClientError as e:
-        logger.error(f"Failed to save model to S3: {e}")
-        raise
-
-
-def load_model(s3_key: str, local_path: Path) -> None:
-    """Load model from S3 if configured, otherwise use local storage."""
+    if actual != expected:
+        msg = f"Downloaded artifact '{key}' is corrupt (hash {actual}, expected {expected})"
+        raise ArtifactIntegrityError(msg)
+
+
+def create_artifact_cache() -> ArtifactCache | None:
+    """Build the S3-backed cache from settings, or ``None`` for local-only storage."""
+
     if settings.use_local_storage:
-        if not local_path.exists():
-            raise FileNotFoundError(f"Model not found: {local_path}")
-        logger.debug(f"Using local storage for {local_path}")
-        return
-    
+        return None
     if not settings.s3_bucket_name:
         logger.warning("S3 bucket not configured, using local storage")
-        return
-    
-    try:
-        s3_client = get_s3_client()
-        s3_client.download_file(settings.s3_bucket_name, s3_key, str(local_path))
-        logger.info(f"Model loaded from S3: s3://{settings.s3_bucket_name}/{s3_key}")
-    except ClientError as e:
-        logger.error(f"Failed to load model from S3: {e}")
-        raise
-
-
-def delete_model(s3_key: str) -> None:
-    """Delete model from S3 if configured."""
-    if not settings.s3_bucket_name:
-        return
-    
-    try:
-        s3_client = get_s3_client()
-        s3_client.delete_object(Bucket=settings.s3_bucket_name, Key=s3_key)
-        logger.info(f"Model deleted from S3: s3://{settings.s3_bucket_name}/{s3_key}")
-    except ClientError as e:
-        logger.error(f"Failed to delete model from S3: {e}")
-
+        return None
+    store = S3ArtifactStore(
+        settings.s3_bucket_name,
+        prefix=settings.s3_prefix,
+        multipart_threshold=settings.s3_multipart_threshold_bytes,
+        multipart_chunksize=settings.s3_multipart_chunk_bytes,
+        max_concurrency=settings.s3_max_concurrency,
+    )
+    return ArtifactCache(
+        store,
+        settings.artifact_cache_dir,
+        settings.artifact_cache_max_bytes,
+        revalidate_seconds=settings.artifact_cache_revalidate_seconds,
+    )
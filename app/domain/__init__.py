@@ -1,20 +1,45 @@
 """Domain models for the vehicle anomaly API."""
 
+from .binary import (
+    SCORES_MEDIA_TYPE,
+    TELEMETRY_MEDIA_TYPE,
+    BinaryFormatError,
+    TelemetryFrame,
+)
 from .telemetry import (
+    BatchScoreRequest,
+    BatchScoreResponse,
+    BatchScoreResult,
+    FeatureLayout,
     IsolationForestMetadata,
     ModelTrainingResponse,
     ScoreRequest,
     ScoreResponse,
+    SweepCandidateResult,
     TelemetryBatch,
     TelemetryRecord,
 )
+from .training import SweepGrid, SweepRequest, TrainingJobState, TrainingJobStatus
 
 __all__ = [
+    "SCORES_MEDIA_TYPE",
+    "TELEMETRY_MEDIA_TYPE",
+    "BinaryFormatError",
+    "BatchScoreRequest",
+    "BatchScoreResponse",
+    "BatchScoreResult",
+    "FeatureLayout",
     "IsolationForestMetadata",
     "ModelTrainingResponse",
     "ScoreRequest",
     "ScoreResponse",
+    "SweepCandidateResult",
+    "SweepGrid",
+    "SweepRequest",
     "TelemetryBatch",
+    "TelemetryFrame",
     "TelemetryRecord",
+    "TrainingJobState",
+    "TrainingJobStatus",
 ]
 
@@ -0,0 +1,167 @@
+"""Compact binary wire format for telemetry frames and anomaly scores.
+
+All integers and floats are little-endian.
+
+Telemetry frame (``TELEMETRY_MEDIA_TYPE``)::
+
+    magic       4 bytes   b"VAT1"
+    n_records   uint32
+    n_features  uint32
+    ids_bytes   uint32    length of the vehicle id block
+    timestamps  float64[n_records]              epoch seconds (UTC)
+    features    float32[n_records * n_features] row-major
+    vehicle_ids ids_bytes of UTF-8, one id per record joined by b"\\n"
+
+Score frame (``SCORES_MEDIA_TYPE``)::
+
+    magic          4 bytes   b"VAS1"
+    n_records      uint32
+    version_bytes  uint32    length of the model version string
+    reserved       uint32    always 0
+    anomaly_scores float64[n_records]
+    is_anomaly     uint8[n_records]
+    model_version  version_bytes of UTF-8
+
+The fixed 16-byte header keeps the numeric blocks 8-byte aligned so they can
+be wrapped with ``np.frombuffer`` without copying.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import numpy as np
+
+TELEMETRY_MEDIA_TYPE = "application/vnd.vehicle-telemetry.f32"
+SCORES_MEDIA_TYPE = "application/vnd.vehicle-scores.f64"
+
+_TELEMETRY_MAGIC = b"VAT1"
+_SCORES_MAGIC = b"VAS1"
+_HEADER = struct.Struct("<4sIII")
+_FEATURE_DTYPE = np.dtype("<f4")
+_TIMESTAMP_DTYPE = np.dtype("<f8")
+_SCORE_DTYPE = np.dtype("<f8")
+# Epoch seconds representable as a datetime (years 1 to 9999)
+_MIN_TIMESTAMP = datetime(1, 1, 1, tzinfo=UTC).timestamp()
+_MAX_TIMESTAMP = datetime(9999, 12, 31, 23, 59, 59, tzinfo=UTC).timestamp()
+
+
+class BinaryFormatError(ValueError):
+    """Raised when a binary payload does not match the wire format."""
+
+
+@dataclass(slots=True, frozen=True)
+class TelemetryFrame:
+    """Decoded telemetry frame whose arrays are views over the request body."""
+
+    vehicle_ids: list[str]
+    timestamps: np.ndarray
+    features: np.ndarray
+
+    @property
+    def n_records(self) -> int:
+        return self.features.shape[0]
+
+    def timestamp(self, index: int) -> datetime:
+        return datetime.fromtimestamp(float(self.timestamps[index]), tz=UTC)
+
+
+def decode_telemetry_frame(payload: bytes) -> TelemetryFrame:
+    """Decode a telemetry frame without copying its numeric blocks."""
+
+    if len(payload) < _HEADER.size:
+        msg = "Payload is shorter than the frame header"
+        raise BinaryFormatError(msg)
+    magic, n_records, n_features, ids_bytes = _HEADER.unpack_from(payload)
+    if magic != _TELEMETRY_MAGIC:
+        msg = "Payload is not a telemetry frame"
+        raise BinaryFormatError(msg)
+    if n_records == 0 or n_features == 0:
+        msg = "Telemetry frame must contain at least one record and one feature"
+        raise BinaryFormatError(msg)
+
+    timestamps_offset = _HEADER.size
+    features_offset = timestamps_offset + n_records * _TIMESTAMP_DTYPE.itemsize
+    ids_offset = features_offset + n_records * n_features * _FEATURE_DTYPE.itemsize
+    if len(payload) != ids_offset + ids_bytes:
+        msg = f"Frame size mismatch: expected {ids_offset + ids_bytes} bytes, got {len(payload)}"
+        raise BinaryFormatError(msg)
+
+    try:
+        vehicle_ids = payload[ids_offset:].decode("utf-8").split("\n")
+    except UnicodeDecodeError as exc:
+        msg = "vehicle ids are not valid UTF-8"
+        raise BinaryFormatError(msg) from exc
+    if len(vehicle_ids) != n_records or not all(1 <= len(vid) <= 64 for vid in vehicle_ids):
+        msg = "Frame must carry one vehicle id of 1-64 characters per record"
+        raise BinaryFormatError(msg)
+
+    timestamps = np.frombuffer(payload, _TIMESTAMP_DTYPE, n_records, timestamps_offset)
+    features = np.frombuffer(
+        payload, _FEATURE_DTYPE, n_records * n_features, features_offset
+    ).reshape(n_records, n_features)
+    # NaN compares false both ways, so the range check also rejects it.
+    if not np.all((timestamps >= _MIN_TIMESTAMP) & (timestamps <= _MAX_TIMESTAMP)):
+        msg = "timestamps must be finite epoch seconds between years 1 and 9999"
+        raise BinaryFormatError(msg)
+    if not np.isfinite(features).all():
+        msg = "features must be finite numbers"
+        raise BinaryFormatError(msg)
+    return TelemetryFrame(vehicle_ids=vehicle_ids, timestamps=timestamps, features=features)
+
+
+def encode_telemetry_frame(
+    vehicle_ids: list[str], timestamps: np.ndarray, features: np.ndarray
+) -> bytes:
+    """Encode telemetry records into a frame (used by clients and tests)."""
+
+    features = np.ascontiguousarray(features, dtype=_FEATURE_DTYPE)
+    if features.ndim != 2 or features.shape[0] != len(vehicle_ids):
+        msg = "features must be a 2-D array with one row per vehicle id"
+        raise BinaryFormatError(msg)
+    ids = "\n".join(vehicle_ids).encode("utf-8")
+    return b"".join(
+        (
+            _HEADER.pack(_TELEMETRY_MAGIC, features.shape[0], features.shape[1], len(ids)),
+            np.ascontiguousarray(timestamps, dtype=_TIMESTAMP_DTYPE).tobytes(),
+            features.tobytes(),
+            ids,
+        )
+    )
+
+
+def encode_scores(model_version: str, anomaly_scores: np.ndarray) -> bytes:
+    """Encode decision scores into a score frame; negative scores are anomalies."""
+
+    scores = np.ascontiguousarray(anomaly_scores, dtype=_SCORE_DTYPE)
+    version = model_version.encode("utf-8")
+    return b"".join(
+        (
+            _HEADER.pack(_SCORES_MAGIC, scores.shape[0], len(version), 0),
+            scores.tobytes(),
+            (scores < 0).astype(np.uint8).tobytes(),
+            version,
+        )
+    )
+
+
+def decode_scores(payload: bytes) -> tuple[str, np.ndarray, np.ndarray]:
+    """Decode a score frame into ``(model_version, anomaly_scores, is_anomaly)``."""
+
+    if len(payload) < _HEADER.size:
+        msg = "Payload is shorter than the frame header"
+        raise BinaryFormatError(msg)
+    magic, n_records, version_bytes, _ = _HEADER.unpack_from(payload)
+    if magic != _SCORES_MAGIC:
+        msg = "Payload is not a score frame"
+        raise BinaryFormatError(msg)
+    flags_offset = _HEADER.size + n_records * _SCORE_DTYPE.itemsize
+    version_offset = flags_offset + n_records
+    if len(payload) != version_offset + version_bytes:
+        msg = "Score frame size mismatch"
+        raise BinaryFormatError(msg)
+    scores = np.frombuffer(payload, _SCORE_DTYPE, n_records, _HEADER.size)
+    is_anomaly = np.frombuffer(payload, np.uint8, n_records, flags_offset).astype(bool)
+    return payload[version_offset:].decode("utf-8"), scores, is_anomaly
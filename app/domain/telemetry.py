@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Annotated, Self
+from typing import Annotated, Any, Self
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
 
 
 class TelemetryRecord(BaseModel):
@@ -31,6 +31,31 @@ class TelemetryBatch(BaseModel):
 
     records: Annotated[list[TelemetryRecord], Field(min_length=1)]
     model_version: Annotated[str | None, Field(default=None, max_length=128)] = None
+    # Also train one model per shard of the records (see SHARD_BY)
+    sharded: bool = False
+
+
+class FeatureLayout(BaseModel):
+    """Layout of model inputs built from raw features plus rolling statistics.
+
+    Rows hold the ``raw_features`` values of a record followed, for each
+    statistic in ``stats``, by that statistic of every raw feature over the
+    vehicle's last ``window`` records.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    raw_features: Annotated[int, Field(ge=1)]
+    window: Annotated[int, Field(ge=2)]
+    stats: tuple[str, ...]
+
+    @property
+    def n_features(self) -> int:
+        return self.raw_features * (1 + len(self.stats))
+
+    def feature_names(self) -> list[str]:
+        raw = [f"f{index}" for index in range(self.raw_features)]
+        return raw + [f"{stat}({name})" for stat in self.stats for name in raw]
 
 
 class IsolationForestMetadata(BaseModel):
@@ -41,14 +66,55 @@ class IsolationForestMetadata(BaseModel):
     n_estimators: int
     contamination: float
     n_features: int
+    lineage: str | None = None
+    parent_version: str | None = None
+    generation: int = 0
+    # Shard key -> shard model version, for models trained with sharding
+    shards: dict[str, str] = Field(default_factory=dict)
+    # Set on shard models: the key of the shard they were trained on
+    shard_key: str | None = None
+    # Set when rolling features were appended to the raw vectors in training
+    feature_layout: FeatureLayout | None = None
+
+
+class SweepCandidateResult(BaseModel):
+    """Configuration, evaluation and cost of one hyperparameter sweep candidate."""
+
+    index: int
+    n_estimators: int
+    max_samples: int | float | str
+    contamination: float
+    max_features: float
+    fit_seconds: float
+    score_ms_per_1k_rows: float
+    model_bytes: int
+    # ROC AUC of the anomaly scores on the evaluation set
+    auc: float
+    # F1 of ``is_anomaly`` against the labels; only for labelled evaluation sets
+    f1: float | None = None
+    # Share of the held-out (or labelled) rows the candidate flags as anomalous
+    flagged_fraction: float
+    published: bool = False
 
 
 class ModelTrainingResponse(BaseModel):
     """Response returned by the ingestion endpoint after training."""
 
     model_version: str
-    record_count: int
+    # Records submitted, and the rows the forest was fitted on: fewer for
+    # sampled streams and for sweeps, which hold rows out for evaluation
+    records_seen: int
+    records_trained: int
     metadata: IsolationForestMetadata
+    # Every candidate of a hyperparameter sweep, best first
+    sweep: list[SweepCandidateResult] | None = None
+
+    @computed_field(json_schema_extra={"deprecated": True})
+    @property
+    def record_count(self) -> int:
+        """Deprecated: use ``records_trained``, which this returns."""
+
+        return self.records_trained
 
 
 class ScoreRequest(TelemetryRecord):
@@ -66,3 +132,33 @@ class ScoreResponse(BaseModel):
     anomaly_score: float
     is_anomaly: bool
 
+
+class BatchScoreRequest(BaseModel):
+    """Request payload for scoring many telemetry records in one call.
+
+    Records are validated individually so that a malformed row yields a
+    per-record error instead of rejecting the whole batch.
+    """
+
+    records: Annotated[list[dict[str, Any]], Field(min_length=1, max_length=10_000)]
+    model_version: Annotated[str | None, Field(default=None, max_length=128)] = None
+
+
+class BatchScoreResult(BaseModel):
+    """Outcome for a single record of a batch scoring request."""
+
+    index: int
+    vehicle_id: str | None = None
+    timestamp: datetime | None = None
+    model_version: str | None = None
+    anomaly_score: float | None = None
+    is_anomaly: bool | None = None
+    error: str | None = None
+
+
+class BatchScoreResponse(BaseModel):
+    """Response payload for batch anomaly scoring, in request order."""
+
+    results: list[BatchScoreResult]
+    scored_count: int
+    error_count: int
@@ -0,0 +1,97 @@
+"""Domain models describing background training jobs."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Annotated, Literal, Self
+
+from pydantic import BaseModel, Field, computed_field, model_validator
+
+from .telemetry import ModelTrainingResponse, TelemetryRecord
+
+TrainingJobState = Literal["queued", "running", "succeeded", "failed"]
+
+
+class TrainingJobStatus(BaseModel):
+    """Status of a training job submitted through the ingestion endpoint."""
+
+    job_id: str
+    state: TrainingJobState
+    records_seen: int
+    # Set once the job succeeds, from its result
+    records_trained: int | None = None
+    submitted_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    duration_seconds: float | None = None
+    result: ModelTrainingResponse | None = None
+    error: str | None = None
+
+    @computed_field(json_schema_extra={"deprecated": True})
+    @property
+    def record_count(self) -> int:
+        """Deprecated: use ``records_seen``, which this returns."""
+
+        return self.records_seen
+
+
+class SweepGrid(BaseModel):
+    """Values tried per IsolationForest parameter; every combination is a candidate."""
+
+    n_estimators: Annotated[list[Annotated[int, Field(ge=1)]], Field(min_length=1)] = [200]
+    # A row count, a fraction of the rows, or "auto" (min(256, rows))
+    max_samples: Annotated[
+        list[Annotated[int, Field(ge=1)] | Annotated[float, Field(gt=0, le=1)] | Literal["auto"]],
+        Field(min_length=1),
+    ] = ["auto"]
+    contamination: Annotated[
+        list[Annotated[float, Field(gt=0, le=0.5)]], Field(min_length=1)
+    ] = [0.05]
+    max_features: Annotated[
+        list[Annotated[float, Field(gt=0, le=1)]], Field(min_length=1)
+    ] = [1.0]
+
+    @property
+    def size(self) -> int:
+        return (
+            len(self.n_estimators)
+            * len(self.max_samples)
+            * len(self.contamination)
+            * len(self.max_features)
+        )
+
+
+class SweepRequest(BaseModel):
+    """Training batch plus the grid of configurations to compare on it.
+
+    Candidates are evaluated on the labelled ``evaluation_records`` when
+    given, otherwise on ``holdout_fraction`` of the records held out from
+    training (against synthetic outliers).
+    """
+
+    records: Annotated[list[TelemetryRecord], Field(min_length=2)]
+    grid: SweepGrid = SweepGrid()
+    holdout_fraction: Annotated[float, Field(gt=0, lt=1)] = 0.2
+    evaluation_records: list[TelemetryRecord] | None = None
+    # True marks an anomaly; one label per evaluation record
+    evaluation_labels: list[bool] | None = None
+    # Publish this candidate (by index) instead of the best one
+    candidate: Annotated[int | None, Field(default=None, ge=0)] = None
+    model_version: Annotated[str | None, Field(default=None, max_length=128)] = None
+
+    @model_validator(mode="after")
+    def validate_evaluation_set(self) -> Self:
+        """Require one label per evaluation record and a candidate inside the grid."""
+        records, labels = self.evaluation_records, self.evaluation_labels
+        if (records is None) != (labels is None) or (
+            records is not None and len(records) != len(labels)
+        ):
+            msg = "evaluation_records and evaluation_labels must be given together, one each"
+            raise ValueError(msg)
+        if labels is not None and len(set(labels)) < 2:
+            msg = "evaluation_labels must contain both normal and anomalous records"
+            raise ValueError(msg)
+        if self.candidate is not None and self.candidate >= self.grid.size:
+            msg = f"candidate must be below the grid size ({self.grid.size})"
+            raise ValueError(msg)
+        return self
@@ -1,28 +1,36 @@
 """Main FastAPI application."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 import sentry_sdk
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 
-from app.api.routes import health, ingest, score
+from app.api.routes import health, ingest, score, stream
 from app.config import settings
+from app.core.access_log import AccessLogMiddleware, configure_logging
 from app.core.auth import verify_token
-from app.core.database import close_database, init_database
+from app.core.database import (
+    close_database,
+    init_database,
+    start_database_health_checks,
+    stop_database_health_checks,
+)
 from app.core.metrics import setup_metrics
 from app.core.rate_limit import RateLimitMiddleware
 from app.instrumentation import init_tracing
+from app.services.scoring import get_scoring_service
+from app.services.telemetry_store import start_telemetry_writer, stop_telemetry_writer
+from app.services.training_jobs import shutdown_training_jobs
+from app.services.warmup import start_warm_up, stop_warm_up
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+configure_logging(settings.log_level, json_format=settings.log_json, max_queue=settings.log_queue_size)
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +42,8 @@ async def lifespan(app: FastAPI):
 
     # Initialize database
     init_database()
+    await start_database_health_checks()
+    await start_telemetry_writer()
 
     # Initialize Sentry if DSN is provided
     if settings.sentry_dsn:
@@ -47,12 +57,33 @@ async def lifespan(app: FastAPI):
             environment=settings.environment,
         )
 
+    # Warm the latest model in the background; /health/ready fails until done
+    if settings.warm_up_enabled:
+        start_warm_up(settings.warm_up_iterations)
+
+    # Follow LATEST so models published by other processes are hot-swapped in
+    if settings.hot_reload_interval_seconds > 0:
+        get_scoring_service().start_watching(settings.hot_reload_interval_seconds)
+
+    # Download versions published to S3 by other tasks ahead of the watcher
+    get_scoring_service().start_prefetching(settings.s3_prefetch_interval_seconds)
+
     yield
 
     # Shutdown
     logger.info("Shutting down")
-    
-    # Close database connections
+    await stop_warm_up()
+    if get_scoring_service().micro_batcher is not None:
+        await get_scoring_service().micro_batcher.drain()
+    await asyncio.to_thread(get_scoring_service().stop_prefetching)
+    await asyncio.to_thread(get_scoring_service().stop_watching)
+
+    # Let queued training jobs finish before the process exits
+    await asyncio.to_thread(shutdown_training_jobs)
+
+    # Flush buffered telemetry, then close database connections
+    await stop_telemetry_writer()
+    await stop_database_health_checks()
     await close_database()
 
 
@@ -82,14 +113,8 @@ app.add_middleware(
 )
 
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all requests."""
-    logger.info(f"{request.method} {request.url.path}")
-    response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
-    return response
+# Access logging middleware
+app.add_middleware(AccessLogMiddleware, sample_rates=settings.access_log_sample_rates)
 
 
 # Observability hooks
@@ -101,6 +126,7 @@ logger.info("OpenTelemetry tracing and Prometheus metrics enabled")
 app.include_router(health.router, tags=["health"])
 app.include_router(ingest.router, tags=["telemetry"])
 app.include_router(score.router, tags=["telemetry"])
+app.include_router(stream.router, tags=["telemetry"])
 
 
 @app.get("/")
@@ -0,0 +1,240 @@
+"""Flattened NumPy inference engine for trained isolation forests."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+_TREE_LEAF = -1
+
+# Flat artifact layout: magic, header length, JSON header, then each node array
+# uncompressed at an offset aligned to _ARRAY_ALIGNMENT bytes.
+_ARTIFACT_MAGIC = b"IFFLAT01"
+_ARTIFACT_PREFIX = struct.Struct("<8sQ")
+_ARRAY_ALIGNMENT = 64
+_ARRAY_FIELDS = ("feature", "threshold", "children", "leaf_value", "roots")
+_SCALAR_FIELDS = ("max_depth", "n_features_in_", "denominator", "offset_")
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ARRAY_ALIGNMENT) * _ARRAY_ALIGNMENT
+
+
+def average_path_length(n_samples: np.ndarray) -> np.ndarray:
+    """Return c(n), the average unsuccessful BST search depth for ``n`` samples."""
+
+    n_samples = np.asarray(n_samples, dtype=float)
+    result = np.zeros_like(n_samples)
+    result[n_samples == 2] = 1.0
+    mask = n_samples > 2
+    result[mask] = 2.0 * (np.log(n_samples[mask] - 1.0) + np.euler_gamma) - 2.0 * (
+        n_samples[mask] - 1.0
+    ) / n_samples[mask]
+    return result
+
+
+@dataclass(slots=True, frozen=True)
+class FlatForest:
+    """An isolation forest compiled into contiguous node arrays.
+
+    All trees share one set of node arrays; ``roots`` holds each tree's root
+    offset. ``children`` interleaves ``(right, left)`` per node so the next
+    node is ``children[2 * node + go_left]``. Leaves point at themselves so that
+    a fixed number of level-synchronous steps (the deepest tree's depth) lands
+    every row on its leaf in every tree. ``leaf_value`` stores
+    ``depth + c(n_node_samples) - 1`` for leaves, which is exactly the per-tree
+    path length sklearn accumulates.
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    children: np.ndarray
+    leaf_value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    n_features_in_: int
+    denominator: float
+    offset_: float
+
+    @classmethod
+    def from_isolation_forest(cls, model: IsolationForest) -> FlatForest:
+        """Compile a fitted ``IsolationForest`` into flat node arrays."""
+
+        features, thresholds, children, leaf_values, roots = [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        # Trees only see a column subset when max_features is below the input
+        # width; otherwise sklearn trains and scores them on X unchanged.
+        subsample_features = model._max_features != model.n_features_in_
+        for estimator, estimator_features in zip(model.estimators_, model.estimators_features_):
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.intp)
+            is_leaf = tree.children_left == _TREE_LEAF
+            depths = tree.compute_node_depths().astype(float)
+
+            # Map sub-sampled feature indices back onto the caller's columns so
+            # that scoring never needs to slice the input per tree.
+            feature = np.where(is_leaf, 0, tree.feature).astype(np.intp)
+            if subsample_features:
+                feature = np.asarray(estimator_features, dtype=np.intp)[feature]
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+            child = np.stack([right, left], axis=1).ravel()
+            leaf_value = np.where(
+                is_leaf, depths + average_path_length(tree.n_node_samples) - 1.0, 0.0
+            )
+
+            features.append(feature)
+            thresholds.append(threshold)
+            children.append(child)
+            leaf_values.append(leaf_value)
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += tree.node_count
+
+        n_trees = len(model.estimators_)
+        denominator = float(n_trees * average_path_length(np.array([model._max_samples]))[0])
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.int32),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            children=np.ascontiguousarray(np.concatenate(children), dtype=np.int32),
+            leaf_value=np.ascontiguousarray(np.concatenate(leaf_values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=int(max_depth),
+            n_features_in_=int(model.n_features_in_),
+            denominator=denominator,
+            offset_=float(model.offset_),
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the forest as a flat file that ``load`` can memory-map.
+
+        The file is written beside ``path`` and renamed into place, so readers
+        that already mapped a previous file keep a consistent view.
+        """
+
+        arrays = {name: np.ascontiguousarray(getattr(self, name)) for name in _ARRAY_FIELDS}
+        index = {}
+        # The header is written first, so its length must be known before the
+        # array offsets are; reserve room generously and pad.
+        offset = _aligned(_ARTIFACT_PREFIX.size + 1024)
+        for name, array in arrays.items():
+            index[name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+            offset = _aligned(offset + array.nbytes)
+        header = json.dumps(
+            {"arrays": index, **{name: getattr(self, name) for name in _SCALAR_FIELDS}}
+        ).encode("utf-8")
+        if _ARTIFACT_PREFIX.size + len(header) > index["feature"]["offset"]:
+            msg = "Flat forest header does not fit in its reserved space"
+            raise ValueError(msg)
+
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as artifact:
+                artifact.write(_ARTIFACT_PREFIX.pack(_ARTIFACT_MAGIC, len(header)))
+                artifact.write(header)
+                for name, array in arrays.items():
+                    artifact.seek(index[name]["offset"])
+                    artifact.write(array.data)
+                artifact.truncate(offset)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> FlatForest:
+        """Memory-map a flat forest artifact without copying its node arrays.
+
+        The arrays are read-only views over the mapping, so every process and
+        cached instance that opens the same file shares its page-cache pages.
+        """
+
+        with open(path, "rb") as artifact:
+            mapping = mmap.mmap(artifact.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < _ARTIFACT_PREFIX.size:
+            msg = f"{path} is not a flat forest artifact"
+            raise ValueError(msg)
+        magic, header_size = _ARTIFACT_PREFIX.unpack_from(mapping)
+        if magic != _ARTIFACT_MAGIC:
+            msg = f"{path} is not a flat forest artifact"
+            raise ValueError(msg)
+        header = json.loads(
+            mapping[_ARTIFACT_PREFIX.size : _ARTIFACT_PREFIX.size + header_size].decode("utf-8")
+        )
+
+        arrays = {}
+        for name in _ARRAY_FIELDS:
+            spec = header["arrays"][name]
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"]))
+            arrays[name] = np.frombuffer(
+                mapping, dtype=dtype, count=count, offset=spec["offset"]
+            ).reshape(spec["shape"])
+        return cls(**arrays, **{name: header[name] for name in _SCALAR_FIELDS})
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the node arrays in bytes."""
+
+        return sum(
+            array.nbytes
+            for array in (
+                self.feature,
+                self.threshold,
+                self.children,
+                self.leaf_value,
+                self.roots,
+            )
+        )
+
+    def score_samples(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """Equivalent of ``IsolationForest.score_samples`` without sklearn overhead."""
+
+        # sklearn compares float32 inputs against float64 thresholds; round the
+        # inputs the same way so split decisions are identical.
+        with np.errstate(over="ignore"):
+            matrix = np.asarray(feature_matrix, dtype=np.float32).astype(np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != self.n_features_in_:
+            msg = (
+                f"X has {matrix.shape[-1]} features, but the model "
+                f"is expecting {self.n_features_in_} features as input"
+            )
+            raise ValueError(msg)
+        if not np.isfinite(matrix).all():
+            # NaN would silently take the right branch of every split; reject
+            # it (and values beyond float32 range) as sklearn's validation does.
+            msg = "Input X contains NaN, infinity or a value too large for dtype('float32')."
+            raise ValueError(msg)
+
+        n_rows, n_columns = matrix.shape
+        flat_matrix = matrix.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * n_columns)[:, None]
+        nodes = np.repeat(self.roots[None, :], n_rows, axis=0)
+        for _ in range(self.max_depth):
+            values = flat_matrix.take(row_offsets + self.feature.take(nodes))
+            go_left = values <= self.threshold.take(nodes)
+            nodes = self.children.take(2 * nodes + go_left)
+
+        depths = self.leaf_value.take(nodes).sum(axis=1)
+        if self.denominator == 0:
+            return -np.ones(n_rows)
+        return -np.power(2.0, -depths / self.denominator)
+
+    def decision_function(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """Equivalent of ``IsolationForest.decision_function``."""
+
+        return self.score_samples(feature_matrix) - self.offset_
@@ -0,0 +1,160 @@
+"""Coalescing of concurrent single-record scoring calls into matrix passes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from app.core.metrics import MICRO_BATCH_SIZE, MICRO_BATCH_WAIT_SECONDS
+from app.domain import ScoreRequest, ScoreResponse
+
+if TYPE_CHECKING:
+    from app.services.scoring import IsolationForestScoringService
+
+logger = logging.getLogger(__name__)
+
+# (model version, whether it is a shard model)
+_BatchKey = tuple[str, bool]
+
+
+@dataclass(slots=True)
+class _PendingBatch:
+    rows: list[Sequence[float]] = field(default_factory=list)
+    futures: list[asyncio.Future] = field(default_factory=list)
+    enqueued_at: list[float] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class MicroBatcher:
+    """Queue single-record scoring calls per model and score them as one matrix.
+
+    A queue is flushed once it holds ``max_batch_size`` rows or its first row
+    has waited ``max_wait_seconds``, whichever comes first. The forest then
+    runs once in a worker thread, so the event loop keeps accepting (and
+    queueing) requests meanwhile, and each caller's future receives its row's
+    score. A row whose width does not match the model fails on its own
+    without affecting the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        service: IsolationForestScoringService,
+        max_batch_size: int = 64,
+        max_wait_seconds: float = 0.002,
+    ):
+        if max_batch_size < 1:
+            msg = "max_batch_size must be at least 1"
+            raise ValueError(msg)
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: dict[_BatchKey, _PendingBatch] = {}
+        self._running: set[asyncio.Task] = set()
+
+    async def score(self, request: ScoreRequest) -> ScoreResponse:
+        """Score ``request`` as part of the next batch for its model."""
+
+        key = self.service.resolve_model(request.model_version, request.vehicle_id)
+        features = self.service.features_for(key[0], request)
+        score_cache = self.service.score_cache
+        cache_key = None
+        if score_cache is not None:
+            cache_key = score_cache.key(key[0], features)
+            anomaly_score = score_cache.get(cache_key)
+            if anomaly_score is not None:
+                return self._response(request, key[0], anomaly_score)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch()
+            batch.timer = loop.call_later(self.max_wait_seconds, self._flush, key)
+        batch.rows.append(features)
+        batch.futures.append(future)
+        batch.enqueued_at.append(time.perf_counter())
+        if len(batch.rows) >= self.max_batch_size:
+            self._flush(key)
+
+        anomaly_score = await future
+        if cache_key is not None:
+            score_cache.put(cache_key, anomaly_score)
+        return self._response(request, key[0], anomaly_score)
+
+    @staticmethod
+    def _response(
+        request: ScoreRequest, model_version: str, anomaly_score: float
+    ) -> ScoreResponse:
+        return ScoreResponse(
+            vehicle_id=request.vehicle_id,
+            timestamp=request.timestamp,
+            model_version=model_version,
+            anomaly_score=anomaly_score,
+            is_anomaly=anomaly_score < 0,
+        )
+
+    async def drain(self) -> None:
+        """Flush every queue and wait for batches in progress, e.g. at shutdown."""
+
+        for key in list(self._pending):
+            self._flush(key)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _flush(self, key: _BatchKey) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._run(key, batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: _BatchKey, batch: _PendingBatch) -> None:
+        flushed_at = time.perf_counter()
+        MICRO_BATCH_SIZE.observe(len(batch.rows))
+        for enqueued_at in batch.enqueued_at:
+            MICRO_BATCH_WAIT_SECONDS.observe(flushed_at - enqueued_at)
+
+        try:
+            outcomes = await asyncio.to_thread(self._score, key, batch.rows)
+        except Exception as exc:
+            outcomes = [(range(len(batch.rows)), exc)]
+        for indices, outcome in outcomes:
+            for position, index in enumerate(indices):
+                future = batch.futures[index]
+                if future.done():  # The caller went away
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(float(outcome[position]))
+
+    def _score(
+        self, key: _BatchKey, rows: Sequence[Sequence[float]]
+    ) -> list[tuple[Sequence[int], np.ndarray | Exception]]:
+        # Rows are grouped by width so that one malformed row cannot fail the
+        # whole batch; normally there is a single group.
+        by_width: dict[int, list[int]] = {}
+        for index, row in enumerate(rows):
+            by_width.setdefault(len(row), []).append(index)
+
+        model_version, shard = key
+        outcomes: list[tuple[Sequence[int], np.ndarray | Exception]] = []
+        for indices in by_width.values():
+            feature_matrix = np.array([rows[index] for index in indices], dtype=float)
+            try:
+                outcomes.append(
+                    (indices, self.service.score_rows(model_version, feature_matrix, shard))
+                )
+            except Exception as exc:
+                outcomes.append((indices, exc))
+        return outcomes
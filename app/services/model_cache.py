@@ -0,0 +1,194 @@
+"""In-process LRU cache for deserialised model artifacts."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.metrics import (
+    MODEL_CACHE_BYTES,
+    MODEL_CACHE_ENTRIES,
+    MODEL_CACHE_EVICTIONS,
+    MODEL_CACHE_HITS,
+    MODEL_CACHE_LOAD_SECONDS,
+    MODEL_CACHE_MISSES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ModelCacheStats:
+    """Point-in-time counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    loads: int = 0
+    load_seconds_total: float = 0.0
+    last_load_seconds: float = 0.0
+    entries: int = 0
+    bytes: int = 0
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    value: Any
+    nbytes: int
+
+
+class ModelCache:
+    """Version-keyed LRU cache with a memory budget and single-flight loading.
+
+    Concurrent misses for the same key are coalesced: the first caller runs the
+    loader while the others wait on its result, so a cold artifact is
+    deserialised exactly once. Invalidating a key drops its pending load, whose
+    result is then handed to the callers already waiting but never cached.
+    """
+
+    def __init__(self, max_entries: int = 4, max_bytes: int | None = None, name: str = "models"):
+        if max_entries < 1:
+            msg = "max_entries must be at least 1"
+            raise ValueError(msg)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self._hits = MODEL_CACHE_HITS.labels(pool=name)
+        self._misses = MODEL_CACHE_MISSES.labels(pool=name)
+        self._evictions = MODEL_CACHE_EVICTIONS.labels(pool=name)
+        self._entries_gauge = MODEL_CACHE_ENTRIES.labels(pool=name)
+        self._bytes_gauge = MODEL_CACHE_BYTES.labels(pool=name)
+        self._load_seconds = MODEL_CACHE_LOAD_SECONDS.labels(pool=name)
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = ModelCacheStats()
+
+    def get_or_load(self, key: str, loader: Callable[[], tuple[Any, int]]) -> Any:
+        """Return the cached value for ``key`` or load it with ``loader``.
+
+        ``loader`` must return a ``(value, nbytes)`` tuple where ``nbytes`` is the
+        approximate in-memory footprint used for the byte budget.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                self._hits.inc()
+                return entry.value
+
+            self._stats.misses += 1
+            self._misses.inc()
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        started = time.perf_counter()
+        try:
+            value, nbytes = loader()
+        except BaseException as exc:
+            with self._lock:
+                self._drop_inflight(key, future)
+            future.set_exception(exc)
+            raise
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            # An invalidation while loading removed this future; the value may
+            # predate the change that triggered it, so it must not be cached.
+            current = self._drop_inflight(key, future)
+            self._stats.loads += 1
+            self._stats.load_seconds_total += elapsed
+            self._stats.last_load_seconds = elapsed
+            if current:
+                self._insert(key, _CacheEntry(value=value, nbytes=nbytes))
+        self._load_seconds.observe(elapsed)
+        logger.debug("Loaded model %s into cache in %.3fs (%d bytes)", key, elapsed, nbytes)
+
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        """Drop ``key`` from the cache and discard any load still in flight."""
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if self._entries.pop(key, None) is not None:
+                self._publish_gauges()
+
+    def clear(self) -> None:
+        """Drop every cached entry and discard every load still in flight."""
+
+        with self._lock:
+            self._inflight.clear()
+            self._entries.clear()
+            self._publish_gauges()
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> ModelCacheStats:
+        """Return a snapshot of the cache counters."""
+
+        with self._lock:
+            snapshot = ModelCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                loads=self._stats.loads,
+                load_seconds_total=self._stats.load_seconds_total,
+                last_load_seconds=self._stats.last_load_seconds,
+                entries=len(self._entries),
+                bytes=self._total_bytes(),
+            )
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Internal helpers (caller must hold ``self._lock``)
+    # ------------------------------------------------------------------
+    def _insert(self, key: str, entry: _CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        # Always keep the entry that was just loaded, even if it alone exceeds
+        # the byte budget; otherwise an oversized model would be reloaded on
+        # every request.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._total_bytes() > self.max_bytes)
+        ):
+            evicted, _ = self._entries.popitem(last=False)
+            self._stats.evictions += 1
+            self._evictions.inc()
+            logger.debug("Evicted model %s from cache", evicted)
+        self._publish_gauges()
+
+    def _drop_inflight(self, key: str, future: Future) -> bool:
+        if self._inflight.get(key) is not future:
+            return False
+        del self._inflight[key]
+        return True
+
+    def _total_bytes(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def _publish_gauges(self) -> None:
+        self._entries_gauge.set(len(self._entries))
+        self._bytes_gauge.set(self._total_bytes())
@@ -0,0 +1,121 @@
+"""Fixed-size uniform sampling of feature vectors from unbounded streams."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+# Rows converted to an array at a time when consuming a row iterator.
+_CHUNK_ROWS = 4096
+
+
+class FeatureReservoir:
+    """Uniform random sample of at most ``capacity`` rows from a stream.
+
+    Implements Li's Algorithm L: once the reservoir is full, the position of
+    the next row to keep is drawn from a geometric distribution, so rows in
+    between are skipped with an index comparison and the random number
+    generator runs about ``capacity * log(n_seen / capacity)`` times in
+    total. Memory is fixed at ``capacity`` rows however long the stream is.
+    Rows offered with vehicle ids keep them, e.g. to train shard models on
+    the sample.
+    """
+
+    def __init__(self, capacity: int, seed: int | None = None):
+        if capacity < 1:
+            msg = "capacity must be at least 1"
+            raise ValueError(msg)
+        self.capacity = capacity
+        self.n_seen = 0
+        self._rows: np.ndarray | None = None
+        self._vehicle_ids: list[str] | None = None
+        self._rng = np.random.default_rng(seed)
+        self._w = 1.0
+        # Stream index of the next row to keep once the reservoir is full.
+        self._next = capacity
+
+    @property
+    def n_features(self) -> int | None:
+        return None if self._rows is None else self._rows.shape[1]
+
+    def extend(
+        self,
+        rows: np.ndarray | Sequence[Sequence[float]],
+        vehicle_ids: Sequence[str] | None = None,
+    ) -> None:
+        """Offer a chunk of rows; their width must match earlier rows.
+
+        ``vehicle_ids`` (one per row) must be given on every call or on none.
+        """
+
+        rows = np.asarray(rows, dtype=float)
+        if rows.ndim != 2:
+            msg = "rows must be a two-dimensional array"
+            raise ValueError(msg)
+        if vehicle_ids is not None and len(vehicle_ids) != rows.shape[0]:
+            msg = "vehicle_ids must hold one id per row"
+            raise ValueError(msg)
+        if self._rows is None:
+            self._rows = np.empty((self.capacity, rows.shape[1]), dtype=float)
+            if vehicle_ids is not None:
+                self._vehicle_ids = [""] * self.capacity
+        elif rows.shape[1] != self._rows.shape[1]:
+            msg = f"expected {self._rows.shape[1]} features, got {rows.shape[1]}"
+            raise ValueError(msg)
+        if (vehicle_ids is None) != (self._vehicle_ids is None):
+            msg = "vehicle_ids must be given for every chunk or for none"
+            raise ValueError(msg)
+
+        start = self.n_seen
+        end = start + rows.shape[0]
+        if start < self.capacity:
+            filled = min(end, self.capacity)
+            self._rows[start:filled] = rows[: filled - start]
+            if vehicle_ids is not None:
+                self._vehicle_ids[start:filled] = vehicle_ids[: filled - start]
+            if filled == self.capacity:
+                self._advance(self.capacity - 1)
+        while self._next < end:
+            slot = self._rng.integers(self.capacity)
+            self._rows[slot] = rows[self._next - start]
+            if vehicle_ids is not None:
+                self._vehicle_ids[slot] = vehicle_ids[self._next - start]
+            self._advance(self._next)
+        self.n_seen = end
+
+    def consume(self, rows: Iterable[Sequence[float]]) -> FeatureReservoir:
+        """Offer every row of an iterator (file lines, a database cursor, ...)."""
+
+        chunk: list[Sequence[float]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == _CHUNK_ROWS:
+                self.extend(chunk)
+                chunk.clear()
+        if chunk:
+            self.extend(chunk)
+        return self
+
+    def sample(self) -> np.ndarray:
+        """Return a copy of the sampled rows (all rows if fewer than ``capacity`` were seen)."""
+
+        if self._rows is None:
+            return np.empty((0, 0), dtype=float)
+        return self._rows[: min(self.n_seen, self.capacity)].copy()
+
+    def sample_vehicle_ids(self) -> list[str] | None:
+        """Return the vehicle ids of the ``sample`` rows, if rows came with ids."""
+
+        if self._vehicle_ids is None:
+            return None
+        return self._vehicle_ids[: min(self.n_seen, self.capacity)]
+
+    def _advance(self, current: int) -> None:
+        # 1 - random() lies in (0, 1], so the logarithms are finite.
+        self._w *= math.exp(math.log(1.0 - self._rng.random()) / self.capacity)
+        skip = 0
+        if self._w < 1.0:
+            skip = math.floor(math.log(1.0 - self._rng.random()) / math.log1p(-self._w))
+        self._next = current + skip + 1
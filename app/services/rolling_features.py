@@ -0,0 +1,274 @@
+"""Per-vehicle rolling statistics appended to raw feature vectors."""
+
+from __future__ import annotations
+
+import operator
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+from app.core.metrics import ROLLING_FEATURE_EVICTIONS, ROLLING_FEATURE_VEHICLES
+from app.domain import FeatureLayout
+
+ROLLING_STATS = ("mean", "var", "min", "max", "rate")
+
+# Bookkeeping per vehicle besides its arrays (object headers, dict slot, id)
+_ENTRY_OVERHEAD_BYTES = 512
+
+
+class _MonotonicQueues:
+    """Per-feature monotonic queues of record sequence numbers.
+
+    For each feature the queue holds, oldest first, the records that can
+    still become the window's minimum (or maximum): every later record in it
+    has a strictly larger (smaller) value. The front is therefore the current
+    extreme, and each record enters and leaves a queue at most once, so an
+    update is O(1) amortised per feature even for monotonic series. Queues
+    are circular arrays of ``window`` slots per feature and read values from
+    the window's ring buffer.
+    """
+
+    __slots__ = ("seqs", "heads", "sizes", "keep")
+
+    def __init__(self, window: int, n_features: int, keep: Callable[[float, float], bool]):
+        # Scalar access through a memoryview is several times cheaper than
+        # NumPy indexing, and these loops touch one element at a time.
+        self.seqs = memoryview(np.zeros((n_features, window), dtype=np.int64))
+        self.heads = [0] * n_features
+        self.sizes = [0] * n_features
+        # keep(queued, new) is true when a queued value survives a new one.
+        self.keep = keep
+
+    @property
+    def nbytes(self) -> int:
+        return self.seqs.nbytes
+
+    def expire(self, oldest: int) -> None:
+        """Drop fronts that left the window (sequence number ``oldest`` or below)."""
+
+        seqs, window = self.seqs, self.seqs.shape[1]
+        for feature, size in enumerate(self.sizes):
+            head = self.heads[feature]
+            if size and seqs[feature, head] <= oldest:
+                self.heads[feature] = (head + 1) % window
+                self.sizes[feature] = size - 1
+
+    def push(self, seq: int, row: list[float], values: memoryview) -> list[float]:
+        """Append record ``seq`` (already in ``values``) and return each feature's front value."""
+
+        seqs, window, keep = self.seqs, self.seqs.shape[1], self.keep
+        fronts = []
+        for feature, value in enumerate(row):
+            head, size = self.heads[feature], self.sizes[feature]
+            while size:
+                back = seqs[feature, (head + size - 1) % window]
+                if keep(values[back % window, feature], value):
+                    break
+                size -= 1
+            seqs[feature, (head + size) % window] = seq
+            self.sizes[feature] = size + 1
+            fronts.append(values[seqs[feature, head] % window, feature] if size else value)
+        return fronts
+
+
+class _VehicleWindow:
+    """Ring buffer of a vehicle's last records plus running aggregates."""
+
+    __slots__ = (
+        "values",
+        "count",
+        "total",
+        "total_sq",
+        "minimum",
+        "maximum",
+        "lows",
+        "highs",
+        "last",
+        "last_time",
+        "updates",
+        "seen_at",
+    )
+
+    def __init__(self, window: int, n_features: int):
+        self.values = np.zeros((window, n_features))
+        self.count = 0
+        self.total = np.zeros(n_features)
+        self.total_sq = np.zeros(n_features)
+        self.minimum = np.zeros(n_features)
+        self.maximum = np.zeros(n_features)
+        self.lows = _MonotonicQueues(window, n_features, operator.lt)
+        self.highs = _MonotonicQueues(window, n_features, operator.gt)
+        self.last: np.ndarray | None = None
+        self.last_time = 0.0
+        self.updates = 0
+        self.seen_at = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.values.nbytes
+            + 5 * self.total.nbytes
+            + self.lows.nbytes
+            + self.highs.nbytes
+            + _ENTRY_OVERHEAD_BYTES
+        )
+
+    def push(self, values: np.ndarray, timestamp: float) -> np.ndarray:
+        """Add a record and return the per-feature rate of change since the last one."""
+
+        window = self.values.shape[0]
+        seq = self.updates
+        if self.count == window:
+            evicted = self.values[seq % window]
+            self.total -= evicted
+            self.total_sq -= evicted * evicted
+            # Expire before the evicted row's slot is overwritten.
+            self.lows.expire(seq - window)
+            self.highs.expire(seq - window)
+        else:
+            self.count += 1
+        self.values[seq % window] = values
+        self.total += values
+        self.total_sq += values * values
+        self.updates += 1
+
+        row = values.tolist()
+        ring = memoryview(self.values)
+        self.minimum = np.array(self.lows.push(seq, row, ring))
+        self.maximum = np.array(self.highs.push(seq, row, ring))
+        if self.updates % window == 0:
+            # Resynchronise the running sums so float error cannot accumulate.
+            self.total = self.values.sum(axis=0)
+            self.total_sq = np.einsum("ij,ij->j", self.values, self.values)
+
+        if self.last is None or timestamp <= self.last_time:
+            rate = np.zeros_like(values)
+        else:
+            rate = (values - self.last) / (timestamp - self.last_time)
+        self.last = values.copy()
+        self.last_time = timestamp
+        return rate
+
+    def stat(self, name: str, rate: np.ndarray) -> np.ndarray:
+        mean = self.total / self.count
+        if name == "mean":
+            return mean
+        if name == "var":
+            return np.maximum(self.total_sq / self.count - mean * mean, 0.0)
+        if name == "min":
+            return self.minimum
+        if name == "max":
+            return self.maximum
+        return rate
+
+
+class RollingFeatureEngine:
+    """Extend raw feature vectors with rolling statistics of each vehicle's history.
+
+    Every vehicle keeps a fixed-size ring buffer of its last ``layout.window``
+    raw vectors. Mean and variance come from running sums, minimum and
+    maximum from monotonic queues, and the rate of change is taken against
+    the previous record, so a record costs O(1) amortised per feature even
+    for monotonic series. Windows are dropped least recently used first once
+    their total size exceeds ``max_bytes``, and after ``idle_seconds``
+    without a record.
+    """
+
+    def __init__(
+        self,
+        layout: FeatureLayout,
+        max_bytes: int = 64 * 1024 * 1024,
+        idle_seconds: float = 3600.0,
+    ):
+        unknown = set(layout.stats) - set(ROLLING_STATS)
+        if unknown:
+            msg = f"Unknown rolling statistics {sorted(unknown)}, expected some of {ROLLING_STATS}"
+            raise ValueError(msg)
+        self.layout = layout
+        self.idle_seconds = idle_seconds
+        entry_bytes = _VehicleWindow(layout.window, layout.raw_features).nbytes
+        self.max_vehicles = max(1, max_bytes // entry_bytes)
+        self._windows: OrderedDict[str, _VehicleWindow] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def update(
+        self, vehicle_id: str, timestamp: float, feature_vector: Sequence[float]
+    ) -> np.ndarray:
+        """Record a vehicle's raw vector and return it extended to ``layout.n_features``."""
+
+        values = np.asarray(feature_vector, dtype=float)
+        if values.shape != (self.layout.raw_features,):
+            msg = (
+                f"feature_vector has {values.size} values, "
+                f"rolling features expect {self.layout.raw_features}"
+            )
+            raise ValueError(msg)
+
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(vehicle_id)
+            if window is None:
+                window = self._windows[vehicle_id] = _VehicleWindow(
+                    self.layout.window, self.layout.raw_features
+                )
+                window.seen_at = now
+                self._evict(now)
+            else:
+                self._windows.move_to_end(vehicle_id)
+                window.seen_at = now
+            rate = window.push(values, timestamp)
+            return np.concatenate(
+                [values, *(window.stat(name, rate) for name in self.layout.stats)]
+            )
+
+    def transform(
+        self, vehicle_ids: Sequence[str], timestamps: Sequence[float], feature_matrix: np.ndarray
+    ) -> np.ndarray:
+        """Extend every row, feeding each vehicle's records in timestamp order.
+
+        Rows are returned in their original order.
+        """
+
+        feature_matrix = np.asarray(feature_matrix, dtype=float)
+        if feature_matrix.ndim != 2 or feature_matrix.shape[1] != self.layout.raw_features:
+            msg = (
+                f"feature_vector has {feature_matrix.shape[-1]} values, "
+                f"rolling features expect {self.layout.raw_features}"
+            )
+            raise ValueError(msg)
+        extended = np.empty((feature_matrix.shape[0], self.layout.n_features))
+        for index in np.argsort(np.asarray(timestamps, dtype=float), kind="stable"):
+            extended[index] = self.update(
+                vehicle_ids[index], float(timestamps[index]), feature_matrix[index]
+            )
+        return extended
+
+    def evict_idle(self) -> int:
+        """Drop the windows of vehicles idle for ``idle_seconds``; return how many."""
+
+        with self._lock:
+            return self._evict(time.monotonic())
+
+    def _evict(self, now: float) -> int:
+        evicted = 0
+        while len(self._windows) > self.max_vehicles:
+            self._windows.popitem(last=False)
+            ROLLING_FEATURE_EVICTIONS.labels(reason="budget").inc()
+            evicted += 1
+        if self.idle_seconds > 0:
+            # Ordered by last use, so idle windows are all at the front.
+            while self._windows:
+                oldest = next(iter(self._windows.values()))
+                if now - oldest.seen_at < self.idle_seconds:
+                    break
+                self._windows.popitem(last=False)
+                ROLLING_FEATURE_EVICTIONS.labels(reason="idle").inc()
+                evicted += 1
+        ROLLING_FEATURE_VEHICLES.set(len(self._windows))
+        return evicted
@@ -0,0 +1,113 @@
+"""Result cache for repeated feature vectors, scoped to a model version."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.metrics import (
+    SCORE_CACHE_ENTRIES,
+    SCORE_CACHE_HIT_RATIO,
+    SCORE_CACHE_HITS,
+    SCORE_CACHE_MISSES,
+)
+
+ScoreKey = tuple[str, bytes]
+
+
+@dataclass(slots=True)
+class ScoreCacheStats:
+    """Point-in-time counters describing score cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ScoreCache:
+    """LRU map from (model version, feature vector hash) to anomaly score.
+
+    With a ``quantum`` above zero, features are rounded to multiples of it
+    before hashing, so vectors that differ by less than about half a quantum
+    share an entry and are answered with the score of the first one seen.
+    Entries older than ``ttl_seconds`` (if above zero) are treated as misses.
+    The owner clears the cache when ``LATEST`` moves.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: float = 0.0, quantum: float = 0.0):
+        if max_entries < 1:
+            msg = "max_entries must be at least 1"
+            raise ValueError(msg)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.quantum = quantum
+        self._entries: OrderedDict[ScoreKey, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = ScoreCacheStats()
+
+    def key(self, model_version: str, feature_vector: Sequence[float]) -> ScoreKey:
+        """Return the cache key of ``feature_vector`` scored by ``model_version``."""
+
+        values = np.asarray(feature_vector, dtype=float)
+        if self.quantum > 0:
+            values = np.rint(values / self.quantum).astype(np.int64)
+        digest = hashlib.blake2b(values.tobytes(), digest_size=16).digest()
+        return model_version, digest
+
+    def get(self, key: ScoreKey) -> float | None:
+        """Return the cached score for ``key`` or ``None`` on a miss."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                self.ttl_seconds <= 0 or time.monotonic() - entry[1] < self.ttl_seconds
+            ):
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                SCORE_CACHE_HITS.inc()
+                SCORE_CACHE_HIT_RATIO.set(self._stats.hit_ratio)
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self._stats.misses += 1
+            SCORE_CACHE_MISSES.inc()
+            SCORE_CACHE_HIT_RATIO.set(self._stats.hit_ratio)
+            return None
+
+    def put(self, key: ScoreKey, anomaly_score: float) -> None:
+        with self._lock:
+            self._entries[key] = (anomaly_score, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            SCORE_CACHE_ENTRIES.set(len(self._entries))
+
+    def clear(self) -> None:
+        """Drop every cached score."""
+
+        with self._lock:
+            self._entries.clear()
+            SCORE_CACHE_ENTRIES.set(0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> ScoreCacheStats:
+        """Return a snapshot of the cache counters."""
+
+        with self._lock:
+            return ScoreCacheStats(
+                hits=self._stats.hits, misses=self._stats.misses, entries=len(self._entries)
+            )
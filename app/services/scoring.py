@@ -2,18 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Iterable
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import NamedTuple
 
 import joblib
 import numpy as np
+from pydantic import ValidationError
 from sklearn.ensemble import IsolationForest
 
 from app.config import settings
+from app.core.storage import ArtifactCache, create_artifact_cache
 from app.domain import (
+    BatchScoreRequest,
+    BatchScoreResponse,
+    BatchScoreResult,
+    FeatureLayout,
     IsolationForestMetadata,
     ModelTrainingResponse,
     ScoreRequest,
@@ -21,9 +33,42 @@ from app.domain import (
     TelemetryBatch,
     TelemetryRecord,
 )
+from app.services.forest_engine import FlatForest
+from app.services.micro_batching import MicroBatcher
+from app.services.model_cache import ModelCache, ModelCacheStats
+from app.services.reservoir import FeatureReservoir
+from app.services.rolling_features import ROLLING_STATS, RollingFeatureEngine
+from app.services.score_cache import ScoreCache
+from app.services.sharding import shard_key_function, shard_version
+from app.services.training_window import TrainingWindow
 
 logger = logging.getLogger(__name__)
 
+# A LATEST pointer modified within this window is re-read even if its stat
+# signature looks unchanged, since coarse filesystem timestamps cannot
+# distinguish two writes that land in the same tick.
+_RACY_POINTER_WINDOW_SECONDS = 1.0
+
+SCORING_ENGINES = ("sklearn", "flat", "mmap")
+
+# Versions whose metadata (shard map, feature layout) is kept in memory
+_METADATA_CACHE_SIZE = 64
+# How long a version is remembered as missing before the store is asked again
+_MISSING_METADATA_TTL_SECONDS = 5.0
+
+ScoringModel = IsolationForest | FlatForest
+
+
+_NOT_CACHED = object()
+
+
+class _CurrentModel(NamedTuple):
+    """The model LATEST pointed at when the watcher last looked."""
+
+    version: str
+    model: ScoringModel
+    pointer_signature: tuple[int, int, int] | None
+
 
 @dataclass(slots=True)
 class IsolationForestConfig:
@@ -32,16 +77,79 @@ class IsolationForestConfig:
     n_estimators: int = 200
     contamination: float = 0.05
     random_state: int = 42
+    max_samples: int | float | str = "auto"  # Rows drawn per tree, as in IsolationForest
+    max_features: int | float = 1.0  # Features drawn per tree
+    n_jobs: int | None = None  # Threads fitting trees; -1 uses every core
+    reservoir_size: int = 100_000  # Rows kept when training from a stream
+    window_size: int = 10_000  # Recent rows kept per lineage for incremental updates
+    update_trees: int = 20  # Oldest trees replaced by each incremental update
+    shard_by: str = "vehicle_id"  # Shard key for sharded training: vehicle_id or segment
+    shard_segment_pattern: str = r"^([A-Za-z]+)"
+    shard_min_records: int = 50  # Smaller shards are left to the global model
+    rolling_window: int = 0  # Records per vehicle behind rolling features; 0 disables them
+    rolling_stats: tuple[str, ...] = ROLLING_STATS
 
 
 class IsolationForestScoringService:
     """Service responsible for training and scoring telemetry data."""
 
-    def __init__(self, artifact_dir: str | Path, config: IsolationForestConfig | None = None):
+    def __init__(
+        self,
+        artifact_dir: str | Path,
+        config: IsolationForestConfig | None = None,
+        model_cache: ModelCache | None = None,
+        scoring_engine: str = "sklearn",
+        artifact_cache: ArtifactCache | None = None,
+        shard_cache: ModelCache | None = None,
+        score_cache: ScoreCache | None = None,
+        rolling_max_bytes: int = 64 * 1024 * 1024,
+        rolling_idle_seconds: float = 3600.0,
+    ):
+        if scoring_engine not in SCORING_ENGINES:
+            msg = f"Unknown scoring engine '{scoring_engine}', expected one of {SCORING_ENGINES}"
+            raise ValueError(msg)
         self.artifact_dir = Path(artifact_dir)
         self.artifact_dir.mkdir(parents=True, exist_ok=True)
         self.latest_file = self.artifact_dir / "LATEST"
         self.config = config or IsolationForestConfig()
+        # Compared with None: an empty cache is falsy (ModelCache defines __len__).
+        self.model_cache = ModelCache() if model_cache is None else model_cache
+        # Shard models have their own pool so they cannot evict global versions.
+        self.shard_cache = (
+            ModelCache(max_entries=64, name="shards") if shard_cache is None else shard_cache
+        )
+        self._shard_key = shard_key_function(
+            self.config.shard_by, self.config.shard_segment_pattern
+        )
+        # (metadata or None if the version was not available, monotonic read
+        # time) of recently read versions. Never mutated: writers publish a
+        # new dict, so readers look versions up without a lock.
+        self._metadata: dict[str, tuple[IsolationForestMetadata | None, float]] = {}
+        # Serialises writers only
+        self._metadata_lock = threading.Lock()
+        # Live per-vehicle windows for models trained with rolling features,
+        # one engine per layout.
+        self.rolling_max_bytes = rolling_max_bytes
+        self.rolling_idle_seconds = rolling_idle_seconds
+        self._rolling_engines: dict[FeatureLayout, RollingFeatureEngine] = {}
+        self._rolling_lock = threading.Lock()
+        self.scoring_engine = scoring_engine
+        # Remote store that published artifacts are uploaded to and that
+        # versions missing from artifact_dir are fetched from, if configured.
+        self.artifact_cache = artifact_cache
+        # (stat signature, version) of the last LATEST pointer read from disk
+        self._latest_pointer: tuple[tuple[int, int, int], str] | None = None
+        # Swapped by the LATEST watcher; readers take one reference and keep
+        # using it, so no lock is needed and in-flight requests are unaffected.
+        self._current: _CurrentModel | None = None
+        self._watch_stop = threading.Event()
+        self._watch_thread: threading.Thread | None = None
+        self._prefetch_stop = threading.Event()
+        self._prefetch_thread: threading.Thread | None = None
+        # Opt-in reuse of scores for repeated vectors, cleared when LATEST moves.
+        self.score_cache = score_cache
+        # Opt-in coalescing of concurrent single-record /score calls.
+        self.micro_batcher: MicroBatcher | None = None
 
     # ------------------------------------------------------------------
     # Artifact helpers
@@ -49,17 +157,73 @@ class IsolationForestScoringService:
     def _model_path(self, version: str) -> Path:
         return self.artifact_dir / f"isolation_forest_{version}.joblib"
 
+    def _flat_path(self, version: str) -> Path:
+        return self.artifact_dir / f"isolation_forest_{version}.forest"
+
     def _metadata_path(self, version: str) -> Path:
         return self.artifact_dir / f"isolation_forest_{version}.metadata.json"
 
+    def _window_path(self, lineage: str) -> Path:
+        return self.artifact_dir / f"isolation_forest_lineage_{lineage}.window.npy"
+
+    def _resolve_artifact(self, path: Path) -> Path:
+        """Return ``path``, or a cached copy from the remote store if it is not local."""
+
+        if path.exists() or self.artifact_cache is None:
+            return path
+        try:
+            return self.artifact_cache.fetch(path.name)
+        except FileNotFoundError:
+            return path
+
+    def _new_version(self) -> str:
+        """Timestamp-based version name, suffixed if that second is already taken."""
+
+        base = datetime.now(tz=UTC).strftime("%Y%m%d%H%M%S")
+        version, suffix = base, 1
+        while self._model_path(version).exists():
+            version = f"{base}-{suffix}"
+            suffix += 1
+        return version
+
+    def _read_metadata(self, version: str) -> IsolationForestMetadata:
+        path = self._resolve_artifact(self._metadata_path(version))
+        if not path.exists():
+            msg = f"Model version '{version}' is not available"
+            raise FileNotFoundError(msg)
+        return IsolationForestMetadata.model_validate(joblib.load(path))
+
     def _write_latest_version(self, version: str) -> None:
-        self.latest_file.write_text(version, encoding="utf-8")
+        _write_atomically(
+            self.latest_file, lambda path: path.write_text(version, encoding="utf-8")
+        )
+        self._latest_pointer = None
 
     def _read_latest_version(self) -> str:
-        if not self.latest_file.exists():
+        """Resolve the LATEST pointer, re-reading it only when its stat changes."""
+
+        try:
+            stat = os.stat(self.latest_file)
+        except FileNotFoundError:
+            self._latest_pointer = None
             msg = "No trained model available"
-            raise FileNotFoundError(msg)
-        return self.latest_file.read_text(encoding="utf-8").strip()
+            raise FileNotFoundError(msg) from None
+
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached = self._latest_pointer
+        racy = time.time() - stat.st_mtime < _RACY_POINTER_WINDOW_SECONDS
+        if cached is not None and cached[0] == signature and not racy:
+            return cached[1]
+
+        version = self.latest_file.read_text(encoding="utf-8").strip()
+        self._latest_pointer = (signature, version)
+        if cached is None or cached[1] != version:
+            self._clear_scores()
+        return version
+
+    def _clear_scores(self) -> None:
+        if self.score_cache is not None:
+            self.score_cache.clear()
 
     # ------------------------------------------------------------------
     # Training
@@ -67,68 +231,979 @@ class IsolationForestScoringService:
     def train(self, batch: TelemetryBatch) -> ModelTrainingResponse:
         """Train an IsolationForest model using a batch of telemetry records."""
 
-        feature_matrix = self._to_matrix(batch.records)
+        return self.train_telemetry(
+            self._to_matrix(batch.records),
+            [record.vehicle_id for record in batch.records],
+            [record.timestamp.timestamp() for record in batch.records],
+            batch.model_version,
+            sharded=batch.sharded,
+        )
+
+    def train_telemetry(
+        self,
+        feature_matrix: np.ndarray,
+        vehicle_ids: Sequence[str],
+        timestamps: Sequence[float],
+        model_version: str | None = None,
+        sharded: bool = False,
+    ) -> ModelTrainingResponse:
+        """Train from raw vectors with each row's vehicle id and epoch timestamp.
+
+        Rolling features are appended when ``rolling_window`` is set, and with
+        ``sharded`` a model is also trained per shard, as for ``train``.
+        """
+
+        feature_matrix, feature_layout = self.with_rolling_features(
+            vehicle_ids, timestamps, feature_matrix
+        )
+        return self.train_matrix(
+            feature_matrix, model_version, vehicle_ids if sharded else None, feature_layout
+        )
+
+    def with_rolling_features(
+        self, vehicle_ids: Sequence[str], timestamps: Sequence[float], feature_matrix: np.ndarray
+    ) -> tuple[np.ndarray, FeatureLayout | None]:
+        """Append rolling features to a training matrix if ``rolling_window`` is set.
+
+        Returns the matrix to fit and its layout (``None`` for raw vectors).
+        """
+
+        if not feature_matrix.size:
+            return feature_matrix, None
+        layout = self._training_layout(feature_matrix.shape[1])
+        if layout is None:
+            return feature_matrix, None
+        return _with_rolling_features(layout, vehicle_ids, timestamps, feature_matrix), layout
+
+    def stream_rolling_engine(self, raw_features: int) -> RollingFeatureEngine | None:
+        """Return a fresh engine extending training stream rows, if rolling features are on.
+
+        Its windows are separate from live scoring's and bounded by the same
+        memory budget, since a stream is not held in memory to be replayed.
+        """
+
+        layout = self._training_layout(raw_features)
+        if layout is None:
+            return None
+        return RollingFeatureEngine(layout, self.rolling_max_bytes, idle_seconds=0)
+
+    def train_matrix(
+        self,
+        feature_matrix: np.ndarray,
+        model_version: str | None = None,
+        vehicle_ids: Sequence[str] | None = None,
+        feature_layout: FeatureLayout | None = None,
+        model: IsolationForest | None = None,
+        records_seen: int | None = None,
+    ) -> ModelTrainingResponse:
+        """Train and publish an IsolationForest from a prepared feature matrix.
+
+        With ``vehicle_ids`` (one per row) a model is also trained for every
+        shard holding at least ``shard_min_records`` rows; scoring routes the
+        shard's vehicles to it. ``feature_layout`` is recorded for matrices
+        that already include rolling features, so scoring builds the same
+        vectors. A ``model`` already fitted on ``feature_matrix`` (a sweep's
+        pick) is published as is. ``records_seen`` is reported when the
+        matrix samples a larger input.
+        """
+
         if feature_matrix.size == 0:
             msg = "Telemetry batch must contain records"
             raise ValueError(msg)
 
-        model_version = batch.model_version or datetime.now(tz=UTC).strftime("%Y%m%d%H%M%S")
-        model = IsolationForest(
+        model_version = model_version or self._new_version()
+        if model is None:
+            model = self._new_forest().fit(feature_matrix)
+
+        if self.config.window_size > 0:
+            window_path = self._window_path(model_version)
+            with TrainingWindow.locked(window_path):
+                window = TrainingWindow.create(
+                    window_path, self.config.window_size, feature_matrix.shape[1]
+                )
+                window.append(feature_matrix)
+                window.flush()
+
+        # Shards are published first so the global version never maps a
+        # shard whose artifacts are not yet in place.
+        shards = {}
+        if vehicle_ids is not None:
+            shards = self._train_shards(feature_matrix, vehicle_ids, model_version, feature_layout)
+        metadata = IsolationForestMetadata(
+            model_version=model_version,
+            trained_at=datetime.now(tz=UTC),
+            n_estimators=model.n_estimators,
+            contamination=model.contamination,
+            n_features=feature_matrix.shape[1],
+            lineage=model_version,
+            shards=shards,
+            feature_layout=feature_layout,
+        )
+        self._publish(model, metadata)
+
+        return ModelTrainingResponse(
+            model_version=model_version,
+            records_seen=feature_matrix.shape[0] if records_seen is None else records_seen,
+            records_trained=feature_matrix.shape[0],
+            metadata=metadata,
+        )
+
+    def train_stream(
+        self, rows: Iterable[Sequence[float]], model_version: str | None = None
+    ) -> ModelTrainingResponse:
+        """Train from an iterator of feature vectors of any length in bounded memory.
+
+        ``rows`` may be the parsed lines of a file, a database cursor or any
+        other iterator. A uniform sample of ``config.reservoir_size`` rows is
+        kept and the forest is fitted on it; since every tree only draws
+        ``max_samples`` rows, a reservoir well above that loses nothing.
+        """
+
+        reservoir = FeatureReservoir(self.config.reservoir_size, self.config.random_state)
+        reservoir.consume(rows)
+        logger.info(
+            "Sampled %d of %d streamed rows for training",
+            min(reservoir.n_seen, reservoir.capacity),
+            reservoir.n_seen,
+        )
+        return self.train_matrix(
+            reservoir.sample(), model_version, records_seen=reservoir.n_seen
+        )
+
+    def _new_forest(self) -> IsolationForest:
+        return IsolationForest(
             n_estimators=self.config.n_estimators,
+            max_samples=self.config.max_samples,
+            max_features=self.config.max_features,
             contamination=self.config.contamination,
+            n_jobs=self.config.n_jobs,
             random_state=self.config.random_state,
         )
-        model.fit(feature_matrix)
 
-        artifact_path = self._model_path(model_version)
-        joblib.dump(model, artifact_path)
-        logger.info("IsolationForest model persisted at %s", artifact_path)
+    def _training_layout(self, raw_features: int) -> FeatureLayout | None:
+        if self.config.rolling_window <= 0:
+            return None
+        return FeatureLayout(
+            raw_features=raw_features,
+            window=self.config.rolling_window,
+            stats=self.config.rolling_stats,
+        )
+
+    def _train_shards(
+        self,
+        feature_matrix: np.ndarray,
+        vehicle_ids: Sequence[str],
+        model_version: str,
+        feature_layout: FeatureLayout | None = None,
+    ) -> dict[str, str]:
+        """Fit and publish one forest per large enough shard; return key -> version."""
+
+        if len(vehicle_ids) != feature_matrix.shape[0]:
+            msg = "vehicle_ids must have one entry per feature row"
+            raise ValueError(msg)
+        rows: dict[str, list[int]] = {}
+        for index, vehicle_id in enumerate(vehicle_ids):
+            key = self._shard_key(vehicle_id)
+            if key is not None:
+                rows.setdefault(key, []).append(index)
+
+        shards = {}
+        for key, indices in rows.items():
+            if len(indices) < self.config.shard_min_records:
+                continue
+            version = shard_version(model_version, key)
+            model = self._new_forest().fit(feature_matrix[indices])
+            metadata = IsolationForestMetadata(
+                model_version=version,
+                trained_at=datetime.now(tz=UTC),
+                n_estimators=self.config.n_estimators,
+                contamination=self.config.contamination,
+                n_features=feature_matrix.shape[1],
+                lineage=version,
+                shard_key=key,
+                feature_layout=feature_layout,
+            )
+            self._publish(model, metadata, latest=False)
+            shards[key] = version
+        logger.info(
+            "Trained %d shard models for version %s (%d shards below %d records)",
+            len(shards),
+            model_version,
+            len(rows) - len(shards),
+            self.config.shard_min_records,
+        )
+        return shards
+
+    def update(
+        self, batch: TelemetryBatch, base_version: str | None = None
+    ) -> ModelTrainingResponse:
+        """Incrementally update a model with a batch of telemetry records."""
+
+        feature_matrix = self._to_matrix(batch.records)
+        base_version = base_version or self._read_latest_version()
+        feature_layout = self._read_metadata(base_version).feature_layout
+        if feature_layout is not None:
+            feature_matrix = _with_rolling_features(
+                feature_layout,
+                [record.vehicle_id for record in batch.records],
+                [record.timestamp.timestamp() for record in batch.records],
+                feature_matrix,
+            )
+        return self.update_matrix(feature_matrix, base_version, batch.model_version)
+
+    def update_matrix(
+        self,
+        feature_matrix: np.ndarray,
+        base_version: str | None = None,
+        model_version: str | None = None,
+    ) -> ModelTrainingResponse:
+        """Grow fresh trees on new rows, retire the oldest and publish a new version.
+
+        ``config.update_trees`` trees are fitted on the new rows (topped up with
+        rows sampled from the lineage's window when the batch is smaller than
+        the forest's ``max_samples``) and replace the oldest trees of
+        ``base_version`` (default: LATEST). The new rows enter the lineage's
+        bounded window, which is also used to recalibrate the contamination
+        threshold, so the cost depends on the batch and window size rather than
+        the total history.
+        """
+
+        if feature_matrix.size == 0:
+            msg = "Telemetry batch must contain records"
+            raise ValueError(msg)
+
+        base_version = base_version or self._read_latest_version()
+        base_metadata = self._read_metadata(base_version)
+        if feature_matrix.shape[1] != base_metadata.n_features:
+            msg = (
+                f"feature_vector has {feature_matrix.shape[1]} values, "
+                f"model version '{base_version}' expects {base_metadata.n_features}"
+            )
+            raise ValueError(msg)
+
+        # Load a private copy: cached models are shared with concurrent scorers.
+        model = joblib.load(self._resolve_artifact(self._model_path(base_version)))
+        lineage = base_metadata.lineage or base_version
+        generation = base_metadata.generation + 1
+        model_version = model_version or self._new_version()
+        rng = np.random.default_rng([self.config.random_state, generation])
+
+        window_path = self._window_path(lineage)
+        with TrainingWindow.locked(window_path):
+            window = TrainingWindow.open(
+                window_path, max(1, self.config.window_size), feature_matrix.shape[1]
+            )
+            max_samples = model._max_samples
+            fresh_rows = np.asarray(feature_matrix, dtype=float)
+            if fresh_rows.shape[0] < max_samples:
+                top_up = window.sample(max_samples - fresh_rows.shape[0], rng)
+                fresh_rows = np.vstack([fresh_rows, top_up])
+            if fresh_rows.shape[0] < max_samples:
+                resampled = rng.choice(fresh_rows.shape[0], size=max_samples, replace=True)
+                fresh_rows = fresh_rows[resampled]
+
+            n_replace = max(1, min(self.config.update_trees, len(model.estimators_)))
+            fresh = IsolationForest(
+                n_estimators=n_replace,
+                max_samples=max_samples,
+                max_features=model.max_features,
+                contamination=model.contamination,
+                n_jobs=self.config.n_jobs,
+                random_state=int(rng.integers(np.iinfo(np.int32).max)),
+            ).fit(fresh_rows)
+            _replace_oldest_trees(model, fresh)
+
+            window.append(feature_matrix)
+            window.flush()
+            if model.contamination != "auto":
+                model.offset_ = float(
+                    np.percentile(model.score_samples(window.rows()), 100.0 * model.contamination)
+                )
 
         metadata = IsolationForestMetadata(
             model_version=model_version,
             trained_at=datetime.now(tz=UTC),
-            n_estimators=self.config.n_estimators,
-            contamination=self.config.contamination,
+            n_estimators=len(model.estimators_),
+            contamination=base_metadata.contamination,
             n_features=feature_matrix.shape[1],
+            lineage=lineage,
+            parent_version=base_version,
+            generation=generation,
+            # Shard models are not updated; the new version keeps routing to them.
+            shards=base_metadata.shards,
+            feature_layout=base_metadata.feature_layout,
+        )
+        self._publish(model, metadata)
+        logger.info(
+            "Replaced %d trees of version %s to publish version %s",
+            n_replace,
+            base_version,
+            model_version,
         )
-        joblib.dump(metadata.model_dump(), self._metadata_path(model_version))
-        logger.debug("Metadata persisted for model version %s", model_version)
-
-        self._write_latest_version(model_version)
-        logger.info("Updated latest model pointer to version %s", model_version)
 
         return ModelTrainingResponse(
             model_version=model_version,
-            record_count=len(batch.records),
+            records_seen=feature_matrix.shape[0],
+            records_trained=feature_matrix.shape[0],
             metadata=metadata,
         )
 
+    def _publish(
+        self, model: IsolationForest, metadata: IsolationForestMetadata, latest: bool = True
+    ) -> None:
+        model_version = metadata.model_version
+        artifact_path = self._model_path(model_version)
+        # Every file is renamed into place once complete, and LATEST last, so
+        # a reader never sees a pointer to a missing or partial artifact.
+        _write_atomically(artifact_path, lambda path: joblib.dump(model, path))
+        FlatForest.from_isolation_forest(model).save(self._flat_path(model_version))
+        self.invalidate(model_version)
+        logger.info("IsolationForest model persisted at %s", artifact_path)
+
+        _write_atomically(
+            self._metadata_path(model_version),
+            lambda path: joblib.dump(metadata.model_dump(), path),
+        )
+        logger.debug("Metadata persisted for model version %s", model_version)
+        # Drop any metadata cached for this name.
+        self._forget_metadata()
+
+        if latest:
+            self._write_latest_version(model_version)
+            logger.info("Updated latest model pointer to version %s", model_version)
+
+        if self.artifact_cache is not None:
+            self.artifact_cache.publish(
+                [artifact_path, self._flat_path(model_version), self._metadata_path(model_version)],
+                self.latest_file.name if latest else None,
+                model_version,
+            )
+            logger.info("Published model version %s to the artifact store", model_version)
+
     # ------------------------------------------------------------------
     # Scoring
     # ------------------------------------------------------------------
     def score(self, request: ScoreRequest) -> ScoreResponse:
         """Score a single telemetry record using the requested model version."""
 
-        model_version = request.model_version or self._read_latest_version()
-        model = self._load_model(model_version)
+        model_version, shard = self.resolve_model(request.model_version, request.vehicle_id)
+        feature_vector = self.features_for(model_version, request)
+        anomaly_score = cache_key = None
+        if self.score_cache is not None:
+            cache_key = self.score_cache.key(model_version, feature_vector)
+            anomaly_score = self.score_cache.get(cache_key)
 
-        feature_vector = np.array(request.feature_vector, dtype=float).reshape(1, -1)
-        anomaly_score = float(model.decision_function(feature_vector)[0])
-        is_anomaly = bool(model.predict(feature_vector)[0] == -1)
+        if anomaly_score is None:
+            model = self._model_for(model_version, self.shard_cache if shard else None)
+            feature_matrix = np.array(feature_vector, dtype=float).reshape(1, -1)
+            anomaly_score = float(self._decision_scores(model, feature_matrix)[0])
+            if cache_key is not None:
+                self.score_cache.put(cache_key, anomaly_score)
 
         return ScoreResponse(
             vehicle_id=request.vehicle_id,
             timestamp=request.timestamp,
             model_version=model_version,
             anomaly_score=anomaly_score,
-            is_anomaly=is_anomaly,
+            is_anomaly=anomaly_score < 0,
         )
 
+    def resolve_model(self, model_version: str | None, vehicle_id: str) -> tuple[str, bool]:
+        """Return the version that scores ``vehicle_id`` and whether it is a shard model."""
+
+        model_version = model_version or self._latest_version()
+        shard = self._shard_for(model_version, vehicle_id)
+        return (shard, True) if shard is not None else (model_version, False)
+
+    def pin_version(self, model_version: str | None = None) -> str:
+        """Resolve ``model_version`` (default: LATEST) to a version that is available.
+
+        Used by long-lived sessions that must keep scoring with one version
+        even after LATEST moves.
+        """
+
+        model_version = model_version or self._latest_version()
+        if self._metadata_for(model_version) is None:
+            msg = f"Model version '{model_version}' is not available"
+            raise FileNotFoundError(msg)
+        return model_version
+
+    def features_for(self, model_version: str, record: TelemetryRecord) -> Sequence[float]:
+        """Return the vector ``model_version`` scores for ``record``.
+
+        For a model trained with rolling features the record enters its
+        vehicle's window and the window's statistics are appended; otherwise
+        the raw vector is returned unchanged.
+        """
+
+        engine = self._rolling_engine(model_version)
+        if engine is None:
+            return record.feature_vector
+        return engine.update(record.vehicle_id, record.timestamp.timestamp(), record.feature_vector)
+
+    def score_rows(
+        self, model_version: str, feature_matrix: np.ndarray, shard: bool = False
+    ) -> np.ndarray:
+        """Score a matrix with a model already chosen by ``resolve_model``."""
+
+        model = self._model_for(model_version, self.shard_cache if shard else None)
+        if feature_matrix.shape[1] != model.n_features_in_:
+            msg = (
+                f"feature_vector has {feature_matrix.shape[1]} values, "
+                f"model version '{model_version}' expects {model.n_features_in_}"
+            )
+            raise ValueError(msg)
+        return self._decision_scores(model, feature_matrix)
+
+    def score_matrix(
+        self,
+        feature_matrix: np.ndarray,
+        model_version: str | None = None,
+        vehicle_ids: Sequence[str] | None = None,
+        timestamps: Sequence[float] | None = None,
+    ) -> tuple[str, list[str], np.ndarray]:
+        """Score a prepared feature matrix with one forest pass per model or shard model.
+
+        Given the ``vehicle_ids`` and epoch-second ``timestamps`` of the rows,
+        rows of sharded vehicles are routed to their shard model as in
+        ``score_batch``, and raw rows are extended with rolling features
+        first if the model was trained with them. Returns the resolved model
+        version, the version that scored each row and the decision scores;
+        negative scores are anomalies.
+        """
+
+        model_version = model_version or self._latest_version()
+        n_rows = feature_matrix.shape[0]
+        if vehicle_ids is None:
+            return model_version, [model_version] * n_rows, self.score_rows(
+                model_version, feature_matrix
+            )
+
+        metadata = self._metadata_for(model_version)
+        groups: dict[tuple[str, bool], list[int]] = {}
+        if metadata is None or not metadata.shards:
+            groups[(model_version, False)] = list(range(n_rows))
+        else:
+            for index, vehicle_id in enumerate(vehicle_ids):
+                groups.setdefault(self.resolve_model(model_version, vehicle_id), []).append(index)
+
+        row_versions = [model_version] * n_rows
+        anomaly_scores = np.empty(n_rows, dtype=float)
+        timestamps = np.asarray(timestamps, dtype=float)
+        for (version, shard), rows in groups.items():
+            # A single group (the common case) is scored without copying rows.
+            whole = len(rows) == n_rows
+            matrix = feature_matrix if whole else feature_matrix[rows]
+            engine = self._rolling_engine(version)
+            if engine is not None:
+                matrix = engine.transform(
+                    vehicle_ids if whole else [vehicle_ids[index] for index in rows],
+                    timestamps if whole else timestamps[rows],
+                    matrix,
+                )
+            anomaly_scores[rows] = self.score_rows(version, matrix, shard)
+            for index in rows:
+                row_versions[index] = version
+        return model_version, row_versions, anomaly_scores
+
+    def score_batch(self, batch: BatchScoreRequest) -> BatchScoreResponse:
+        """Score many telemetry records with one forest pass per model or shard model.
+
+        Rows that fail validation, reference an unavailable model or do not
+        match the model's feature width are reported individually; the
+        remaining rows are still scored. Results are returned in request order.
+        """
+
+        results: list[BatchScoreResult | None] = [None] * len(batch.records)
+        groups: dict[str, list[tuple[int, ScoreRequest, Sequence[float]]]] = {}
+        shard_versions: set[str] = set()
+        latest_version: str | None = None
+
+        for index, raw_record in enumerate(batch.records):
+            try:
+                record = ScoreRequest.model_validate(raw_record)
+            except ValidationError as exc:
+                results[index] = BatchScoreResult(index=index, error=_format_validation_error(exc))
+                continue
+
+            model_version = record.model_version or batch.model_version
+            if model_version is None:
+                try:
+                    latest_version = latest_version or self._latest_version()
+                except FileNotFoundError as exc:
+                    results[index] = _record_error(index, record, str(exc))
+                    continue
+                model_version = latest_version
+            shard = self._shard_for(model_version, record.vehicle_id)
+            if shard is not None:
+                model_version = shard
+                shard_versions.add(shard)
+            try:
+                features = self.features_for(model_version, record)
+            except ValueError as exc:
+                results[index] = _record_error(index, record, str(exc), model_version)
+                continue
+            groups.setdefault(model_version, []).append((index, record, features))
+
+        for model_version, rows in groups.items():
+            pool = self.shard_cache if model_version in shard_versions else None
+            self._score_group(model_version, rows, results, pool)
+
+        error_count = sum(1 for result in results if result.error is not None)
+        return BatchScoreResponse(
+            results=results,
+            scored_count=len(results) - error_count,
+            error_count=error_count,
+        )
+
+    def cache_stats(self) -> ModelCacheStats:
+        """Return hit/miss counters and load timings for the model cache."""
+
+        return self.model_cache.stats()
+
+    def invalidate(self, version: str) -> None:
+        """Drop ``version`` and its shard models from memory, e.g. after a republish."""
+
+        self.model_cache.invalidate(version)
+        self.shard_cache.invalidate(version)
+        metadata = self._metadata_for(version)
+        for shard in metadata.shards.values() if metadata is not None else ():
+            self.shard_cache.invalidate(shard)
+        self._forget_metadata()
+        self._clear_scores()
+
+    async def ensure_loaded(
+        self, model_version: str | None = None, vehicle_ids: Iterable[str] = ()
+    ) -> None:
+        """Fetch what scoring ``model_version`` (default: LATEST) needs in a worker thread.
+
+        With a remote artifact store configured, reading metadata or a model
+        that is not on local disk downloads it. The routes call this before
+        scoring so that the version's metadata, its model and the shard
+        models serving ``vehicle_ids`` are already in memory and no S3 call
+        runs on the event loop. Load errors are left for the scoring call to
+        report.
+        """
+
+        await self._ensure_loaded({model_version: list(vehicle_ids)})
+
+    async def ensure_batch_loaded(self, batch: BatchScoreRequest) -> None:
+        """``ensure_loaded`` for every model version and vehicle a batch references."""
+
+        targets: dict[str | None, list[str]] = {}
+        for record in batch.records:
+            version = record.get("model_version") or batch.model_version
+            vehicle_id = record.get("vehicle_id")
+            # Malformed records are reported by score_batch; skip them here.
+            if isinstance(version, str | None) and isinstance(vehicle_id, str):
+                targets.setdefault(version, []).append(vehicle_id)
+        await self._ensure_loaded(targets)
+
+    async def _ensure_loaded(self, targets: dict[str | None, list[str]]) -> None:
+        if self.artifact_cache is None:
+            return
+        resolved: dict[str, list[str]] = {}
+        for version, vehicle_ids in targets.items():
+            if version is None:
+                try:
+                    version = self._latest_version()
+                except FileNotFoundError:
+                    continue
+            resolved.setdefault(version, []).extend(vehicle_ids)
+        if all(self._in_memory(version, ids) for version, ids in resolved.items()):
+            return
+        await asyncio.to_thread(self._load_for_scoring, resolved)
+
+    # ------------------------------------------------------------------
+    # Remote artifact store
+    # ------------------------------------------------------------------
+    def sync_remote_latest(self) -> str | None:
+        """Download the version the remote LATEST names, then point LATEST at it.
+
+        The metadata and the artifact the scoring engine reads are fetched
+        before the local pointer moves, so the LATEST watcher swaps in a model
+        whose files are already on disk. Returns the remote version, if any.
+        """
+
+        if self.artifact_cache is None:
+            return None
+        version = self.artifact_cache.read_pointer(self.latest_file.name)
+        if not version:
+            return None
+        try:
+            if self._read_latest_version() == version:
+                return version
+        except FileNotFoundError:
+            pass
+
+        self._resolve_artifact(self._metadata_path(version))
+        engine_path = (
+            self._flat_path(version) if self.scoring_engine == "mmap" else self._model_path(version)
+        )
+        self._resolve_artifact(engine_path)
+        self._write_latest_version(version)
+        logger.info("Fetched model version %s from the artifact store", version)
+        return version
+
+    def start_prefetching(self, interval: float = 15.0) -> None:
+        """Poll the remote LATEST every ``interval`` seconds and download new versions."""
+
+        if self.artifact_cache is None or self._prefetch_thread is not None:
+            return
+        self._prefetch_stop.clear()
+        self._prefetch_thread = threading.Thread(
+            target=self._prefetch, args=(interval,), name="artifact-prefetch", daemon=True
+        )
+        self._prefetch_thread.start()
+
+    def stop_prefetching(self) -> None:
+        """Stop polling the remote store; an in-progress download is finished first."""
+
+        if self._prefetch_thread is None:
+            return
+        self._prefetch_stop.set()
+        self._prefetch_thread.join()
+        self._prefetch_thread = None
+
+    def _prefetch(self, interval: float) -> None:
+        while True:
+            try:
+                self.sync_remote_latest()
+            except Exception:
+                logger.exception("Failed to prefetch the remote LATEST model")
+            if self._prefetch_stop.wait(interval):
+                return
+
+    # ------------------------------------------------------------------
+    # LATEST hot reload
+    # ------------------------------------------------------------------
+    @property
+    def watching(self) -> bool:
+        return self._watch_thread is not None
+
+    def refresh_latest(self) -> str | None:
+        """Load the model LATEST names and make it the one unversioned requests use.
+
+        The new model is fully loaded before the reference is swapped, so
+        requests never wait on a load and those already running finish on the
+        model they started with. Returns the current version, if any.
+        """
+
+        try:
+            version = self._read_latest_version()
+        except FileNotFoundError:
+            self._current = None
+            return None
+
+        signature = self._latest_pointer[0] if self._latest_pointer is not None else None
+        current = self._current
+        if current is not None and current.version == version:
+            if current.pointer_signature == signature:
+                return version
+            # The same version name was published again; drop the old artifact.
+            self.invalidate(version)
+
+        model = self._load_model(version)
+        self._metadata_for(version)  # Read the shard map off the request path too
+        self._current = _CurrentModel(version, model, signature)
+        if current is None or current.version != version:
+            self._clear_scores()
+            logger.info("Serving model version %s", version)
+        return version
+
+    def start_watching(self, interval: float = 1.0) -> None:
+        """Poll LATEST every ``interval`` seconds and hot-swap the current model."""
+
+        if self._watch_thread is not None:
+            return
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch, args=(interval,), name="latest-model-watcher", daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        """Stop the watcher; unversioned requests resolve LATEST from disk again."""
+
+        if self._watch_thread is None:
+            return
+        self._watch_stop.set()
+        self._watch_thread.join()
+        self._watch_thread = None
+        self._current = None
+
+    def _watch(self, interval: float) -> None:
+        while True:
+            try:
+                self.refresh_latest()
+            except Exception:
+                logger.exception("Failed to reload the LATEST model")
+            if self._watch_stop.wait(interval):
+                return
+
+    def warm_up(self, iterations: int = 3) -> str | None:
+        """Load the LATEST model and run synthetic scoring calls through it.
+
+        Pays unpickling and first-call costs (NumPy/sklearn dispatch,
+        Pydantic validators) before real traffic arrives. The synthetic rows
+        go straight to the model, so neither the score cache nor the rolling
+        feature windows see them. Returns the warmed version, or ``None``
+        when no model has been trained yet.
+        """
+
+        try:
+            model_version = self._latest_version()
+        except FileNotFoundError:
+            return None
+        model = self._model_for(model_version)
+        metadata = self._metadata_for(model_version)
+        raw_features = model.n_features_in_
+        if metadata is not None and metadata.feature_layout is not None:
+            raw_features = metadata.feature_layout.raw_features
+
+        rng = np.random.default_rng(0)
+        for _ in range(iterations):
+            ScoreRequest(
+                vehicle_id="warm-up",
+                timestamp=datetime.now(tz=UTC),
+                feature_vector=rng.normal(size=raw_features).tolist(),
+                model_version=model_version,
+            )
+            self._decision_scores(model, rng.normal(size=(1, model.n_features_in_)))
+            self._decision_scores(model, rng.normal(size=(64, model.n_features_in_)))
+        return model_version
+
+    def recent_versions(self, limit: int) -> list[str]:
+        """Return up to ``limit`` published versions, newest first."""
+
+        suffix = ".metadata.json"
+        paths = sorted(
+            self.artifact_dir.glob(f"isolation_forest_*{suffix}"),
+            key=lambda path: path.stat().st_mtime_ns,
+            reverse=True,
+        )
+        return [path.name[len("isolation_forest_") : -len(suffix)] for path in paths[:limit]]
+
+    def preload(self, recent: int = 0) -> list[str]:
+        """Load the LATEST model and up to ``recent`` other versions into the cache.
+
+        Returns the versions loaded; missing or unreadable artifacts are
+        skipped so a fresh deployment without models still starts.
+        """
+
+        try:
+            versions = [self._read_latest_version()]
+        except FileNotFoundError:
+            versions = []
+        for version in self.recent_versions(recent + 1):
+            if version not in versions and len(versions) < recent + 1:
+                versions.append(version)
+
+        loaded = []
+        for version in versions:
+            try:
+                self._load_model(version)
+            except (FileNotFoundError, TypeError, ValueError) as exc:
+                logger.warning("Could not preload model version %s: %s", version, exc)
+                continue
+            loaded.append(version)
+        return loaded
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _load_model(self, version: str) -> IsolationForest:
-        path = self._model_path(version)
+    def _score_group(
+        self,
+        model_version: str,
+        rows: Sequence[tuple[int, ScoreRequest, Sequence[float]]],
+        results: list[BatchScoreResult | None],
+        pool: ModelCache | None = None,
+    ) -> None:
+        try:
+            model = self._model_for(model_version, pool)
+        except (FileNotFoundError, TypeError) as exc:
+            for index, record, _ in rows:
+                results[index] = _record_error(index, record, str(exc), model_version)
+            return
+
+        n_features = model.n_features_in_
+        scorable: list[tuple[int, ScoreRequest, Sequence[float]]] = []
+        for index, record, features in rows:
+            if len(features) != n_features:
+                msg = (
+                    f"feature_vector has {len(features)} values, "
+                    f"model version '{model_version}' expects {n_features}"
+                )
+                results[index] = _record_error(index, record, msg, model_version)
+            else:
+                scorable.append((index, record, features))
+        if not scorable:
+            return
+
+        anomaly_scores: list[float | None] = [None] * len(scorable)
+        cache_keys = None
+        if self.score_cache is not None:
+            cache_keys = [
+                self.score_cache.key(model_version, features) for _, _, features in scorable
+            ]
+            anomaly_scores = [self.score_cache.get(key) for key in cache_keys]
+        missing = [row for row, anomaly_score in enumerate(anomaly_scores) if anomaly_score is None]
+
+        if missing:
+            feature_matrix = np.empty((len(missing), n_features), dtype=float)
+            for position, row in enumerate(missing):
+                feature_matrix[position] = scorable[row][2]
+            fresh_scores = self._decision_scores(model, feature_matrix).tolist()
+            for row, anomaly_score in zip(missing, fresh_scores):
+                anomaly_scores[row] = anomaly_score
+                if cache_keys is not None:
+                    self.score_cache.put(cache_keys[row], anomaly_score)
+
+        for (index, record, _), anomaly_score in zip(scorable, anomaly_scores):
+            results[index] = BatchScoreResult(
+                index=index,
+                vehicle_id=record.vehicle_id,
+                timestamp=record.timestamp,
+                model_version=model_version,
+                anomaly_score=anomaly_score,
+                is_anomaly=anomaly_score < 0,
+            )
+
+    @staticmethod
+    def _decision_scores(model: ScoringModel, feature_matrix: np.ndarray) -> np.ndarray:
+        # IsolationForest.predict flags a row as an outlier exactly when its
+        # decision score is negative, so one pass yields both outputs.
+        return model.decision_function(feature_matrix)
+
+    def _latest_version(self) -> str:
+        current = self._current
+        return current.version if current is not None else self._read_latest_version()
+
+    def _model_for(self, version: str, pool: ModelCache | None = None) -> ScoringModel:
+        # The watched model is served without touching the cache or its lock.
+        current = self._current
+        if pool is None and current is not None and current.version == version:
+            return current.model
+        return self._load_model(version, pool)
+
+    def _load_model(self, version: str, pool: ModelCache | None = None) -> ScoringModel:
+        cache = self.model_cache if pool is None else pool
+        if version not in cache and self._cached_metadata(version) is None:
+            # Every published version has metadata; do not ask the store again.
+            msg = f"Model version '{version}' is not available"
+            raise FileNotFoundError(msg)
+        return cache.get_or_load(version, lambda: self._read_model_artifact(version))
+
+    def _metadata_for(self, version: str) -> IsolationForestMetadata | None:
+        """Return ``version``'s metadata, or ``None`` if it is not available (cached).
+
+        Hits take no lock. A miss reads the metadata and publishes a copy of
+        the cache with it added, evicting the versions read longest ago.
+        """
+
+        metadata = self._cached_metadata(version)
+        if metadata is not _NOT_CACHED:
+            return metadata
+        try:
+            metadata = self._read_metadata(version)
+        except FileNotFoundError:
+            metadata = None
+        with self._metadata_lock:
+            entries = dict(self._metadata)
+            entries.pop(version, None)
+            entries[version] = (metadata, time.monotonic())
+            for stale in list(entries)[: max(0, len(entries) - _METADATA_CACHE_SIZE)]:
+                del entries[stale]
+            self._metadata = entries
+        return metadata
+
+    def _cached_metadata(self, version: str) -> IsolationForestMetadata | None | object:
+        """Return cached metadata, ``None`` if recently found missing, else ``_NOT_CACHED``."""
+
+        entry = self._metadata.get(version)
+        if entry is None:
+            return _NOT_CACHED
+        metadata, read_at = entry
+        if metadata is None and time.monotonic() - read_at > _MISSING_METADATA_TTL_SECONDS:
+            return _NOT_CACHED
+        return metadata
+
+    def _forget_metadata(self) -> None:
+        with self._metadata_lock:
+            self._metadata = {}
+
+    def _shard_for(self, model_version: str, vehicle_id: str) -> str | None:
+        """Return the shard model serving ``vehicle_id`` under ``model_version``, if any."""
+
+        metadata = self._metadata_for(model_version)
+        if metadata is None or not metadata.shards:
+            return None
+        key = self._shard_key(vehicle_id)
+        return metadata.shards.get(key) if key is not None else None
+
+    def _in_memory(self, version: str, vehicle_ids: Iterable[str]) -> bool:
+        current = self._current
+        metadata = self._cached_metadata(version)
+        if metadata is None:
+            # Known to be missing: scoring reports it without a download.
+            return True
+        if metadata is _NOT_CACHED:
+            return False
+        if (current is None or current.version != version) and version not in self.model_cache:
+            return False
+        return all(
+            shard in self.shard_cache and self._cached_metadata(shard) is not _NOT_CACHED
+            for shard in self._shards_for(metadata, vehicle_ids)
+        )
+
+    def _load_for_scoring(self, targets: dict[str, list[str]]) -> None:
+        for version, vehicle_ids in targets.items():
+            metadata = self._metadata_for(version)
+            shards = self._shards_for(metadata, vehicle_ids) if metadata is not None else set()
+            for model_version, pool in [
+                (version, None),
+                *((shard, self.shard_cache) for shard in shards),
+            ]:
+                self._metadata_for(model_version)
+                try:
+                    self._model_for(model_version, pool)
+                except (FileNotFoundError, TypeError, ValueError):
+                    pass
+
+    def _shards_for(
+        self, metadata: IsolationForestMetadata, vehicle_ids: Iterable[str]
+    ) -> set[str]:
+        if not metadata.shards:
+            return set()
+        keys = {self._shard_key(vehicle_id) for vehicle_id in vehicle_ids}
+        return {metadata.shards[key] for key in keys if key in metadata.shards}
+
+    def _rolling_engine(self, model_version: str) -> RollingFeatureEngine | None:
+        """Return the live rolling feature engine for ``model_version``'s layout, if any."""
+
+        metadata = self._metadata_for(model_version)
+        if metadata is None or metadata.feature_layout is None:
+            return None
+        layout = metadata.feature_layout
+        engine = self._rolling_engines.get(layout)
+        if engine is None:
+            with self._rolling_lock:
+                engine = self._rolling_engines.get(layout)
+                if engine is None:
+                    engine = self._rolling_engines[layout] = RollingFeatureEngine(
+                        layout, self.rolling_max_bytes, self.rolling_idle_seconds
+                    )
+        return engine
+
+    def _read_model_artifact(self, version: str) -> tuple[ScoringModel, int]:
+        if self.scoring_engine == "mmap":
+            flat_path = self._resolve_artifact(self._flat_path(version))
+            if flat_path.exists():
+                # Mapped pages live in the shared page cache rather than this
+                # process's heap, so they are not charged to the cache budget.
+                return FlatForest.load(flat_path), 0
+
+        path = self._resolve_artifact(self._model_path(version))
         if not path.exists():
             msg = f"Model version '{version}' is not available"
             raise FileNotFoundError(msg)
@@ -136,13 +1211,77 @@ class IsolationForestScoringService:
         if not isinstance(model, IsolationForest):
             msg = f"Artifact at {path} is not an IsolationForest model"
             raise TypeError(msg)
-        return model
+        if self.scoring_engine == "mmap":
+            # Artifact predates the flat format: write it once, then map it.
+            FlatForest.from_isolation_forest(model).save(self._flat_path(version))
+            return FlatForest.load(self._flat_path(version)), 0
+        if self.scoring_engine == "flat":
+            forest = FlatForest.from_isolation_forest(model)
+            return forest, forest.nbytes
+        # The uncompressed pickle size is a close proxy for the in-memory footprint.
+        return model, path.stat().st_size
 
     @staticmethod
     def _to_matrix(records: Iterable[TelemetryRecord]) -> np.ndarray:
         return np.array([record.feature_vector for record in records], dtype=float)
 
 
+def _with_rolling_features(
+    layout: FeatureLayout,
+    vehicle_ids: Sequence[str],
+    timestamps: Sequence[float],
+    feature_matrix: np.ndarray,
+) -> np.ndarray:
+    # A fresh engine replays the batch, so training neither depends on nor
+    # disturbs the windows kept for live scoring.
+    engine = RollingFeatureEngine(layout, max_bytes=sys.maxsize, idle_seconds=0)
+    return engine.transform(vehicle_ids, timestamps, feature_matrix)
+
+
+def _write_atomically(path: Path, write: Callable[[Path], object]) -> None:
+    """Write ``path`` via a temporary sibling and an atomic rename."""
+
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _replace_oldest_trees(model: IsolationForest, fresh: IsolationForest) -> None:
+    """Swap the oldest trees of ``model`` for the trees of ``fresh`` in place."""
+
+    n = len(fresh.estimators_)
+    model.estimators_ = model.estimators_[n:] + fresh.estimators_
+    model.estimators_features_ = model.estimators_features_[n:] + fresh.estimators_features_
+    model._seeds = np.concatenate([model._seeds[n:], fresh._seeds])
+    model._average_path_length_per_tree = (
+        model._average_path_length_per_tree[n:] + fresh._average_path_length_per_tree
+    )
+    model._decision_path_lengths = model._decision_path_lengths[n:] + fresh._decision_path_lengths
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _record_error(
+    index: int, record: ScoreRequest, message: str, model_version: str | None = None
+) -> BatchScoreResult:
+    return BatchScoreResult(
+        index=index,
+        vehicle_id=record.vehicle_id,
+        timestamp=record.timestamp,
+        model_version=model_version,
+        error=message,
+    )
+
+
 _service_instance: IsolationForestScoringService | None = None
 
 
@@ -151,7 +1290,47 @@ def get_scoring_service() -> IsolationForestScoringService:
 
     global _service_instance
     if _service_instance is None:
-        _service_instance = IsolationForestScoringService(settings.model_artifact_dir)
+        _service_instance = IsolationForestScoringService(
+            settings.model_artifact_dir,
+            config=IsolationForestConfig(
+                max_samples=settings.training_max_samples or "auto",
+                max_features=settings.training_max_features,
+                n_jobs=settings.training_n_jobs,
+                reservoir_size=settings.training_reservoir_size,
+                window_size=settings.training_window_size,
+                update_trees=settings.incremental_update_trees,
+                shard_by=settings.shard_by,
+                shard_segment_pattern=settings.shard_segment_pattern,
+                shard_min_records=settings.shard_min_records,
+                rolling_window=settings.rolling_window,
+                rolling_stats=tuple(settings.rolling_stats),
+            ),
+            model_cache=ModelCache(
+                max_entries=settings.model_cache_max_entries,
+                max_bytes=settings.model_cache_max_bytes,
+            ),
+            scoring_engine=settings.scoring_engine,
+            artifact_cache=create_artifact_cache(),
+            shard_cache=ModelCache(
+                max_entries=settings.shard_cache_max_entries,
+                max_bytes=settings.shard_cache_max_bytes,
+                name="shards",
+            ),
+            rolling_max_bytes=settings.rolling_max_bytes,
+            rolling_idle_seconds=settings.rolling_idle_seconds,
+        )
+        if settings.score_cache_enabled:
+            _service_instance.score_cache = ScoreCache(
+                max_entries=settings.score_cache_max_entries,
+                ttl_seconds=settings.score_cache_ttl_seconds,
+                quantum=settings.score_cache_quantum,
+            )
+        if settings.micro_batching_enabled:
+            _service_instance.micro_batcher = MicroBatcher(
+                _service_instance,
+                max_batch_size=settings.micro_batch_max_size,
+                max_wait_seconds=settings.micro_batch_max_wait_seconds,
+            )
     return _service_instance
 
 
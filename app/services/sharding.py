@@ -0,0 +1,45 @@
+"""Routing of vehicles to per-shard isolation forest models."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Callable
+
+SHARD_KEYS = ("vehicle_id", "segment")
+
+ShardKeyFunction = Callable[[str], str | None]
+
+
+def shard_key_function(shard_by: str, segment_pattern: str) -> ShardKeyFunction:
+    """Return the function mapping a ``vehicle_id`` to its shard key.
+
+    ``vehicle_id`` gives every vehicle its own shard. ``segment`` matches
+    ``segment_pattern`` at the start of the id and uses its first group (or
+    the whole match); ids that do not match belong to no shard.
+    """
+
+    if shard_by == "vehicle_id":
+        return lambda vehicle_id: vehicle_id
+    if shard_by == "segment":
+        pattern = re.compile(segment_pattern)
+
+        def segment(vehicle_id: str) -> str | None:
+            match = pattern.match(vehicle_id)
+            if match is None:
+                return None
+            return match.group(1) if pattern.groups else match.group(0)
+
+        return segment
+    msg = f"Unknown shard key '{shard_by}', expected one of {SHARD_KEYS}"
+    raise ValueError(msg)
+
+
+def shard_version(model_version: str, shard_key: str) -> str:
+    """Version name of the shard model for ``shard_key`` trained with ``model_version``.
+
+    The key is hashed so that arbitrary vehicle ids yield safe file names.
+    """
+
+    digest = hashlib.sha1(shard_key.encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f"{model_version}-shard-{digest[:12]}"
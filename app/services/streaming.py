@@ -0,0 +1,168 @@
+"""Incremental parsing of NDJSON telemetry streams into training samples."""
+
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.domain import FeatureLayout
+from app.services.reservoir import FeatureReservoir
+from app.services.rolling_features import RollingFeatureEngine
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Guard against a client that never sends a newline.
+MAX_LINE_BYTES = 1024 * 1024
+
+# Parsed rows handed to the reservoir at a time.
+_RESERVOIR_CHUNK_ROWS = 1024
+
+
+class TelemetryStreamError(ValueError):
+    """Raised when a line of a telemetry stream is malformed."""
+
+    def __init__(self, line_number: int, message: str):
+        super().__init__(f"line {line_number}: {message}")
+        self.line_number = line_number
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield ``(line_number, line)`` for each non-blank line of a byte stream."""
+
+    pending = b""
+    line_number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+        if len(pending) > MAX_LINE_BYTES:
+            raise TelemetryStreamError(line_number + 1, f"line exceeds {MAX_LINE_BYTES} bytes")
+    if pending.strip():
+        yield line_number + 1, pending
+
+
+@dataclass(slots=True)
+class StreamSample:
+    """Uniform sample of a telemetry stream, ready to train on."""
+
+    reservoir: FeatureReservoir
+    # Layout of the sampled rows when rolling features were appended
+    feature_layout: FeatureLayout | None = None
+
+
+def parse_record(line_number: int, line: bytes) -> tuple[str, float, list[float]]:
+    """Validate one NDJSON telemetry record.
+
+    Returns its vehicle id, epoch-second timestamp and feature vector.
+
+    Mirrors the ``TelemetryRecord`` constraints without building a model
+    object per row. ``json`` accepts ``NaN`` and ``Infinity`` and overflows
+    huge literals to infinity, so numbers are also checked to be finite.
+    """
+
+    try:
+        record = json.loads(line)
+    except ValueError as exc:
+        raise TelemetryStreamError(line_number, f"invalid JSON ({exc})") from None
+    if not isinstance(record, dict):
+        raise TelemetryStreamError(line_number, "record must be a JSON object")
+
+    vehicle_id = record.get("vehicle_id")
+    if not isinstance(vehicle_id, str) or not 1 <= len(vehicle_id) <= 64:
+        raise TelemetryStreamError(line_number, "vehicle_id must be a string of 1-64 characters")
+
+    timestamp = record.get("timestamp")
+    try:
+        if not isinstance(timestamp, int | float) or isinstance(timestamp, bool):
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        elif not math.isfinite(timestamp):
+            raise ValueError(timestamp)
+    except (TypeError, ValueError, OverflowError):
+        msg = "timestamp must be an ISO 8601 datetime or epoch seconds"
+        raise TelemetryStreamError(line_number, msg) from None
+
+    features = record.get("feature_vector")
+    if (
+        not isinstance(features, list)
+        or not features
+        or not all(
+            isinstance(value, float | int) and not isinstance(value, bool) for value in features
+        )
+    ):
+        msg = "feature_vector must be a non-empty list of numbers"
+        raise TelemetryStreamError(line_number, msg)
+    if not all(math.isfinite(value) for value in features):
+        raise TelemetryStreamError(line_number, "feature_vector values must be finite")
+    return vehicle_id, float(timestamp), features
+
+
+def parse_feature_vector(line_number: int, line: bytes) -> list[float]:
+    """Validate one NDJSON telemetry record and return its feature vector."""
+
+    return parse_record(line_number, line)[2]
+
+
+def iter_feature_vectors(lines: Iterable[bytes | str]) -> Iterator[list[float]]:
+    """Yield the feature vector of each non-blank NDJSON line, e.g. of an open file."""
+
+    for line_number, line in enumerate(lines, start=1):
+        if line.strip():
+            yield parse_feature_vector(line_number, line)
+
+
+async def read_feature_reservoir(
+    chunks: AsyncIterable[bytes],
+    capacity: int,
+    seed: int | None = None,
+    rolling: Callable[[int], RollingFeatureEngine | None] | None = None,
+    on_records: Callable[[list[str], list[float], list[list[float]]], Awaitable[None]]
+    | None = None,
+) -> StreamSample:
+    """Parse an NDJSON telemetry stream into a uniform sample of ``capacity`` rows.
+
+    Memory stays bounded by the sample however long the stream is. The
+    sample keeps each row's vehicle id. ``rolling`` is called with the raw
+    feature count and may return an engine: every record then enters its
+    vehicle's window in arrival order and is sampled with the window's
+    statistics appended, as live scoring would see it. ``on_records``
+    receives each parsed chunk as raw ``(vehicle_ids, timestamps, rows)``.
+    """
+
+    reservoir = FeatureReservoir(capacity, seed)
+    engine: RollingFeatureEngine | None = None
+    n_features: int | None = None
+    vehicle_ids: list[str] = []
+    timestamps: list[float] = []
+    rows: list[list[float]] = []
+
+    async def flush() -> None:
+        sampled = rows
+        if engine is not None:
+            sampled = [engine.update(*record) for record in zip(vehicle_ids, timestamps, rows)]
+        reservoir.extend(sampled, vehicle_ids)
+        if on_records is not None:
+            await on_records(vehicle_ids, timestamps, rows)
+
+    async for line_number, line in iter_lines(chunks):
+        vehicle_id, timestamp, features = parse_record(line_number, line)
+        if n_features is None:
+            n_features = len(features)
+            engine = rolling(n_features) if rolling is not None else None
+        elif len(features) != n_features:
+            msg = f"expected {n_features} features, got {len(features)}"
+            raise TelemetryStreamError(line_number, msg)
+        vehicle_ids.append(vehicle_id)
+        timestamps.append(timestamp)
+        rows.append(features)
+        if len(rows) == _RESERVOIR_CHUNK_ROWS:
+            await flush()
+            vehicle_ids, timestamps, rows = [], [], []
+    if rows:
+        await flush()
+    return StreamSample(reservoir, engine.layout if engine is not None else None)
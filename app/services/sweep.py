@@ -0,0 +1,205 @@
+"""Hyperparameter sweeps: fit a grid of forests in parallel and publish the best."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+from sklearn.ensemble import IsolationForest
+from sklearn.metrics import f1_score, roc_auc_score
+
+from app.domain import (
+    FeatureLayout,
+    ModelTrainingResponse,
+    SweepCandidateResult,
+    SweepGrid,
+    SweepRequest,
+    TelemetryRecord,
+)
+from app.services.scoring import IsolationForestScoringService
+
+logger = logging.getLogger(__name__)
+
+# Synthetic outliers are drawn from the training data's bounding box widened
+# by this fraction of its extent on every side.
+_OUTLIER_MARGIN = 0.1
+
+
+def sweep_candidates(grid: SweepGrid) -> list[dict[str, Any]]:
+    """Return the parameters of every candidate of ``grid``, in index order."""
+
+    return [
+        {
+            "n_estimators": n_estimators,
+            "max_samples": max_samples,
+            "contamination": contamination,
+            "max_features": max_features,
+        }
+        for n_estimators, max_samples, contamination, max_features in itertools.product(
+            grid.n_estimators, grid.max_samples, grid.contamination, grid.max_features
+        )
+    ]
+
+
+def run_sweep(
+    service: IsolationForestScoringService, request: SweepRequest, max_workers: int = 0
+) -> ModelTrainingResponse:
+    """Fit every candidate of ``request.grid``, evaluate them and publish one.
+
+    The training and evaluation matrices are written once as ``.npy`` files
+    that each worker memory-maps, so all workers read the same pages instead
+    of receiving a pickled copy. Candidates are ranked by F1 on a labelled
+    evaluation set, or else by ROC AUC separating held-out records from
+    synthetic outliers, then by scoring latency and model size. The best
+    candidate (or ``request.candidate``) is published; the rest are
+    discarded. ``max_workers`` of 0 uses every core. Rolling features are
+    appended before the split, as for ``/ingest``, and the published
+    version records their layout.
+    """
+
+    feature_matrix, feature_layout = _training_matrix(service, request.records)
+    rng = np.random.default_rng(service.config.random_state)
+    labelled = request.evaluation_records is not None
+    if labelled:
+        train = feature_matrix
+        width = len(request.records[0].feature_vector)
+        evaluation_width = len(request.evaluation_records[0].feature_vector)
+        if evaluation_width != width:
+            msg = (
+                f"evaluation feature_vector has {evaluation_width} values, "
+                f"records have {width}"
+            )
+            raise ValueError(msg)
+        # Replayed separately: evaluation records are another sequence.
+        evaluation, _ = _training_matrix(service, request.evaluation_records)
+        labels = np.asarray(request.evaluation_labels, dtype=bool)
+    else:
+        order = rng.permutation(feature_matrix.shape[0])
+        n_holdout = max(1, int(round(feature_matrix.shape[0] * request.holdout_fraction)))
+        if n_holdout >= feature_matrix.shape[0]:
+            msg = "holdout_fraction leaves no records to train on"
+            raise ValueError(msg)
+        train = feature_matrix[order[n_holdout:]]
+        holdout = feature_matrix[order[:n_holdout]]
+        low, high = train.min(axis=0), train.max(axis=0)
+        margin = (high - low) * _OUTLIER_MARGIN
+        outliers = rng.uniform(low - margin, high + margin, size=holdout.shape)
+        evaluation = np.vstack([holdout, outliers])
+        labels = np.repeat([False, True], n_holdout)
+
+    candidates = sweep_candidates(request.grid)
+    prefix = service.artifact_dir / f".sweep-{uuid.uuid4().hex}"
+    train_path, evaluation_path = Path(f"{prefix}.train.npy"), Path(f"{prefix}.eval.npy")
+    np.save(train_path, train, allow_pickle=False)
+    np.save(evaluation_path, evaluation, allow_pickle=False)
+    jobs = [
+        (
+            index,
+            params,
+            str(train_path),
+            str(evaluation_path),
+            labels,
+            labelled,
+            service.config.random_state,
+            f"{prefix}.{index}.joblib",
+        )
+        for index, params in enumerate(candidates)
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    try:
+        if workers == 1:
+            results = [_fit_candidate(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                results = list(pool.map(_fit_candidate, *zip(*jobs)))
+
+        results.sort(
+            key=lambda result: (
+                -(result.f1 if labelled else result.auc),
+                result.score_ms_per_1k_rows,
+                result.model_bytes,
+            )
+        )
+        chosen = results[0].index if request.candidate is None else request.candidate
+        for result in results:
+            result.published = result.index == chosen
+        model = joblib.load(f"{prefix}.{chosen}.joblib")
+    finally:
+        train_path.unlink(missing_ok=True)
+        evaluation_path.unlink(missing_ok=True)
+        for index in range(len(jobs)):
+            Path(f"{prefix}.{index}.joblib").unlink(missing_ok=True)
+
+    logger.info(
+        "Sweep of %d candidates on %d workers publishes candidate %d",
+        len(candidates),
+        workers,
+        chosen,
+    )
+    response = service.train_matrix(
+        train,
+        request.model_version,
+        feature_layout=feature_layout,
+        model=model,
+        records_seen=len(request.records),
+    )
+    return response.model_copy(update={"sweep": results})
+
+
+def _training_matrix(
+    service: IsolationForestScoringService, records: Sequence[TelemetryRecord]
+) -> tuple[np.ndarray, FeatureLayout | None]:
+    return service.with_rolling_features(
+        [record.vehicle_id for record in records],
+        [record.timestamp.timestamp() for record in records],
+        np.array([record.feature_vector for record in records], dtype=float),
+    )
+
+
+def _fit_candidate(
+    index: int,
+    params: dict[str, Any],
+    train_path: str,
+    evaluation_path: str,
+    labels: np.ndarray,
+    labelled: bool,
+    random_state: int,
+    model_path: str,
+) -> SweepCandidateResult:
+    train = np.load(train_path, mmap_mode="r")
+    evaluation = np.load(evaluation_path, mmap_mode="r")
+    # Candidates already run in parallel, so each forest is fitted on one core.
+    model = IsolationForest(**params, random_state=random_state, n_jobs=1)
+    started = time.perf_counter()
+    model.fit(train)
+    fit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scores = model.decision_function(evaluation)
+    score_seconds = time.perf_counter() - started
+    flagged = scores < 0
+
+    joblib.dump(model, model_path)
+    return SweepCandidateResult(
+        index=index,
+        **params,
+        fit_seconds=fit_seconds,
+        score_ms_per_1k_rows=1e6 * score_seconds / evaluation.shape[0],
+        model_bytes=os.path.getsize(model_path),
+        auc=float(roc_auc_score(labels, -scores)),
+        f1=float(f1_score(labels, flagged)) if labelled else None,
+        # Without labels only the held-out half of the evaluation set is real.
+        flagged_fraction=float(flagged.mean() if labelled else flagged[~labels].mean()),
+    )
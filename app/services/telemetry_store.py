@@ -0,0 +1,296 @@
+"""Buffered persistence of telemetry passing through the API."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import UTC, datetime
+
+from sqlalchemy import JSON, BigInteger, DateTime, Float, Integer, String, func, insert
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.config import settings
+from app.core import database
+from app.core.database import Base
+from app.core.metrics import (
+    TELEMETRY_BUFFER_ROWS,
+    TELEMETRY_FLUSH_SECONDS,
+    TELEMETRY_ROWS_DROPPED,
+    TELEMETRY_ROWS_WRITTEN,
+)
+from app.domain import TelemetryFrame, TelemetryRecord
+
+logger = logging.getLogger(__name__)
+
+# Column order of the tuples handed to TelemetryWriter.write.
+TELEMETRY_COLUMNS = (
+    "source",
+    "vehicle_id",
+    "recorded_at",
+    "features",
+    "model_version",
+    "anomaly_score",
+)
+
+TelemetryRowValues = tuple[str, str, datetime, list[float], str | None, float | None]
+
+
+class TelemetryRow(Base):
+    """One telemetry record received by /ingest or /score."""
+
+    __tablename__ = "telemetry"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    source: Mapped[str] = mapped_column(String(16))
+    vehicle_id: Mapped[str] = mapped_column(String(64), index=True)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    features: Mapped[list[float]] = mapped_column(JSON().with_variant(ARRAY(Float), "postgresql"))
+    model_version: Mapped[str | None] = mapped_column(String(128))
+    anomaly_score: Mapped[float | None] = mapped_column(Float)
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class TelemetryWriter:
+    """Collects telemetry rows in memory and writes them in bulk.
+
+    Rows are flushed when ``flush_rows`` are buffered or the oldest has waited
+    ``flush_interval`` seconds: with ``COPY`` on asyncpg, otherwise as one
+    multi-row ``INSERT``. At most ``max_buffered_rows`` rows are held (buffered
+    plus in flight); once that is reached ``write`` waits up to
+    ``enqueue_timeout`` for a flush to free space and then drops the rows, so
+    a stalled database slows handlers down by a bounded amount instead of
+    growing memory without limit.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        flush_rows: int = 1_000,
+        flush_interval: float = 1.0,
+        max_buffered_rows: int = 50_000,
+        enqueue_timeout: float = 0.5,
+    ):
+        if max_buffered_rows < flush_rows:
+            msg = "max_buffered_rows must be at least flush_rows"
+            raise ValueError(msg)
+        self.engine = engine
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max_buffered_rows
+        self.enqueue_timeout = enqueue_timeout
+        self.use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "asyncpg"
+
+        self._buffer: list[TelemetryRowValues] = []
+        self._held = 0  # Buffered plus in-flight rows
+        self._space: asyncio.Condition | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+    @property
+    def held_rows(self) -> int:
+        return self._held
+
+    def start(self) -> None:
+        """Start the background flush task on the running event loop."""
+
+        self._space = asyncio.Condition()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="telemetry-writer")
+
+    async def stop(self) -> None:
+        """Flush everything still buffered and stop the background task."""
+
+        if self._task is None:
+            return
+        self._closing = True
+        self._wake.set()
+        await self._task
+        self._task = None
+
+    async def write(self, rows: Sequence[TelemetryRowValues]) -> bool:
+        """Buffer ``rows`` for the next flush.
+
+        Returns ``False`` if some rows were dropped because the buffer stayed
+        full for longer than ``enqueue_timeout``.
+        """
+
+        if self._space is None:
+            msg = "TelemetryWriter.start() must be called before write()"
+            raise RuntimeError(msg)
+
+        deadline = time.monotonic() + self.enqueue_timeout
+        for start in range(0, len(rows), self.flush_rows):
+            chunk = rows[start : start + self.flush_rows]
+            async with self._space:
+                while self._held + len(chunk) > self.max_buffered_rows:
+                    self._wake.set()
+                    remaining = deadline - time.monotonic()
+                    try:
+                        await asyncio.wait_for(self._space.wait(), timeout=max(remaining, 0))
+                    except TimeoutError:
+                        dropped = len(rows) - start
+                        TELEMETRY_ROWS_DROPPED.labels(reason="buffer_full").inc(dropped)
+                        logger.warning("Telemetry buffer full; dropped %d rows", dropped)
+                        return False
+                self._buffer.extend(chunk)
+                self._held += len(chunk)
+                TELEMETRY_BUFFER_ROWS.set(self._held)
+            if len(self._buffer) >= self.flush_rows:
+                self._wake.set()
+        return True
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            await self._flush()
+        await self._flush()
+
+    async def _flush(self) -> None:
+        while self._buffer:
+            rows = self._buffer[: self.flush_rows]
+            del self._buffer[: self.flush_rows]
+            started = time.perf_counter()
+            try:
+                await self._write_rows(rows)
+            except Exception:
+                logger.exception("Failed to persist %d telemetry rows", len(rows))
+                TELEMETRY_ROWS_DROPPED.labels(reason="flush_failed").inc(len(rows))
+            else:
+                TELEMETRY_ROWS_WRITTEN.inc(len(rows))
+                TELEMETRY_FLUSH_SECONDS.observe(time.perf_counter() - started)
+            async with self._space:
+                self._held -= len(rows)
+                TELEMETRY_BUFFER_ROWS.set(self._held)
+                self._space.notify_all()
+
+    async def _write_rows(self, rows: list[TelemetryRowValues]) -> None:
+        if self.use_copy:
+            async with self.engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    TelemetryRow.__tablename__, records=rows, columns=TELEMETRY_COLUMNS
+                )
+            return
+
+        async with self.engine.begin() as conn:
+            # executemany on an INSERT is batched into multi-row VALUES clauses.
+            await conn.execute(
+                insert(TelemetryRow), [dict(zip(TELEMETRY_COLUMNS, row)) for row in rows]
+            )
+
+
+_writer: TelemetryWriter | None = None
+
+
+def get_telemetry_writer() -> TelemetryWriter | None:
+    """Return the running writer, or ``None`` when persistence is disabled."""
+
+    return _writer
+
+
+async def start_telemetry_writer() -> None:
+    """Create the telemetry table and start the writer if a database is configured."""
+
+    global _writer
+    if database.engine is None or not settings.telemetry_persistence_enabled:
+        return
+    await database.create_tables()
+    _writer = TelemetryWriter(
+        database.engine,
+        flush_rows=settings.telemetry_flush_rows,
+        flush_interval=settings.telemetry_flush_interval_seconds,
+        max_buffered_rows=settings.telemetry_buffer_max_rows,
+        enqueue_timeout=settings.telemetry_enqueue_timeout_seconds,
+    )
+    _writer.start()
+    logger.info("Telemetry persistence enabled (copy=%s)", _writer.use_copy)
+
+
+async def stop_telemetry_writer() -> None:
+    """Flush buffered telemetry and stop the writer."""
+
+    global _writer
+    if _writer is not None:
+        await _writer.stop()
+        _writer = None
+
+
+async def persist_telemetry(rows: Iterable[TelemetryRowValues]) -> None:
+    """Hand telemetry rows to the writer; a no-op when persistence is disabled.
+
+    Pass a generator so rows are only built when they will be written.
+    """
+
+    writer = _writer
+    if writer is not None:
+        await writer.write(list(rows))
+
+
+def record_rows(
+    source: str, records: Iterable[TelemetryRecord], model_version: str | None = None
+) -> Iterator[TelemetryRowValues]:
+    """Lazily build rows for validated telemetry records."""
+
+    for record in records:
+        yield (source, record.vehicle_id, record.timestamp, record.feature_vector, model_version, None)
+
+
+def stream_rows(
+    source: str,
+    vehicle_ids: Sequence[str],
+    timestamps: Sequence[float],
+    feature_vectors: Sequence[list[float]],
+    model_version: str | None = None,
+) -> Iterator[TelemetryRowValues]:
+    """Lazily build rows for parsed stream records with epoch-second timestamps."""
+
+    for vehicle_id, timestamp, features in zip(vehicle_ids, timestamps, feature_vectors):
+        yield (
+            source,
+            vehicle_id,
+            datetime.fromtimestamp(timestamp, tz=UTC),
+            features,
+            model_version,
+            None,
+        )
+
+
+def frame_rows(
+    source: str,
+    frame: TelemetryFrame,
+    model_version: str | None = None,
+    anomaly_scores: Sequence[float] | None = None,
+    row_versions: Sequence[str] | None = None,
+) -> Iterator[TelemetryRowValues]:
+    """Lazily build rows for a binary telemetry frame and its optional scores.
+
+    ``row_versions``, when given, names the (shard) model that scored each row
+    in place of ``model_version``.
+    """
+
+    scores = anomaly_scores if anomaly_scores is not None else [None] * frame.n_records
+    versions = row_versions if row_versions is not None else [model_version] * frame.n_records
+    for vehicle_id, timestamp, features, model_version, anomaly_score in zip(
+        frame.vehicle_ids, frame.timestamps.tolist(), frame.features.tolist(), versions, scores
+    ):
+        yield (
+            source,
+            vehicle_id,
+            datetime.fromtimestamp(timestamp, tz=UTC),
+            features,
+            model_version,
+            anomaly_score,
+        )
@@ -0,0 +1,587 @@
+"""Background training jobs executed on a bounded process pool."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.config import settings
+from app.core.storage import create_artifact_cache
+from app.domain import (
+    FeatureLayout,
+    ModelTrainingResponse,
+    SweepRequest,
+    TelemetryBatch,
+    TelemetryFrame,
+    TrainingJobStatus,
+)
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+from app.services.sweep import run_sweep
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingQueueFullError(RuntimeError):
+    """Raised when too many training jobs are already queued or running."""
+
+
+@dataclass(slots=True)
+class _TrainingJob:
+    job_id: str
+    records_seen: int
+    submitted_at: datetime
+    future: Future
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: ModelTrainingResponse | None = None
+    error: str | None = None
+    done: bool = False
+
+    def to_status(self) -> TrainingJobStatus:
+        if not self.done:
+            # A finished future stays "running" until its result is published.
+            state = "running" if self.future.running() or self.future.done() else "queued"
+        else:
+            state = "failed" if self.error is not None else "succeeded"
+        duration = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration = (self.finished_at - self.started_at).total_seconds()
+        return TrainingJobStatus(
+            job_id=self.job_id,
+            state=state,
+            records_seen=self.records_seen,
+            records_trained=self.result.records_trained if self.result is not None else None,
+            submitted_at=self.submitted_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            duration_seconds=duration,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class JobStatusStore(ABC):
+    """Job statuses shared by every web worker, so any of them can answer a poll."""
+
+    @abstractmethod
+    def put(self, status: TrainingJobStatus) -> None:
+        """Record the latest status of a job."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> TrainingJobStatus | None:
+        """Return the recorded status of ``job_id``, or ``None`` if it is unknown."""
+
+    @abstractmethod
+    def list(self) -> list[TrainingJobStatus]:
+        """Return the recorded statuses, oldest submission first."""
+
+
+class InMemoryJobStatusStore(JobStatusStore):
+    """In-process ``JobStatusStore`` stand-in for tests; keeps ``history_size`` jobs."""
+
+    def __init__(self, history_size: int = 100):
+        self.history_size = history_size
+        self._statuses: OrderedDict[str, TrainingJobStatus] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, status: TrainingJobStatus) -> None:
+        with self._lock:
+            self._statuses[status.job_id] = status
+            while len(self._statuses) > self.history_size:
+                self._statuses.popitem(last=False)
+
+    def get(self, job_id: str) -> TrainingJobStatus | None:
+        with self._lock:
+            return self._statuses.get(job_id)
+
+    def list(self) -> list[TrainingJobStatus]:
+        with self._lock:
+            return sorted(self._statuses.values(), key=lambda status: status.submitted_at)
+
+
+class RedisJobStatusStore(JobStatusStore):
+    """``JobStatusStore`` backed by Redis so every worker and task sees every job.
+
+    Each status is a JSON string expiring after ``ttl`` seconds; a sorted set
+    indexes the jobs by submission time and keeps the newest
+    ``history_size``. Requires the optional ``redis`` package.
+    """
+
+    _INDEX_KEY = "training-jobs"
+
+    def __init__(self, url: str, history_size: int = 100, ttl: int = 86_400):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self.history_size = history_size
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"training-job:{job_id}"
+
+    def put(self, status: TrainingJobStatus) -> None:
+        with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._key(status.job_id), status.model_dump_json(), ex=self.ttl)
+            pipe.zadd(self._INDEX_KEY, {status.job_id: status.submitted_at.timestamp()})
+            pipe.zremrangebyrank(self._INDEX_KEY, 0, -self.history_size - 1)
+            pipe.execute()
+
+    def get(self, job_id: str) -> TrainingJobStatus | None:
+        payload = self._redis.get(self._key(job_id))
+        return TrainingJobStatus.model_validate_json(payload) if payload is not None else None
+
+    def list(self) -> list[TrainingJobStatus]:
+        job_ids = [job_id.decode() for job_id in self._redis.zrange(self._INDEX_KEY, 0, -1)]
+        if not job_ids:
+            return []
+        payloads = self._redis.mget([self._key(job_id) for job_id in job_ids])
+        return [
+            TrainingJobStatus.model_validate_json(payload)
+            for payload in payloads
+            if payload is not None
+        ]
+
+
+def create_job_status_store() -> JobStatusStore | None:
+    """Build the store selected by ``settings.training_job_store``; ``None`` keeps jobs local."""
+
+    if settings.training_job_store == "redis":
+        if not settings.training_job_redis_url:
+            msg = "TRAINING_JOB_REDIS_URL is required for the redis training job store"
+            raise ValueError(msg)
+        return RedisJobStatusStore(
+            settings.training_job_redis_url,
+            history_size=settings.training_job_history,
+            ttl=settings.training_job_ttl_seconds,
+        )
+    return None
+
+
+class _TrainingFailure(Exception):
+    """A worker-side training error, carrying when the job ran."""
+
+    def __init__(self, error: str, started: float, finished: float):
+        super().__init__(error, started, finished)
+        self.error = error
+        self.started = started
+        self.finished = finished
+
+
+def _timed(fn: Callable[..., ModelTrainingResponse], *args: Any) -> tuple[Any, float, float]:
+    started = time.time()
+    try:
+        result = fn(*args)
+    except Exception as exc:
+        raise _TrainingFailure(str(exc) or type(exc).__name__, started, time.time()) from exc
+    return result, started, time.time()
+
+
+def _worker_service(
+    artifact_dir: str, config: IsolationForestConfig
+) -> IsolationForestScoringService:
+    # Built from settings in the worker, so new versions reach the remote store.
+    return IsolationForestScoringService(
+        artifact_dir, config, artifact_cache=create_artifact_cache()
+    )
+
+
+def _train_batch(
+    artifact_dir: str, config: IsolationForestConfig, batch: TelemetryBatch
+) -> tuple[ModelTrainingResponse, float, float]:
+    service = _worker_service(artifact_dir, config)
+    return _timed(service.train, batch)
+
+
+def _update_batch(
+    artifact_dir: str,
+    config: IsolationForestConfig,
+    batch: TelemetryBatch,
+    base_version: str | None,
+) -> tuple[ModelTrainingResponse, float, float]:
+    service = _worker_service(artifact_dir, config)
+    return _timed(service.update, batch, base_version)
+
+
+def _train_matrix_file(
+    artifact_dir: str,
+    config: IsolationForestConfig,
+    matrix_path: str,
+    model_version: str | None,
+    records_seen: int,
+    vehicle_ids: list[str] | None,
+    feature_layout: FeatureLayout | None,
+) -> tuple[ModelTrainingResponse, float, float]:
+    service = _worker_service(artifact_dir, config)
+    try:
+        feature_matrix = np.load(matrix_path, mmap_mode="r")
+        train = partial(service.train_matrix, records_seen=records_seen)
+        return _timed(train, feature_matrix, model_version, vehicle_ids, feature_layout)
+    finally:
+        Path(matrix_path).unlink(missing_ok=True)
+
+
+def _train_frame_file(
+    artifact_dir: str,
+    config: IsolationForestConfig,
+    matrix_path: str,
+    vehicle_ids: list[str],
+    timestamps: np.ndarray,
+    model_version: str | None,
+    sharded: bool,
+) -> tuple[ModelTrainingResponse, float, float]:
+    service = _worker_service(artifact_dir, config)
+    try:
+        feature_matrix = np.load(matrix_path, mmap_mode="r")
+        return _timed(
+            service.train_telemetry, feature_matrix, vehicle_ids, timestamps, model_version, sharded
+        )
+    finally:
+        Path(matrix_path).unlink(missing_ok=True)
+
+
+def _run_sweep(
+    artifact_dir: str, config: IsolationForestConfig, request: SweepRequest, max_workers: int
+) -> tuple[ModelTrainingResponse, float, float]:
+    service = _worker_service(artifact_dir, config)
+    return _timed(run_sweep, service, request, max_workers)
+
+
+class TrainingJobManager:
+    """Run model training off the event loop and track job state.
+
+    Jobs execute on a ``ProcessPoolExecutor`` so that CPU-bound fits neither
+    block the event loop nor contend for the GIL with request handling. The
+    number of queued plus running jobs is bounded, and only the most recent
+    ``history_size`` finished jobs are retained for status queries.
+
+    Job records live in this process. With a shared ``store`` every status
+    change is also written there, from a background thread so the event loop
+    never waits on it, and jobs submitted to other web workers are looked up
+    in it; such jobs read as queued until they finish.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_pending: int = 8,
+        history_size: int = 100,
+        store: JobStatusStore | None = None,
+    ):
+        self.max_workers = max_workers
+        self._executor = self._new_executor()
+        self.max_pending = max_pending
+        self.history_size = history_size
+        self.store = store
+        # One thread, so a job's statuses reach the store in order.
+        self._publisher = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-status")
+            if store is not None
+            else None
+        )
+        self._jobs: OrderedDict[str, _TrainingJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self, service: IsolationForestScoringService, batch: TelemetryBatch
+    ) -> TrainingJobStatus:
+        """Queue ``batch`` for training with the artifact store of ``service``."""
+
+        return self._submit(
+            service,
+            len(batch.records),
+            _train_batch,
+            str(service.artifact_dir),
+            service.config,
+            batch,
+        )
+
+    def submit_update(
+        self,
+        service: IsolationForestScoringService,
+        batch: TelemetryBatch,
+        base_version: str | None = None,
+    ) -> TrainingJobStatus:
+        """Queue an incremental update of ``base_version`` (default: LATEST)."""
+
+        return self._submit(
+            service,
+            len(batch.records),
+            _update_batch,
+            str(service.artifact_dir),
+            service.config,
+            batch,
+            base_version,
+        )
+
+    def submit_matrix(
+        self,
+        service: IsolationForestScoringService,
+        feature_matrix: np.ndarray,
+        model_version: str | None = None,
+        records_seen: int | None = None,
+        vehicle_ids: list[str] | None = None,
+        feature_layout: FeatureLayout | None = None,
+    ) -> TrainingJobStatus:
+        """Queue an already-assembled feature matrix for training.
+
+        The matrix is handed to the worker through a ``.npy`` file in the
+        artifact directory, which the worker memory-maps, rather than being
+        pickled through the pool's pipe. ``records_seen`` is reported instead
+        of the row count when the matrix samples a larger stream.
+        ``vehicle_ids`` and ``feature_layout`` are passed on to
+        ``train_matrix`` for shards and matrices with rolling features.
+        """
+
+        if records_seen is None:
+            records_seen = feature_matrix.shape[0]
+        return self._submit_matrix_file(
+            service,
+            feature_matrix,
+            records_seen,
+            _train_matrix_file,
+            model_version,
+            records_seen,
+            vehicle_ids,
+            feature_layout,
+        )
+
+    def submit_frame(
+        self,
+        service: IsolationForestScoringService,
+        frame: TelemetryFrame,
+        model_version: str | None = None,
+        sharded: bool = False,
+    ) -> TrainingJobStatus:
+        """Queue a binary telemetry frame for training, like a ``TelemetryBatch``.
+
+        The features travel through a ``.npy`` file as for ``submit_matrix``;
+        vehicle ids and timestamps go along so rolling features and shards
+        are built exactly as for JSON batches.
+        """
+
+        return self._submit_matrix_file(
+            service,
+            frame.features,
+            frame.n_records,
+            _train_frame_file,
+            frame.vehicle_ids,
+            frame.timestamps,
+            model_version,
+            sharded,
+        )
+
+    def submit_sweep(
+        self, service: IsolationForestScoringService, request: SweepRequest, max_workers: int = 0
+    ) -> TrainingJobStatus:
+        """Queue a hyperparameter sweep; its worker fans candidates out to more processes."""
+
+        return self._submit(
+            service,
+            len(request.records),
+            _run_sweep,
+            str(service.artifact_dir),
+            service.config,
+            request,
+            max_workers,
+        )
+
+    def get(self, job_id: str) -> TrainingJobStatus | None:
+        """Return the status of ``job_id`` or ``None`` if it is unknown.
+
+        Blocking with a shared store: call from a worker thread.
+        """
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job.to_status()
+        return self.store.get(job_id) if self.store is not None else None
+
+    def list(self) -> list[TrainingJobStatus]:
+        """Return the status of every tracked job, oldest first.
+
+        Blocking with a shared store: call from a worker thread.
+        """
+
+        with self._lock:
+            local = {job_id: job.to_status() for job_id, job in self._jobs.items()}
+        if self.store is None:
+            return list(local.values())
+        shared = {status.job_id: status for status in self.store.list()}
+        # This process's records are at least as fresh as the store's copy.
+        shared.update(local)
+        return sorted(shared.values(), key=lambda status: status.submitted_at)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs; with ``wait`` queued jobs are drained first."""
+
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        if self._publisher is not None:
+            self._publisher.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _submit(
+        self,
+        service: IsolationForestScoringService,
+        records_seen: int,
+        fn: Callable[..., tuple[ModelTrainingResponse, float, float]],
+        *args: Any,
+    ) -> TrainingJobStatus:
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if not job.done)
+            if pending >= self.max_pending:
+                msg = f"Too many training jobs in progress ({pending})"
+                raise TrainingQueueFullError(msg)
+
+            job_id = uuid.uuid4().hex
+            try:
+                future = self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); replace the pool and retry once.
+                logger.warning("Training process pool is broken, starting a new one")
+                self._executor = self._new_executor()
+                future = self._executor.submit(fn, *args)
+            job = _TrainingJob(
+                job_id=job_id,
+                records_seen=records_seen,
+                submitted_at=datetime.now(tz=UTC),
+                future=future,
+            )
+            self._jobs[job_id] = job
+            status = job.to_status()
+
+        self._publish(status)
+        future.add_done_callback(lambda done: self._on_done(job, service, done))
+        logger.info("Training job %s queued with %d records", job_id, records_seen)
+        return status
+
+    def _submit_matrix_file(
+        self,
+        service: IsolationForestScoringService,
+        feature_matrix: np.ndarray,
+        records_seen: int,
+        fn: Callable[..., tuple[ModelTrainingResponse, float, float]],
+        *args: Any,
+    ) -> TrainingJobStatus:
+        # ``fn`` receives the path of the saved matrix ahead of ``args``.
+        matrix_path = service.artifact_dir / f".ingest-{uuid.uuid4().hex}.npy"
+        np.save(matrix_path, feature_matrix, allow_pickle=False)
+        try:
+            return self._submit(
+                service,
+                records_seen,
+                fn,
+                str(service.artifact_dir),
+                service.config,
+                str(matrix_path),
+                *args,
+            )
+        except BaseException:
+            matrix_path.unlink(missing_ok=True)
+            raise
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # "spawn" avoids forking a process that holds exporter and logging
+        # threads, which can leave locks held in the child.
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _on_done(
+        self, job: _TrainingJob, service: IsolationForestScoringService, future: Future
+    ) -> None:
+        # Loading the new model happens outside the lock: status queries take
+        # it from the event loop and must not wait on disk or S3.
+        result = error = started = None
+        try:
+            result, started, finished = future.result()
+        except _TrainingFailure as exc:
+            error, started, finished = exc.error, exc.started, exc.finished
+        except (Exception, CancelledError) as exc:
+            error, finished = str(exc) or type(exc).__name__, time.time()
+
+        if result is not None:
+            # A retrained version name must not keep serving the old model.
+            service.invalidate(result.model_version)
+            if service.watching:
+                # Swap before reporting success, so a client that saw the job
+                # succeed is served the new model.
+                try:
+                    service.refresh_latest()
+                except Exception:
+                    logger.exception("Failed to load model version %s", result.model_version)
+            logger.info(
+                "Training job %s produced model version %s", job.job_id, result.model_version
+            )
+        else:
+            logger.warning("Training job %s failed: %s", job.job_id, error)
+
+        with self._lock:
+            job.result = result
+            job.error = error
+            if started is not None:
+                job.started_at = datetime.fromtimestamp(started, tz=UTC)
+            job.finished_at = datetime.fromtimestamp(finished, tz=UTC)
+            job.done = True
+            self._trim_history()
+            status = job.to_status()
+        self._publish(status)
+
+    def _publish(self, status: TrainingJobStatus) -> None:
+        if self._publisher is not None:
+            self._publisher.submit(self._write_status, status)
+
+    def _write_status(self, status: TrainingJobStatus) -> None:
+        try:
+            self.store.put(status)
+        except Exception:
+            logger.exception("Failed to record the status of training job %s", status.job_id)
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.history_size)]:
+            del self._jobs[job_id]
+
+
+_manager_instance: TrainingJobManager | None = None
+
+
+def get_training_job_manager() -> TrainingJobManager:
+    """Return a singleton training job manager."""
+
+    global _manager_instance
+    if _manager_instance is None:
+        _manager_instance = TrainingJobManager(
+            max_workers=settings.training_max_concurrent_jobs,
+            max_pending=settings.training_max_pending_jobs,
+            history_size=settings.training_job_history,
+            store=create_job_status_store(),
+        )
+    return _manager_instance
+
+
+def shutdown_training_jobs(wait: bool = True) -> None:
+    """Drain and stop the training job manager if it was started."""
+
+    global _manager_instance
+    if _manager_instance is not None:
+        _manager_instance.shutdown(wait=wait)
+        _manager_instance = None
@@ -0,0 +1,113 @@
+"""Bounded on-disk window of recent training rows for a model lineage."""
+
+from __future__ import annotations
+
+import fcntl
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+_WINDOW_DTYPE = np.float32
+
+
+class TrainingWindow:
+    """Fixed-capacity ring buffer of float32 rows stored as a memory-mapped ``.npy``.
+
+    Only the pages touched by an append or sample are read, so keeping a large
+    window per lineage costs disk rather than resident memory. The write head
+    and row count live in a small JSON sidecar.
+    """
+
+    def __init__(self, path: Path, rows: np.memmap, head: int, count: int):
+        self.path = path
+        self._rows = rows
+        self.head = head
+        self.count = count
+
+    @property
+    def capacity(self) -> int:
+        return self._rows.shape[0]
+
+    @property
+    def n_features(self) -> int:
+        return self._rows.shape[1]
+
+    @staticmethod
+    def _state_path(path: Path) -> Path:
+        return path.with_suffix(".state.json")
+
+    @classmethod
+    def create(cls, path: Path, capacity: int, n_features: int) -> TrainingWindow:
+        """Create an empty window, replacing any existing one at ``path``."""
+
+        rows = np.lib.format.open_memmap(
+            path, mode="w+", dtype=_WINDOW_DTYPE, shape=(capacity, n_features)
+        )
+        window = cls(path, rows, head=0, count=0)
+        window.flush()
+        return window
+
+    @classmethod
+    def open(cls, path: Path, capacity: int, n_features: int) -> TrainingWindow:
+        """Open the window at ``path``, creating it if it does not exist yet."""
+
+        state_path = cls._state_path(path)
+        if not path.exists() or not state_path.exists():
+            return cls.create(path, capacity, n_features)
+        rows = np.load(path, mmap_mode="r+")
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        if rows.shape[1] != n_features:
+            msg = f"Training window has {rows.shape[1]} features, batch has {n_features}"
+            raise ValueError(msg)
+        return cls(path, rows, head=state["head"], count=state["count"])
+
+    @staticmethod
+    @contextmanager
+    def locked(path: Path) -> Iterator[None]:
+        """Hold an exclusive advisory lock for read-modify-write of a window."""
+
+        lock_path = path.with_suffix(".lock")
+        with open(lock_path, "a+b") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(self, rows: np.ndarray) -> None:
+        """Write ``rows`` at the head, overwriting the oldest rows once full."""
+
+        rows = np.asarray(rows, dtype=_WINDOW_DTYPE)
+        if rows.shape[1] != self.n_features:
+            msg = f"Training window has {self.n_features} features, batch has {rows.shape[1]}"
+            raise ValueError(msg)
+        rows = rows[-self.capacity :]
+        first = min(rows.shape[0], self.capacity - self.head)
+        self._rows[self.head : self.head + first] = rows[:first]
+        self._rows[: rows.shape[0] - first] = rows[first:]
+        self.head = (self.head + rows.shape[0]) % self.capacity
+        self.count = min(self.capacity, self.count + rows.shape[0])
+
+    def rows(self) -> np.ndarray:
+        """Return the filled rows (in storage order, not arrival order)."""
+
+        return self._rows[: self.count]
+
+    def sample(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw ``n`` rows uniformly; with replacement if the window is smaller."""
+
+        if self.count == 0 or n <= 0:
+            return np.empty((0, self.n_features), dtype=_WINDOW_DTYPE)
+        indices = np.sort(rng.choice(self.count, size=n, replace=n > self.count))
+        return np.asarray(self._rows[indices])
+
+    def flush(self) -> None:
+        """Persist the rows and the head/count state."""
+
+        self._rows.flush()
+        self._state_path(self.path).write_text(
+            json.dumps({"head": self.head, "count": self.count}), encoding="utf-8"
+        )
@@ -0,0 +1,73 @@
+"""Startup warm-up of the latest model, gating readiness."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from app.services.scoring import get_scoring_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class WarmUpState:
+    """Progress of the startup warm-up; ``idle`` when none was scheduled."""
+
+    status: str = "idle"  # idle, running, complete or failed
+    model_version: str | None = None
+    duration_seconds: float | None = None
+    error: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("idle", "complete")
+
+
+_state = WarmUpState()
+_task: asyncio.Task | None = None
+
+
+def get_warm_up_state() -> WarmUpState:
+    """Return the current warm-up state."""
+
+    return _state
+
+
+def _run(iterations: int) -> None:
+    started = time.perf_counter()
+    service = get_scoring_service()
+    try:
+        # A fresh task may only have the version in the remote store.
+        service.sync_remote_latest()
+        _state.model_version = service.warm_up(iterations)
+    except Exception as exc:
+        # Readiness stays at 503: a task that cannot load LATEST would fail
+        # every request, so the orchestrator should replace it instead.
+        logger.exception("Model warm-up failed")
+        _state.error = str(exc)
+        _state.status = "failed"
+    else:
+        _state.status = "complete"
+        logger.info("Model warm-up finished for version %s", _state.model_version or "none")
+    finally:
+        _state.duration_seconds = time.perf_counter() - started
+
+
+def start_warm_up(iterations: int = 3) -> None:
+    """Warm the latest model in a worker thread; readiness fails until it succeeds."""
+
+    global _state, _task
+    _state = WarmUpState(status="running")
+    _task = asyncio.create_task(asyncio.to_thread(_run, iterations), name="model-warm-up")
+
+
+async def stop_warm_up() -> None:
+    """Wait for an in-progress warm-up so shutdown does not race it."""
+
+    global _task
+    if _task is not None:
+        await _task
+        _task = None
@@ -0,0 +1,5 @@
+"""Microbenchmarks for the scoring and training hot paths.
+
+Run ``python -m benchmarks run`` to time every case and write JSON results,
+and ``python -m benchmarks compare BASELINE CURRENT`` to flag regressions.
+"""
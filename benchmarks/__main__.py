@@ -0,0 +1,87 @@
+"""Command line entry point: ``python -m benchmarks {run,compare}``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.runner import compare, format_duration, read_results, time_case, write_results
+
+DEFAULT_OUTPUT = Path("bench_results.json")
+
+
+def _run(args: argparse.Namespace) -> int:
+    from benchmarks.suite import all_cases, isolated_artifacts
+
+    results = []
+    with isolated_artifacts() as artifact_dir:
+        for case in all_cases(artifact_dir, seed=args.seed):
+            if args.filter and args.filter not in case.name:
+                continue
+            result = time_case(
+                case.name,
+                case.group,
+                case.func,
+                case.params,
+                repeats=args.repeats,
+                min_time=args.min_time,
+            )
+            results.append(result)
+            print(f"{result.name:<48} {format_duration(result.median_s)}  (x{result.loops})")
+
+    write_results(args.output, results)
+    print(f"Wrote {len(results)} results to {args.output}")
+    if args.baseline is None:
+        return 0
+    return _report(read_results(args.baseline), {result.name: result for result in results}, args)
+
+
+def _compare(args: argparse.Namespace) -> int:
+    return _report(read_results(args.baseline), read_results(args.current), args)
+
+
+def _report(baseline, current, args: argparse.Namespace) -> int:
+    regressions = compare(baseline, current, threshold=args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name}: {format_duration(regression.baseline_s)} -> "
+            f"{format_duration(regression.current_s)} ({regression.ratio:.2f}x)"
+        )
+    compared = len(baseline.keys() & current.keys())
+    print(f"{len(regressions)} regression(s) across {compared} compared case(s)")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time every case and write JSON results")
+    run.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT)
+    run.add_argument("-k", "--filter", help="only run cases whose name contains this text")
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--baseline", type=Path, help="compare against these results when done")
+    run.set_defaults(handler=_run)
+
+    comparison = commands.add_parser("compare", help="compare two result files")
+    comparison.add_argument("baseline", type=Path)
+    comparison.add_argument("current", type=Path)
+    comparison.set_defaults(handler=_compare)
+
+    for command in (run, comparison):
+        command.add_argument(
+            "--threshold",
+            type=float,
+            default=0.10,
+            help="fractional slowdown of the median reported as a regression",
+        )
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
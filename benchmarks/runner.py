@@ -0,0 +1,153 @@
+"""Timing harness, result files and baseline comparison."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+import timeit
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+RESULTS_SCHEMA_VERSION = 1
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Per-call timings for one benchmark case, in seconds."""
+
+    name: str
+    group: str
+    params: dict[str, int | str]
+    loops: int
+    repeats: int
+    min_s: float
+    median_s: float
+    stdev_s: float
+
+
+@dataclass(slots=True)
+class Regression:
+    """A case whose median got slower than the allowed threshold."""
+
+    name: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s
+
+
+def time_case(
+    name: str,
+    group: str,
+    func: Callable[[], object],
+    params: dict[str, int | str] | None = None,
+    repeats: int = 5,
+    min_time: float = 0.2,
+) -> BenchmarkResult:
+    """Time ``func`` like ``timeit``: calibrate a loop count, then repeat it.
+
+    The loop count is chosen so one repeat takes at least ``min_time``
+    seconds; slow cases (e.g. training) therefore run once per repeat.
+    """
+
+    func()  # warm caches and lazy imports outside the measurement
+    timer = timeit.Timer(func, timer=time.perf_counter)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+    per_call = [elapsed / loops] + [timer.timeit(loops) / loops for _ in range(repeats - 1)]
+    return BenchmarkResult(
+        name=name,
+        group=group,
+        params=params or {},
+        loops=loops,
+        repeats=repeats,
+        min_s=min(per_call),
+        median_s=statistics.median(per_call),
+        stdev_s=statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict[str, str | None]:
+    """Describe the machine and library versions the results were taken on."""
+
+    import numpy
+    import pydantic
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy.__version__,
+        "sklearn": sklearn.__version__,
+        "pydantic": pydantic.__version__,
+        "commit": _git_commit(),
+    }
+
+
+def write_results(path: Path, results: list[BenchmarkResult]) -> None:
+    payload = {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "created_at": datetime.now(tz=UTC).isoformat(),
+        "environment": environment(),
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def read_results(path: Path) -> dict[str, BenchmarkResult]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("schema_version") != RESULTS_SCHEMA_VERSION:
+        msg = f"{path} has unsupported schema version {payload.get('schema_version')!r}"
+        raise ValueError(msg)
+    return {item["name"]: BenchmarkResult(**item) for item in payload["results"]}
+
+
+def compare(
+    baseline: dict[str, BenchmarkResult],
+    current: dict[str, BenchmarkResult],
+    threshold: float = 0.10,
+) -> list[Regression]:
+    """Return cases whose median is more than ``threshold`` slower than baseline.
+
+    Cases missing from either side are ignored so the suite can grow.
+    """
+
+    regressions = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None or before.median_s <= 0:
+            continue
+        if result.median_s > before.median_s * (1.0 + threshold):
+            regressions.append(Regression(name, before.median_s, result.median_s))
+    return regressions
+
+
+def format_duration(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
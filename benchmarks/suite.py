@@ -0,0 +1,201 @@
+"""Benchmark cases for the scoring service and the HTTP layer."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+
+# Keep tracing exporters from retrying against a collector that is not running.
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from app.config import settings  # noqa: E402
+from app.domain import ScoreRequest, TelemetryBatch, TelemetryRecord  # noqa: E402
+from app.services.scoring import (  # noqa: E402
+    SCORING_ENGINES,
+    IsolationForestScoringService,
+    reset_scoring_service,
+)
+
+BATCH_SIZES = (1, 100, 1_000)
+TRAIN_SIZES = (1_000, 10_000)
+FEATURE_WIDTHS = (4, 32)
+
+
+@dataclass(slots=True)
+class Case:
+    """A named callable to time, plus the parameters it was built with."""
+
+    name: str
+    group: str
+    func: Callable[[], object]
+    params: dict[str, int | str] = field(default_factory=dict)
+
+
+def _records(rows: np.ndarray) -> list[dict]:
+    timestamp = datetime.now(tz=UTC).isoformat()
+    return [
+        {"vehicle_id": f"vehicle-{index}", "timestamp": timestamp, "feature_vector": row}
+        for index, row in enumerate(rows.tolist())
+    ]
+
+
+def _batch(rows: np.ndarray) -> TelemetryBatch:
+    return TelemetryBatch(records=[TelemetryRecord(**record) for record in _records(rows)])
+
+
+@contextmanager
+def isolated_artifacts() -> Iterator[Path]:
+    """Point the app at a throwaway artifact directory for the duration of a run."""
+
+    original = settings.model_artifact_dir, settings.rate_limit_enabled
+    with tempfile.TemporaryDirectory(prefix="bench-artifacts-") as directory:
+        settings.model_artifact_dir = directory
+        settings.rate_limit_enabled = False
+        reset_scoring_service()
+        try:
+            yield Path(directory)
+        finally:
+            settings.model_artifact_dir, settings.rate_limit_enabled = original
+            reset_scoring_service()
+
+
+def service_cases(artifact_dir: Path, rng: np.random.Generator) -> Iterator[Case]:
+    """Cases that call the scoring service directly."""
+
+    for width in FEATURE_WIDTHS:
+        for rows in BATCH_SIZES:
+            records = _batch(rng.normal(size=(rows, width))).records
+            yield Case(
+                f"to_matrix[rows={rows},width={width}]",
+                "service",
+                lambda records=records: IsolationForestScoringService._to_matrix(records),
+                {"rows": rows, "width": width},
+            )
+
+    for width in FEATURE_WIDTHS:
+        for rows in TRAIN_SIZES:
+            service = IsolationForestScoringService(artifact_dir / f"train-{rows}-{width}")
+            batch = _batch(rng.normal(size=(rows, width)))
+            yield Case(
+                f"train[rows={rows},width={width}]",
+                "service",
+                lambda service=service, batch=batch: service.train(batch),
+                {"rows": rows, "width": width},
+            )
+
+    for engine in SCORING_ENGINES:
+        for width in FEATURE_WIDTHS:
+            directory = artifact_dir / f"score-{engine}-{width}"
+            service = IsolationForestScoringService(directory, scoring_engine=engine)
+            version = service.train(_batch(rng.normal(size=(2_000, width)))).model_version
+            params = {"engine": engine, "width": width}
+
+            def load_cold(service=service, version=version):
+                service.model_cache.clear()
+                return service._load_model(version)
+
+            yield Case(f"load_model_cold[{engine},width={width}]", "service", load_cold, params)
+            yield Case(
+                f"load_model_warm[{engine},width={width}]",
+                "service",
+                lambda service=service, version=version: service._load_model(version),
+                params,
+            )
+
+            request = ScoreRequest(**_records(rng.normal(size=(1, width)))[0])
+            yield Case(
+                f"score_single[{engine},width={width}]",
+                "service",
+                lambda service=service, request=request: service.score(request),
+                params,
+            )
+            for rows in BATCH_SIZES[1:]:
+                matrix = rng.normal(size=(rows, width))
+                yield Case(
+                    f"score_matrix[{engine},rows={rows},width={width}]",
+                    "service",
+                    lambda service=service, matrix=matrix: service.score_matrix(matrix),
+                    {**params, "rows": rows},
+                )
+
+
+def validation_cases(rng: np.random.Generator) -> Iterator[Case]:
+    """Cases for Pydantic request validation."""
+
+    for width in FEATURE_WIDTHS:
+        payload = _records(rng.normal(size=(1, width)))[0]
+        yield Case(
+            f"validate_score_request[width={width}]",
+            "validation",
+            lambda payload=payload: ScoreRequest.model_validate(payload),
+            {"width": width},
+        )
+
+
+def http_cases(rng: np.random.Generator) -> Iterator[Case]:
+    """Full in-process round trips through the ASGI app and its middleware."""
+
+    import httpx
+
+    from app.main import app
+    from app.services.scoring import get_scoring_service
+
+    # Per-request log lines would otherwise dominate the output of the run.
+    for name in ("app.access", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    width = FEATURE_WIDTHS[0]
+    get_scoring_service().train(_batch(rng.normal(size=(2_000, width))))
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, client=("127.0.0.1", 50000)),
+        base_url="http://localhost",
+    )
+
+    def post(path: str, payload: object) -> Callable[[], object]:
+        def call():
+            response = loop.run_until_complete(client.post(path, json=payload))
+            response.raise_for_status()
+            return response
+
+        return call
+
+    yield Case(
+        f"http_score[width={width}]",
+        "http",
+        post("/score", _records(rng.normal(size=(1, width)))[0]),
+        {"width": width},
+    )
+    for rows in BATCH_SIZES[1:]:
+        payload = {"records": _records(rng.normal(size=(rows, width)))}
+        yield Case(
+            f"http_score_batch[rows={rows},width={width}]",
+            "http",
+            post("/score/batch", payload),
+            {"rows": rows, "width": width},
+        )
+    yield Case("http_health", "http", lambda: loop.run_until_complete(client.get("/health")))
+
+    loop.run_until_complete(client.aclose())
+    loop.close()
+
+
+def all_cases(artifact_dir: Path, seed: int = 0) -> Iterator[Case]:
+    """Yield every case; each must be timed before the next one is requested,
+    since generators release their fixtures (e.g. the HTTP client) once exhausted.
+    """
+
+    rng = np.random.default_rng(seed)
+    yield from validation_cases(rng)
+    yield from service_cases(artifact_dir, rng)
+    yield from http_cases(rng)
@@ -0,0 +1,43 @@
+"""Gunicorn configuration for running several uvicorn workers per task.
+
+The app and its models are loaded once in the master process and inherited
+by forked workers, so their pages are shared copy-on-write:
+
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+
+import gc
+import logging
+
+from app.config import settings
+
+bind = f"{settings.host}:{settings.port}"
+# One worker unless raised: rate limits, micro-batch queues, score caches and
+# Prometheus counters all live in each worker process.
+workers = max(1, settings.web_workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Logging is configured by the app; keep gunicorn's own output on stderr.
+accesslog = None
+
+logger = logging.getLogger("gunicorn.preload")
+
+
+def when_ready(server):
+    """Load models in the master after the app is imported, before any fork."""
+
+    from app.services.scoring import get_scoring_service
+
+    loaded = get_scoring_service().preload(recent=settings.preload_recent_versions)
+    logger.info("Preloaded model versions before forking: %s", ", ".join(loaded) or "none")
+
+
+def pre_fork(server, worker):
+    """Move everything allocated so far out of the collector's reach.
+
+    Frozen objects are never traversed by ``gc`` in the workers, so cyclic
+    collections do not write to (and un-share) the pages holding the app and
+    preloaded models. Repeated calls also cover workers respawned later.
+    """
+
+    gc.freeze()
@@ -93,11 +93,23 @@ response=$(curl -s -w "\n%{http_code}" -X POST \
 http_code=$(echo "$response" | tail -n1)
 body=$(echo "$response" | head -n-1)
 
-if [ "$http_code" = "201" ]; then
-    echo -e "${GREEN}✓ Model training passed${NC}"
-    echo "Response: $body"
-    MODEL_VERSION=$(echo "$body" | grep -o '"model_version":"[^"]*"' | cut -d'"' -f4)
-    echo "Model Version: $MODEL_VERSION"
+if [ "$http_code" = "202" ]; then
+    JOB_ID=$(echo "$body" | grep -o '"job_id":"[^"]*"' | cut -d'"' -f4)
+    for _ in $(seq 1 60); do
+        body=$(curl -s "${BASE_URL}/ingest/jobs/${JOB_ID}")
+        echo "$body" | grep -q '"state":"\(succeeded\|failed\)"' && break
+        sleep 1
+    done
+    if echo "$body" | grep -q '"state":"succeeded"'; then
+        echo -e "${GREEN}✓ Model training passed${NC}"
+        echo "Response: $body"
+        MODEL_VERSION=$(echo "$body" | grep -o '"model_version":"[^"]*"' | head -n1 | cut -d'"' -f4)
+        echo "Model Version: $MODEL_VERSION"
+    else
+        echo -e "${RED}✗ Model training job did not succeed${NC}"
+        echo "Response: $body"
+        exit 1
+    fi
 else
     echo -e "${RED}✗ Model training failed (HTTP $http_code)${NC}"
     echo "Response: $body"
@@ -1,11 +1,16 @@
 """Test configuration."""
 
+import json
+import time
+from datetime import UTC, datetime
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.config import settings
 from app.main import app
 from app.services.scoring import reset_scoring_service
+from app.services.training_jobs import shutdown_training_jobs
 
 
 @pytest.fixture
@@ -33,3 +38,70 @@ def isolated_artifact_dir(tmp_path, monkeypatch):
         monkeypatch.setattr(settings, "model_artifact_dir", original_dir)
         reset_scoring_service()
 
+
+@pytest.fixture(autouse=True)
+def disable_rate_limit(monkeypatch):
+    """Keep the shared per-client rate limit from throttling tests that poll."""
+
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def training_job_pool():
+    """Drain the shared training process pool once the test session ends."""
+
+    yield
+    shutdown_training_jobs()
+
+
+def sample_batch():
+    """Three nearby telemetry records, enough to train a small model."""
+
+    timestamp = datetime.now(tz=UTC).isoformat()
+    return {
+        "records": [
+            {
+                "vehicle_id": "vehicle-1",
+                "timestamp": timestamp,
+                "feature_vector": [0.1, 0.2, 0.3],
+            },
+            {
+                "vehicle_id": "vehicle-2",
+                "timestamp": timestamp,
+                "feature_vector": [0.15, 0.22, 0.31],
+            },
+            {
+                "vehicle_id": "vehicle-3",
+                "timestamp": timestamp,
+                "feature_vector": [0.12, 0.19, 0.29],
+            },
+        ]
+    }
+
+
+def wait_for_job(client: TestClient, job_id: str, timeout: float = 60.0) -> dict:
+    """Poll a training job until it finishes and return its final status."""
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/ingest/jobs/{job_id}").json()
+        if job["state"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Training job {job_id} did not finish in {timeout}s")
+
+
+def ingest(client: TestClient, payload: dict | None = None) -> dict:
+    """Submit a training batch and return the finished job's training result."""
+
+    response = client.post("/ingest", json=payload or sample_batch())
+    assert response.status_code == 202
+    job = wait_for_job(client, response.json()["job_id"])
+    assert job["state"] == "succeeded", job["error"]
+    return job["result"]
+
+
+def ndjson(records: list[dict]) -> bytes:
+    """Encode records as a newline-delimited JSON request body."""
+
+    return "\n".join(json.dumps(record) for record in records).encode() + b"\n"
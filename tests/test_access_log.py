@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.access_log import AccessLogMiddleware, JsonFormatter, _DroppingQueueHandler
+
+
+def _app(sample_rates: dict[str, float] | None = None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/score")
+    async def score():
+        return {"ok": True}
+
+    @app.get("/boom")
+    async def boom():
+        raise HTTPException(status_code=503, detail="unavailable")
+
+    app.add_middleware(AccessLogMiddleware, sample_rates=sample_rates)
+    return app
+
+
+def test_access_log_emits_one_structured_record(caplog):
+    client = TestClient(_app())
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        assert client.get("/score").status_code == 200
+
+    records = [record for record in caplog.records if record.name == "app.access"]
+    assert len(records) == 1
+    record = records[0]
+    assert (record.method, record.path, record.status) == ("GET", "/score", 200)
+    assert record.duration_ms >= 0
+    assert '"path": "/score"' in JsonFormatter().format(record)
+
+
+def test_access_log_sampling_keeps_server_errors(caplog):
+    client = TestClient(_app({"/score": 0.0, "/boom": 0.0}))
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        for _ in range(5):
+            client.get("/score")
+        client.get("/boom")
+
+    statuses = [record.status for record in caplog.records if record.name == "app.access"]
+    assert statuses == [503]
+
+
+def test_queue_handler_drains_on_listener_thread_and_drops_when_full():
+    log_queue: queue.Queue = queue.Queue(maxsize=1)
+    handler = _DroppingQueueHandler(log_queue)
+    logger = logging.getLogger("tests.access_log.queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        dropped = _DroppingQueueHandler.dropped
+        logger.warning("first")
+        logger.warning("second")
+        assert _DroppingQueueHandler.dropped == dropped + 1
+
+        seen: list[str] = []
+
+        class _Collect(logging.Handler):
+            def emit(self, record):
+                seen.append(record.getMessage())
+
+        listener = QueueListener(log_queue, _Collect())
+        listener.start()
+        listener.stop()
+        assert seen == ["first"]
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = True
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+from app.core.storage import ArtifactCache, ArtifactIntegrityError, FilesystemArtifactStore
+from app.domain import ScoreRequest, TelemetryBatch
+from app.services.scoring import IsolationForestScoringService
+
+
+class _CountingStore(FilesystemArtifactStore):
+    def __init__(self, root):
+        super().__init__(root)
+        self.downloads = []
+        self.heads = []
+
+    def head(self, key):
+        self.heads.append(key)
+        return super().head(key)
+
+    def download(self, key, path):
+        self.downloads.append(key)
+        super().download(key, path)
+
+
+def _upload(store, tmp_path, key, content: bytes) -> None:
+    source = tmp_path / "upload" / key
+    source.parent.mkdir(exist_ok=True)
+    source.write_bytes(content)
+    store.upload(source, key)
+
+
+def test_cache_reuses_copy_until_remote_etag_changes(tmp_path):
+    store = _CountingStore(tmp_path / "remote")
+    cache = ArtifactCache(store, tmp_path / "cache", max_bytes=1 << 20)
+    _upload(store, tmp_path, "model.joblib", b"first")
+
+    assert cache.fetch("model.joblib").read_bytes() == b"first"
+    assert cache.fetch("model.joblib").read_bytes() == b"first"
+    assert store.downloads == ["model.joblib"]
+
+    _upload(store, tmp_path, "model.joblib", b"second")
+    assert cache.fetch("model.joblib").read_bytes() == b"second"
+    assert store.downloads == ["model.joblib", "model.joblib"]
+
+    with pytest.raises(FileNotFoundError):
+        cache.fetch("missing.joblib")
+
+
+def test_cache_skips_head_requests_within_revalidation_window(tmp_path):
+    store = _CountingStore(tmp_path / "remote")
+    cache = ArtifactCache(store, tmp_path / "cache", max_bytes=1 << 20, revalidate_seconds=60)
+    _upload(store, tmp_path, "model.joblib", b"first")
+
+    for _ in range(3):
+        assert cache.fetch("model.joblib").read_bytes() == b"first"
+    assert (store.heads, store.downloads) == (["model.joblib"], ["model.joblib"])
+
+
+def test_cache_rejects_corrupt_download(tmp_path):
+    store = FilesystemArtifactStore(tmp_path / "remote")
+    cache = ArtifactCache(store, tmp_path / "cache", max_bytes=1 << 20)
+    _upload(store, tmp_path, "model.joblib", b"payload")
+    (store.root / "model.joblib.sha256").write_text("0" * 64, encoding="utf-8")
+
+    with pytest.raises(ArtifactIntegrityError):
+        cache.fetch("model.joblib")
+    assert not (cache.cache_dir / "model.joblib").exists()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    store = FilesystemArtifactStore(tmp_path / "remote")
+    cache = ArtifactCache(store, tmp_path / "cache", max_bytes=250)
+    for name in ("a", "b", "c"):
+        _upload(store, tmp_path, name, name.encode() * 100)
+
+    old = cache.fetch("a")
+    os.utime(old, ns=(1, 1))
+    cache.fetch("b")
+    cache.fetch("c")
+
+    assert sorted(path.name for path in cache.cache_dir.iterdir() if path.name[0] != ".") == [
+        "b",
+        "c",
+    ]
+
+
+@pytest.mark.parametrize("scoring_engine", ["sklearn", "mmap"])
+def test_service_serves_versions_published_by_another_task(tmp_path, scoring_engine):
+    timestamp = datetime.now(tz=UTC)
+    store = _CountingStore(tmp_path / "remote")
+    trainer = IsolationForestScoringService(
+        tmp_path / "trainer",
+        artifact_cache=ArtifactCache(store, tmp_path / "trainer-cache", 1 << 30),
+    )
+    server = IsolationForestScoringService(
+        tmp_path / "server",
+        scoring_engine=scoring_engine,
+        artifact_cache=ArtifactCache(store, tmp_path / "server-cache", 1 << 30),
+    )
+    rng = np.random.default_rng(5)
+    batch = TelemetryBatch(
+        records=[
+            {"vehicle_id": f"vehicle-{i}", "timestamp": timestamp, "feature_vector": row}
+            for i, row in enumerate(rng.normal(size=(64, 3)).tolist())
+        ]
+    )
+    version = trainer.train(batch).model_version
+
+    assert server.sync_remote_latest() == version
+    suffix = "forest" if scoring_engine == "mmap" else "joblib"
+    assert store.downloads == [
+        f"isolation_forest_{version}.metadata.json",
+        f"isolation_forest_{version}.{suffix}",
+    ]
+
+    request = ScoreRequest(vehicle_id="vehicle-x", timestamp=timestamp, feature_vector=[0, 0, 0])
+    assert server.score(request).anomaly_score == pytest.approx(
+        trainer.score(request).anomaly_score, abs=1e-12
+    )
+    assert server.sync_remote_latest() == version
+    assert len(store.downloads) == 2
+
+
+def test_ensure_loaded_fetches_pinned_versions_off_the_request_path(tmp_path):
+    timestamp = datetime.now(tz=UTC)
+    store = _CountingStore(tmp_path / "remote")
+    trainer = IsolationForestScoringService(
+        tmp_path / "trainer",
+        artifact_cache=ArtifactCache(store, tmp_path / "trainer-cache", 1 << 30),
+    )
+    server = IsolationForestScoringService(
+        tmp_path / "server",
+        artifact_cache=ArtifactCache(store, tmp_path / "server-cache", 1 << 30),
+    )
+    rows = np.random.default_rng(6).normal(size=(64, 3)).tolist()
+    batch = TelemetryBatch(
+        records=[
+            {"vehicle_id": "vehicle-1", "timestamp": timestamp, "feature_vector": row}
+            for row in rows
+        ]
+    )
+    pinned = trainer.train(batch).model_version
+    trainer.train(batch)
+    server.sync_remote_latest()
+    request = ScoreRequest(
+        vehicle_id="vehicle-x", timestamp=timestamp, feature_vector=[0, 0, 0], model_version=pinned
+    )
+
+    asyncio.run(server.ensure_loaded(pinned, [request.vehicle_id]))
+    calls = (len(store.heads), len(store.downloads))
+    assert server.score(request).model_version == pinned
+    assert server.pin_version(pinned) == pinned
+    assert (len(store.heads), len(store.downloads)) == calls
+
+    # A version that does not exist is not looked up again while scoring.
+    asyncio.run(server.ensure_loaded("missing", [request.vehicle_id]))
+    calls = len(store.heads)
+    with pytest.raises(FileNotFoundError, match="not available"):
+        server.score(request.model_copy(update={"model_version": "missing"}))
+    assert len(store.heads) == calls
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from benchmarks.runner import BenchmarkResult, compare, read_results, time_case, write_results
+
+
+def _result(name: str, median_s: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        group="service",
+        params={},
+        loops=1,
+        repeats=1,
+        min_s=median_s,
+        median_s=median_s,
+        stdev_s=0.0,
+    )
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {"fast": _result("fast", 1.0), "steady": _result("steady", 1.0)}
+    current = {
+        "fast": _result("fast", 1.5),
+        "steady": _result("steady", 1.05),
+        "new": _result("new", 9.0),
+    }
+
+    regressions = compare(baseline, current, threshold=0.10)
+
+    assert [regression.name for regression in regressions] == ["fast"]
+    assert regressions[0].ratio == 1.5
+
+
+def test_results_round_trip_through_json(tmp_path):
+    result = time_case("noop", "service", lambda: None, repeats=2, min_time=0.001)
+    path = tmp_path / "results.json"
+    write_results(path, [result])
+
+    assert read_results(path) == {"noop": result}
+    assert result.loops >= 1 and result.median_s >= 0
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain import SCORES_MEDIA_TYPE, TELEMETRY_MEDIA_TYPE, BinaryFormatError, TelemetryBatch
+from app.domain.binary import decode_scores, decode_telemetry_frame, encode_telemetry_frame
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+from tests.conftest import ingest, wait_for_job
+
+
+def _frame(features: list[list[float]]) -> bytes:
+    now = datetime.now(tz=UTC).timestamp()
+    vehicle_ids = [f"vehicle-{i}" for i in range(len(features))]
+    return encode_telemetry_frame(vehicle_ids, np.full(len(features), now), np.array(features))
+
+
+def test_telemetry_frame_round_trip_is_zero_copy():
+    payload = _frame([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+    frame = decode_telemetry_frame(payload)
+
+    assert frame.vehicle_ids == ["vehicle-0", "vehicle-1"]
+    assert frame.features.dtype == np.float32
+    assert frame.features.shape == (2, 3)
+    assert not frame.features.flags.owndata
+    np.testing.assert_allclose(frame.features[1], [0.4, 0.5, 0.6], rtol=1e-6)
+
+
+@pytest.mark.parametrize("payload", [b"", b"VAT1" + b"\x00" * 12, _frame([[1.0]])[:-1]])
+def test_malformed_frames_are_rejected(payload):
+    with pytest.raises(BinaryFormatError):
+        decode_telemetry_frame(payload)
+
+
+@pytest.mark.parametrize(
+    ("timestamp", "feature"), [(np.nan, 0.0), (1e300, 0.0), (0.0, np.inf), (0.0, np.nan)]
+)
+def test_non_finite_frames_are_rejected(client: TestClient, timestamp, feature):
+    payload = encode_telemetry_frame(["vehicle-0"], np.array([timestamp]), np.array([[feature]]))
+    with pytest.raises(BinaryFormatError):
+        decode_telemetry_frame(payload)
+
+    headers = {"Content-Type": TELEMETRY_MEDIA_TYPE}
+    assert client.post("/score", content=payload, headers=headers).status_code == 400
+
+
+def test_binary_score_matches_json_score(client: TestClient):
+    ingest(client)
+    features = [0.13, 0.2, 0.28]
+    expected = client.post(
+        "/score",
+        json={
+            "vehicle_id": "vehicle-0",
+            "timestamp": datetime.now(tz=UTC).isoformat(),
+            "feature_vector": features,
+        },
+    ).json()
+
+    json_response = client.post(
+        "/score", content=_frame([features]), headers={"Content-Type": TELEMETRY_MEDIA_TYPE}
+    )
+    assert json_response.status_code == 200
+    assert json_response.json()["vehicle_id"] == "vehicle-0"
+    assert json_response.json()["anomaly_score"] == pytest.approx(expected["anomaly_score"])
+
+    binary_response = client.post(
+        "/score",
+        content=_frame([features]),
+        headers={"Content-Type": TELEMETRY_MEDIA_TYPE, "Accept": SCORES_MEDIA_TYPE},
+    )
+    assert binary_response.headers["content-type"] == SCORES_MEDIA_TYPE
+    model_version, scores, is_anomaly = decode_scores(binary_response.content)
+    assert model_version == expected["model_version"]
+    assert scores[0] == pytest.approx(expected["anomaly_score"])
+    assert bool(is_anomaly[0]) == expected["is_anomaly"]
+
+
+def test_binary_batch_score_and_errors(client: TestClient):
+    ingest(client)
+    headers = {"Content-Type": TELEMETRY_MEDIA_TYPE, "Accept": SCORES_MEDIA_TYPE}
+
+    response = client.post("/score/batch", content=_frame([[0.1, 0.2, 0.3]] * 4), headers=headers)
+    assert response.status_code == 200
+    _, scores, _ = decode_scores(response.content)
+    assert scores.shape == (4,)
+
+    wrong_width = client.post("/score/batch", content=_frame([[0.1, 0.2]]), headers=headers)
+    assert wrong_width.status_code == 400
+    two_records = client.post("/score", content=_frame([[0.1, 0.2, 0.3]] * 2), headers=headers)
+    assert two_records.status_code == 400
+
+
+def test_binary_ingest_queues_training(client: TestClient):
+    response = client.post(
+        "/ingest?model_version=binary",
+        content=_frame([[0.1, 0.2, 0.3], [0.15, 0.22, 0.31], [0.12, 0.19, 0.29]]),
+        headers={"Content-Type": TELEMETRY_MEDIA_TYPE},
+    )
+    assert response.status_code == 202
+    job = wait_for_job(client, response.json()["job_id"])
+    assert job["state"] == "succeeded", job["error"]
+    assert job["result"]["model_version"] == "binary"
+    assert job["result"]["records_trained"] == 3
+
+
+def test_binary_training_builds_rolling_features_and_shards(tmp_path):
+    rng = np.random.default_rng(3)
+    features = rng.normal(size=(120, 2)).astype(np.float32).astype(float)
+    vehicle_ids = [f"{fleet}-{i % 3}" for fleet in ("truck", "van") for i in range(60)]
+    timestamps = 1_700_000_000.0 + np.arange(120) % 60
+    frame = decode_telemetry_frame(encode_telemetry_frame(vehicle_ids, timestamps, features))
+    batch = TelemetryBatch(
+        records=[
+            {
+                "vehicle_id": vehicle_id,
+                "timestamp": datetime.fromtimestamp(timestamp, tz=UTC),
+                "feature_vector": row,
+            }
+            for vehicle_id, timestamp, row in zip(vehicle_ids, timestamps, features.tolist())
+        ],
+        sharded=True,
+    )
+    config = IsolationForestConfig(
+        n_estimators=20, rolling_window=4, shard_by="segment", shard_min_records=50
+    )
+    service = IsolationForestScoringService(tmp_path, config)
+
+    from_json = service.train(batch).metadata
+    from_frame = service.train_telemetry(
+        frame.features, frame.vehicle_ids, frame.timestamps, sharded=True
+    ).metadata
+    assert from_frame.feature_layout == from_json.feature_layout is not None
+    assert from_frame.n_features == from_json.n_features == 12
+    assert from_frame.shards.keys() == from_json.shards.keys() == {"truck", "van"}
+
+
+def test_binary_ingest_rejects_invalid_sharded_flag(client: TestClient):
+    response = client.post(
+        "/ingest?sharded=maybe",
+        content=_frame([[0.1, 0.2, 0.3]]),
+        headers={"Content-Type": TELEMETRY_MEDIA_TYPE},
+    )
+    assert response.status_code == 400
+
+
+def test_openapi_advertises_binary_bodies(client: TestClient):
+    paths = client.get("/openapi.json").json()["paths"]
+    for path in ("/score", "/score/batch", "/ingest"):
+        content = paths[path]["post"]["requestBody"]["content"]
+        assert "application/json" in content
+        assert TELEMETRY_MEDIA_TYPE in content
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest
+
+from app.domain import ScoreRequest, TelemetryBatch
+from app.services.forest_engine import FlatForest
+from app.services.scoring import IsolationForestScoringService
+
+
+@pytest.mark.parametrize(
+    ("max_features", "max_samples", "contamination"),
+    [(1.0, "auto", 0.05), (0.5, 64, "auto"), (1.0, 3, 0.1)],
+)
+def test_flat_forest_matches_sklearn(max_features, max_samples, contamination):
+    rng = np.random.default_rng(7)
+    training = rng.normal(size=(500, 5))
+    model = IsolationForest(
+        n_estimators=50,
+        max_samples=max_samples,
+        max_features=max_features,
+        contamination=contamination,
+        random_state=42,
+    ).fit(training)
+    forest = FlatForest.from_isolation_forest(model)
+
+    probe = np.vstack([rng.normal(scale=3.0, size=(200, 5)), training[:10]])
+    np.testing.assert_allclose(
+        forest.decision_function(probe), model.decision_function(probe), rtol=0, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        forest.decision_function(probe[:1]), model.decision_function(probe[:1]), rtol=0, atol=1e-12
+    )
+
+
+def test_flat_forest_rejects_wrong_width():
+    model = IsolationForest(n_estimators=5, random_state=0).fit(np.zeros((10, 3)))
+    with pytest.raises(ValueError, match="expecting 3 features"):
+        FlatForest.from_isolation_forest(model).decision_function(np.zeros((1, 2)))
+
+
+@pytest.mark.parametrize("value", [np.nan, np.inf, 1e300])
+def test_flat_forest_rejects_non_finite_input(value):
+    model = IsolationForest(n_estimators=5, random_state=0).fit(np.zeros((10, 3)))
+    probe = np.array([[0.0, value, 0.0]])
+    with pytest.raises(ValueError):
+        model.decision_function(probe)
+    with pytest.raises(ValueError, match="NaN, infinity"):
+        FlatForest.from_isolation_forest(model).decision_function(probe)
+
+
+def test_service_flat_engine_scores_like_sklearn(tmp_path):
+    timestamp = datetime.now(tz=UTC)
+    rng = np.random.default_rng(3)
+    batch = TelemetryBatch(
+        records=[
+            {"vehicle_id": f"vehicle-{i}", "timestamp": timestamp, "feature_vector": row}
+            for i, row in enumerate(rng.normal(size=(64, 4)).tolist())
+        ]
+    )
+    sklearn_service = IsolationForestScoringService(tmp_path)
+    flat_service = IsolationForestScoringService(tmp_path, scoring_engine="flat")
+    sklearn_service.train(batch)
+
+    request = ScoreRequest(
+        vehicle_id="vehicle-x", timestamp=timestamp, feature_vector=[4.0, 0, 0, -4.0]
+    )
+    expected = sklearn_service.score(request)
+    actual = flat_service.score(request)
+    assert actual.anomaly_score == pytest.approx(expected.anomaly_score, abs=1e-12)
+    assert actual.is_anomaly == expected.is_anomaly
+
+
+def test_flat_forest_round_trips_through_mapped_artifact(tmp_path):
+    rng = np.random.default_rng(11)
+    model = IsolationForest(n_estimators=30, max_features=0.5, random_state=1).fit(
+        rng.normal(size=(300, 6))
+    )
+    forest = FlatForest.from_isolation_forest(model)
+    path = tmp_path / "model.forest"
+    forest.save(path)
+
+    mapped = FlatForest.load(path)
+    assert not mapped.feature.flags.writeable  # a view over the mapping, not a copy
+    assert all(array.ctypes.data % 64 == 0 for array in (mapped.feature, mapped.threshold))
+    probe = rng.normal(scale=2.0, size=(50, 6))
+    np.testing.assert_array_equal(mapped.decision_function(probe), forest.decision_function(probe))
+
+
+def test_service_mmap_engine_uses_flat_artifact(tmp_path):
+    timestamp = datetime.now(tz=UTC)
+    rng = np.random.default_rng(5)
+    batch = TelemetryBatch(
+        records=[
+            {"vehicle_id": f"vehicle-{i}", "timestamp": timestamp, "feature_vector": row}
+            for i, row in enumerate(rng.normal(size=(64, 3)).tolist())
+        ]
+    )
+    version = IsolationForestScoringService(tmp_path).train(batch).model_version
+    assert (tmp_path / f"isolation_forest_{version}.forest").exists()
+
+    request = ScoreRequest(vehicle_id="vehicle-x", timestamp=timestamp, feature_vector=[3.0, 0, 0])
+    expected = IsolationForestScoringService(tmp_path).score(request)
+    mmap_service = IsolationForestScoringService(tmp_path, scoring_engine="mmap")
+    actual = mmap_service.score(request)
+    assert actual.anomaly_score == pytest.approx(expected.anomaly_score, abs=1e-12)
+    assert mmap_service.cache_stats().bytes == 0
@@ -40,3 +40,88 @@ def test_healthz(client: TestClient):
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
 
+
+def test_readiness_uses_cached_database_check(tmp_path, monkeypatch):
+    """Readiness reports the background check instead of querying per probe."""
+    from app.config import settings
+    from app.core import database
+    from app.main import app
+
+    monkeypatch.setattr(settings, "database_url", f"sqlite+aiosqlite:///{tmp_path / 'ready.db'}")
+    monkeypatch.setattr(settings, "debug", False)
+    monkeypatch.setattr(settings, "database_health_check_interval_seconds", 3600.0)
+    checks = []
+    original_check = database.check_database_health
+
+    async def counting_check():
+        checks.append(1)
+        return await original_check()
+
+    monkeypatch.setattr(database, "check_database_health", counting_check)
+
+    with TestClient(app) as client:
+        for _ in range(3):
+            data = client.get("/health/ready").json()
+            assert data["database"] == "connected"
+            assert data["database_checked_seconds_ago"] >= 0
+
+    assert len(checks) == 1
+
+
+def test_readiness_waits_for_model_warm_up(monkeypatch):
+    """The latest model is warmed at startup and readiness reports 503 until then."""
+    import threading
+    import time
+
+    from app.main import app
+    from app.services.scoring import IsolationForestScoringService
+    from tests.conftest import ingest
+
+    with TestClient(app) as client:
+        version = ingest(client)["model_version"]
+
+    release = threading.Event()
+    original_warm_up = IsolationForestScoringService.warm_up
+
+    def gated_warm_up(self, iterations=3):
+        release.wait(timeout=10)
+        return original_warm_up(self, iterations)
+
+    monkeypatch.setattr(IsolationForestScoringService, "warm_up", gated_warm_up)
+
+    with TestClient(app) as client:
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["warm_up"] == "running"
+
+        release.set()
+        deadline = time.monotonic() + 10
+        while client.get("/health/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        data = client.get("/health/ready").json()
+        assert (data["status"], data["warm_up"], data["model_version"]) == (
+            "ready",
+            "complete",
+            version,
+        )
+
+
+def test_readiness_stays_unavailable_when_warm_up_fails(monkeypatch):
+    import time
+
+    from app.main import app
+    from app.services.scoring import IsolationForestScoringService
+
+    def broken_warm_up(self, iterations=3):
+        raise ValueError("corrupt artifact")
+
+    monkeypatch.setattr(IsolationForestScoringService, "warm_up", broken_warm_up)
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 10
+        response = client.get("/health/ready")
+        while response.json()["warm_up"] == "running" and time.monotonic() < deadline:
+            response = client.get("/health/ready")
+        assert response.status_code == 503
+        data = response.json()
+        assert (data["status"], data["warm_up_error"]) == ("warm_up_failed", "corrupt artifact")
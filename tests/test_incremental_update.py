@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import joblib
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.domain import ScoreRequest, TelemetryBatch
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+from app.services.training_window import TrainingWindow
+from tests.conftest import ingest, sample_batch, wait_for_job
+
+
+def _batch(rows: np.ndarray) -> TelemetryBatch:
+    timestamp = datetime.now(tz=UTC)
+    return TelemetryBatch(
+        records=[
+            {"vehicle_id": f"vehicle-{i}", "timestamp": timestamp, "feature_vector": row}
+            for i, row in enumerate(rows.tolist())
+        ]
+    )
+
+
+def test_training_window_keeps_most_recent_rows(tmp_path):
+    path = tmp_path / "lineage.window.npy"
+    window = TrainingWindow.create(path, capacity=4, n_features=1)
+    window.append(np.arange(3, dtype=float).reshape(-1, 1))
+    window.append(np.arange(3, 6, dtype=float).reshape(-1, 1))
+    window.flush()
+
+    reopened = TrainingWindow.open(path, capacity=4, n_features=1)
+    assert reopened.count == 4
+    assert sorted(reopened.rows().ravel().tolist()) == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_update_replaces_oldest_trees_and_publishes_new_version(tmp_path):
+    rng = np.random.default_rng(0)
+    config = IsolationForestConfig(n_estimators=30, window_size=500, update_trees=10)
+    service = IsolationForestScoringService(tmp_path, config)
+    base = service.train(_batch(rng.normal(size=(300, 3))))
+
+    updated = service.update(_batch(rng.normal(loc=2.0, size=(40, 3))))
+
+    assert updated.model_version != base.model_version
+    assert service._read_latest_version() == updated.model_version
+    metadata = updated.metadata
+    assert (metadata.lineage, metadata.parent_version, metadata.generation) == (
+        base.model_version,
+        base.model_version,
+        1,
+    )
+    assert metadata.n_estimators == 30
+
+    old_model = joblib.load(service._model_path(base.model_version))
+    new_model = joblib.load(service._model_path(updated.model_version))
+    assert len(new_model.estimators_) == 30
+    assert new_model.estimators_[0].tree_.node_count == old_model.estimators_[10].tree_.node_count
+    np.testing.assert_array_equal(
+        new_model.estimators_[0].tree_.threshold, old_model.estimators_[10].tree_.threshold
+    )
+
+    # Scoring the updated forest still works through the normal path.
+    request = ScoreRequest(vehicle_id="v", timestamp=datetime.now(tz=UTC), feature_vector=[2, 2, 2])
+    assert service.score(request).model_version == updated.model_version
+
+
+def test_update_endpoint_runs_as_job(client: TestClient):
+    base_version = ingest(client)["model_version"]
+
+    response = client.post(f"/ingest/update?base_version={base_version}", json=sample_batch())
+    assert response.status_code == 202
+    job = wait_for_job(client, response.json()["job_id"])
+    assert job["state"] == "succeeded", job["error"]
+    assert job["result"]["metadata"]["parent_version"] == base_version
+    assert job["result"]["metadata"]["generation"] == 1
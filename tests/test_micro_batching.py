@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+from app.domain import ScoreRequest, TelemetryBatch
+from app.services.micro_batching import MicroBatcher
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+
+
+@pytest.fixture
+def service(tmp_path):
+    timestamp = datetime.now(tz=UTC)
+    rng = np.random.default_rng(2)
+    service = IsolationForestScoringService(tmp_path, IsolationForestConfig(n_estimators=25))
+    service.train(
+        TelemetryBatch(
+            records=[
+                {"vehicle_id": f"vehicle-{i}", "timestamp": timestamp, "feature_vector": row}
+                for i, row in enumerate(rng.normal(size=(64, 3)).tolist())
+            ]
+        )
+    )
+    return service
+
+
+def _requests(count: int) -> list[ScoreRequest]:
+    rng = np.random.default_rng(9)
+    return [
+        ScoreRequest(vehicle_id=f"vehicle-{i}", timestamp=datetime.now(tz=UTC), feature_vector=row)
+        for i, row in enumerate(rng.normal(scale=2.0, size=(count, 3)).tolist())
+    ]
+
+
+def test_concurrent_requests_are_scored_in_batches(service, monkeypatch):
+    passes = []
+    original = service.score_rows
+
+    def counting_score_rows(model_version, feature_matrix, shard=False):
+        passes.append(feature_matrix.shape[0])
+        return original(model_version, feature_matrix, shard)
+
+    monkeypatch.setattr(service, "score_rows", counting_score_rows)
+    batcher = MicroBatcher(service, max_batch_size=8, max_wait_seconds=0.05)
+    requests = _requests(20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.score(request) for request in requests))
+
+    responses = asyncio.run(run())
+
+    assert passes == [8, 8, 4]
+    for request, response in zip(requests, responses):
+        expected = service.score(request)
+        assert response.model_version == expected.model_version
+        assert response.anomaly_score == pytest.approx(expected.anomaly_score, abs=1e-12)
+
+
+def test_row_with_wrong_width_fails_alone(service):
+    batcher = MicroBatcher(service, max_batch_size=2, max_wait_seconds=1.0)
+    good, bad = _requests(2)
+    bad.feature_vector = [1.0, 2.0]
+
+    async def run():
+        return await asyncio.gather(batcher.score(good), batcher.score(bad), return_exceptions=True)
+
+    scored, error = asyncio.run(run())
+    assert scored.anomaly_score == pytest.approx(service.score(good).anomaly_score, abs=1e-12)
+    assert isinstance(error, ValueError)
+
+
+def test_lone_request_is_flushed_after_max_wait(service):
+    batcher = MicroBatcher(service, max_batch_size=64, max_wait_seconds=0.001)
+    (request,) = _requests(1)
+
+    response = asyncio.run(asyncio.wait_for(batcher.score(request), timeout=5))
+
+    assert response.anomaly_score == pytest.approx(service.score(request).anomaly_score, abs=1e-12)
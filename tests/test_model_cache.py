@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+
+from fastapi.testclient import TestClient
+
+from app.domain import ScoreRequest, TelemetryBatch
+from app.services.model_cache import ModelCache
+from app.services.scoring import IsolationForestScoringService, get_scoring_service
+from tests.conftest import ingest, sample_batch
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ModelCache(max_entries=2)
+    cache.get_or_load("a", lambda: ("A", 1))
+    cache.get_or_load("b", lambda: ("B", 1))
+    cache.get_or_load("a", lambda: ("A2", 1))
+    cache.get_or_load("c", lambda: ("C", 1))
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 3, 1)
+
+
+def test_byte_budget_evicts_but_keeps_newest_entry():
+    cache = ModelCache(max_entries=10, max_bytes=100)
+    cache.get_or_load("a", lambda: ("A", 60))
+    cache.get_or_load("b", lambda: ("B", 60))
+    assert len(cache) == 1
+    cache.get_or_load("huge", lambda: ("H", 500))
+    assert "huge" in cache
+    assert cache.stats().bytes == 500
+
+
+def test_concurrent_misses_load_once():
+    cache = ModelCache()
+    calls = 0
+    calls_lock = threading.Lock()
+
+    def loader():
+        nonlocal calls
+        with calls_lock:
+            calls += 1
+        time.sleep(0.05)
+        return object(), 1
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get_or_load("v1", loader), range(8)))
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_failed_load_is_not_cached():
+    cache = ModelCache()
+
+    def failing():
+        raise FileNotFoundError("missing")
+
+    for _ in range(2):
+        try:
+            cache.get_or_load("v1", failing)
+        except FileNotFoundError:
+            pass
+    assert cache.stats().misses == 2
+    assert "v1" not in cache
+
+
+def test_invalidate_discards_load_in_flight():
+    cache = ModelCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def stale_loader():
+        started.set()
+        release.wait(timeout=5)
+        return "stale", 1
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(cache.get_or_load, "v1", stale_loader)
+        assert started.wait(timeout=5)
+        cache.invalidate("v1")
+        # A caller arriving after the invalidation starts its own load.
+        assert cache.get_or_load("v1", lambda: ("fresh", 1)) == "fresh"
+        release.set()
+        assert pending.result(timeout=5) == "stale"
+
+    assert cache.get_or_load("v1", lambda: ("reloaded", 1)) == "fresh"
+
+
+def test_scoring_reuses_cached_model(client: TestClient):
+    ingest(client)
+    telemetry = {
+        "vehicle_id": "vehicle-1",
+        "timestamp": datetime.now(tz=UTC).isoformat(),
+        "feature_vector": [0.13, 0.2, 0.28],
+    }
+
+    for _ in range(3):
+        assert client.post("/score", json=telemetry).status_code == 200
+
+    stats = get_scoring_service().cache_stats()
+    assert stats.loads == 1
+    assert stats.hits == 2
+
+
+def test_preload_loads_latest_and_recent_versions(client: TestClient):
+    first = ingest(client)["model_version"]
+    second = ingest(client)["model_version"]
+    service = get_scoring_service()
+    service.model_cache.clear()
+
+    assert service.preload() == [second]
+    assert service.preload(recent=1) == [second, first]
+    assert first in service.model_cache and second in service.model_cache
+
+
+def test_watcher_hot_swaps_latest_published_by_another_process(tmp_path):
+    publisher = IsolationForestScoringService(tmp_path)
+    reader = IsolationForestScoringService(tmp_path)
+    first = publisher.train(TelemetryBatch(**sample_batch())).model_version
+    reader.start_watching(interval=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while reader._current is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        in_flight = reader._current
+        assert in_flight.version == first
+
+        second = publisher.train(TelemetryBatch(**sample_batch())).model_version
+        while reader._current.version != second and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        request = ScoreRequest(**sample_batch()["records"][0])
+        assert reader.score(request).model_version == second
+        # A request holding the previous reference still scores on that model.
+        assert in_flight.model.decision_function([request.feature_vector]).shape == (1,)
+    finally:
+        reader.stop_watching()
+
+    assert not list(tmp_path.glob(".*.tmp"))
+    assert (tmp_path / "LATEST").read_text(encoding="utf-8") == second
+
+
+class _ForbiddenLock:
+    def __enter__(self):
+        raise AssertionError("cached metadata must be read without a lock")
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def test_cached_metadata_is_read_without_a_lock(tmp_path):
+    service = IsolationForestScoringService(tmp_path)
+    version = service.train(TelemetryBatch(**sample_batch())).model_version
+    assert service._metadata_for(version).model_version == version
+
+    service._metadata_lock = _ForbiddenLock()
+    request = ScoreRequest(**sample_batch()["records"][0], model_version=version)
+    assert service.score(request).model_version == version
+    assert service._metadata_for(version).model_version == version
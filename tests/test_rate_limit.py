@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core.auth import create_access_token
+from app.core.rate_limit import (
+    InMemoryCounterStore,
+    RateLimitMiddleware,
+    SlidingWindowCounterBackend,
+    TokenBucketBackend,
+)
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limited_app(backend, monkeypatch) -> TestClient:
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, calls=2, period=60, backend=backend)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_token_bucket_limits_and_refills():
+    clock = _Clock()
+    backend = TokenBucketBackend(calls=2, period=60, clock=clock)
+
+    decisions = [asyncio.run(backend.hit("a")) for _ in range(3)]
+    assert [d.allowed for d in decisions] == [True, True, False]
+    assert decisions[2].retry_after == 30
+
+    clock.now += 30
+    assert asyncio.run(backend.hit("a")).allowed
+
+
+def test_token_bucket_evicts_idle_clients():
+    clock = _Clock()
+    backend = TokenBucketBackend(calls=5, period=60, clock=clock)
+    for index in range(100):
+        asyncio.run(backend.hit(f"client-{index}"))
+    assert len(backend) == 100
+
+    clock.now += 61
+    asyncio.run(backend.hit("fresh"))
+    assert len(backend) == 1
+
+
+def test_sliding_window_counter_with_shared_store():
+    clock = _Clock(now=600.0)
+    store = InMemoryCounterStore(clock=clock)
+    # Two "tasks" sharing one store see one combined limit.
+    task_a = SlidingWindowCounterBackend(calls=3, period=60, store=store, clock=clock)
+    task_b = SlidingWindowCounterBackend(calls=3, period=60, store=store, clock=clock)
+
+    backends = (task_a, task_b, task_a, task_b)
+    assert [asyncio.run(backend.hit("k")).allowed for backend in backends] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+
+    # Three quarters into the next window, a quarter of the previous count applies.
+    clock.now += 105
+    assert asyncio.run(task_a.hit("k")).allowed
+    assert asyncio.run(task_a.hit("k")).allowed
+    assert not asyncio.run(task_a.hit("k")).allowed
+
+    clock.now += 240
+    asyncio.run(task_a.hit("other"))
+    assert len(store) == 1
+
+
+def test_middleware_returns_429_and_skips_health(monkeypatch):
+    client = _limited_app(TokenBucketBackend(calls=2, period=60), monkeypatch)
+
+    assert [client.get("/ping").status_code for _ in range(3)] == [200, 200, 429]
+    assert client.get("/ping").headers["Retry-After"] == "30"
+    assert client.get("/healthz").status_code == 200
+
+
+def test_middleware_keys_by_forwarded_for_and_jwt_subject(monkeypatch):
+    client = _limited_app(TokenBucketBackend(calls=2, period=60), monkeypatch)
+
+    for address in ("203.0.113.1", "203.0.113.2"):
+        headers = {"X-Forwarded-For": f"10.0.0.1, {address}"}
+        statuses = [client.get("/ping", headers=headers).status_code for _ in range(3)]
+        assert statuses == [200, 200, 429]
+
+    token = create_access_token({"sub": "gateway-7"})
+    headers = {"Authorization": f"Bearer {token}", "X-Forwarded-For": "203.0.113.1"}
+    assert client.get("/ping", headers=headers).status_code == 200
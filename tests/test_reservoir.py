@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from app.services.reservoir import FeatureReservoir
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+from app.services.streaming import iter_feature_vectors
+
+
+def test_reservoir_keeps_short_streams_whole():
+    rows = np.arange(12, dtype=float).reshape(6, 2)
+    reservoir = FeatureReservoir(10, seed=0)
+    reservoir.extend(rows[:4])
+    reservoir.extend(rows[4:])
+    np.testing.assert_array_equal(reservoir.sample(), rows)
+    with pytest.raises(ValueError, match="expected 2 features, got 3"):
+        reservoir.extend(np.zeros((1, 3)))
+
+
+def test_reservoir_sample_is_uniform_over_the_stream():
+    counts = np.zeros(1_000)
+    for seed in range(200):
+        reservoir = FeatureReservoir(50, seed=seed)
+        for start in range(0, 1_000, 64):
+            stop = min(start + 64, 1_000)
+            reservoir.extend(np.arange(start, stop, dtype=float).reshape(-1, 1))
+        sample = reservoir.sample()
+        assert sample.shape == (50, 1) and reservoir.n_seen == 1_000
+        assert len(np.unique(sample)) == 50
+        counts[sample[:, 0].astype(int)] += 1
+
+    # Each row is kept with probability 50 / 1000: 10 times in 200 runs.
+    halves = counts.reshape(2, -1).sum(axis=1)
+    assert abs(halves[0] - halves[1]) < 0.1 * halves.sum()
+
+
+def test_reservoir_keeps_the_vehicle_ids_of_sampled_rows():
+    reservoir = FeatureReservoir(20, seed=3)
+    for start in range(0, 500, 64):
+        values = np.arange(start, min(start + 64, 500), dtype=float).reshape(-1, 1)
+        reservoir.extend(values, [f"v-{int(value)}" for value in values[:, 0]])
+    expected = [f"v-{int(value)}" for value in reservoir.sample()[:, 0]]
+    assert reservoir.sample_vehicle_ids() == expected
+    with pytest.raises(ValueError, match="every chunk or for none"):
+        reservoir.extend(np.zeros((1, 1)))
+
+
+def test_train_stream_fits_on_a_bounded_sample(tmp_path):
+    rng = np.random.default_rng(4)
+    lines = [
+        json.dumps(
+            {"vehicle_id": "van-1", "timestamp": 0, "feature_vector": row}
+        ).encode()
+        for row in rng.normal(size=(2_000, 3)).tolist()
+    ]
+    service = IsolationForestScoringService(
+        tmp_path,
+        IsolationForestConfig(
+            n_estimators=20, max_samples=64, max_features=0.5, n_jobs=2, reservoir_size=300
+        ),
+    )
+    trained = service.train_stream(iter_feature_vectors(lines), "sampled")
+    assert (trained.records_seen, trained.records_trained) == (2_000, 300)
+    assert trained.record_count == 300
+    assert trained.metadata.n_features == 3
+    _, _, scores = service.score_matrix(np.zeros((1, 3)), "sampled")
+    assert scores.shape == (1,)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.api.responses import batch_scores_response
+from app.domain import BatchScoreResponse, BatchScoreResult
+
+
+def test_batch_scores_response_matches_pydantic_encoding():
+    timestamps = [datetime(2024, 1, 2, 3, 4, 5, 120000, tzinfo=UTC), datetime(2024, 1, 2)]
+    timestamps[1] += timedelta(microseconds=7)
+    scores = np.array([0.25, -0.5])
+    expected = BatchScoreResponse(
+        results=[
+            BatchScoreResult(
+                index=index,
+                vehicle_id=vehicle_id,
+                timestamp=timestamp,
+                model_version="v1",
+                anomaly_score=score,
+                is_anomaly=score < 0,
+            )
+            for index, (vehicle_id, timestamp, score) in enumerate(
+                zip(["a", "b"], timestamps, scores.tolist())
+            )
+        ],
+        scored_count=2,
+        error_count=0,
+    )
+
+    response = batch_scores_response(["a", "b"], timestamps, ["v1", "v1"], scores)
+
+    assert response.body == expected.model_dump_json().encode()
+
+
+def test_scoring_routes_keep_their_response_schemas(client: TestClient):
+    paths = client.get("/openapi.json").json()["paths"]
+    for path, schema in (("/score", "ScoreResponse"), ("/score/batch", "BatchScoreResponse")):
+        content = paths[path]["post"]["responses"]["200"]["content"]
+        assert content["application/json"]["schema"] == {"$ref": f"#/components/schemas/{schema}"}
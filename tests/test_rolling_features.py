@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.domain import BatchScoreRequest, FeatureLayout, ScoreRequest, TelemetryBatch
+from app.services.rolling_features import ROLLING_STATS, RollingFeatureEngine
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+
+
+@pytest.mark.parametrize("trend", [0.0, 1.0, -1.0])
+def test_rolling_statistics_match_a_full_recompute(trend):
+    layout = FeatureLayout(raw_features=3, window=5, stats=ROLLING_STATS)
+    engine = RollingFeatureEngine(layout)
+    rows = np.random.default_rng(3).normal(scale=100.0, size=(40, 3))
+    if trend:
+        # Monotonic series (odometer, drift) keep every record in one queue.
+        rows = trend * np.cumsum(np.abs(rows), axis=0)
+    rows[10:14, 1] = rows[9, 1]  # Ties
+
+    for index, row in enumerate(rows):
+        extended = engine.update("truck-1", float(index) * 2.0, row)
+        window = rows[max(0, index - 4) : index + 1]
+        rate = (row - rows[index - 1]) / 2.0 if index else np.zeros(3)
+        expected = np.concatenate(
+            [row, window.mean(0), window.var(0), window.min(0), window.max(0), rate]
+        )
+        np.testing.assert_allclose(extended, expected, atol=1e-9)
+    assert len(layout.feature_names()) == extended.size == layout.n_features
+
+
+def test_windows_are_evicted_by_budget_and_idleness():
+    layout = FeatureLayout(raw_features=2, window=4, stats=("mean",))
+    engine = RollingFeatureEngine(layout, max_bytes=1, idle_seconds=0)
+    engine.update("a", 0.0, [1.0, 2.0])
+    engine.update("b", 0.0, [1.0, 2.0])
+    assert len(engine) == 1
+
+    engine = RollingFeatureEngine(layout, idle_seconds=0.01)
+    engine.update("a", 0.0, [1.0, 2.0])
+    time.sleep(0.02)
+    engine.update("b", 0.0, [1.0, 2.0])
+    assert len(engine) == 1
+    with pytest.raises(ValueError, match="rolling features expect 2"):
+        engine.update("b", 1.0, [1.0])
+
+
+def test_training_and_scoring_share_the_recorded_layout(tmp_path):
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    rng = np.random.default_rng(5)
+    records = [
+        {
+            "vehicle_id": f"van-{vehicle}",
+            "timestamp": start + timedelta(seconds=step),
+            "feature_vector": rng.normal(size=2).tolist(),
+        }
+        for step in range(50)
+        for vehicle in range(4)
+    ]
+    service = IsolationForestScoringService(
+        tmp_path, IsolationForestConfig(n_estimators=30, rolling_window=8)
+    )
+    trained = service.train(TelemetryBatch(records=records))
+    layout = trained.metadata.feature_layout
+    assert layout == FeatureLayout(raw_features=2, window=8, stats=ROLLING_STATS)
+    assert trained.metadata.n_features == layout.n_features == 12
+    service.warm_up()
+    assert all(len(engine) == 0 for engine in service._rolling_engines.values())
+
+    # Clients keep sending raw vectors; the service keeps the vehicle's window.
+    first = service.score(
+        ScoreRequest(vehicle_id="van-0", timestamp=start, feature_vector=[0.0, 0.0])
+    )
+    assert first.model_version == trained.model_version
+    batch = service.score_batch(
+        BatchScoreRequest(
+            records=[
+                {"vehicle_id": "van-0", "timestamp": start, "feature_vector": [0.0, 0.0]},
+                {"vehicle_id": "van-0", "timestamp": start, "feature_vector": [0.0]},
+            ]
+        )
+    )
+    assert batch.scored_count == 1
+    assert "rolling features expect 2" in batch.results[1].error
+
+    # Updates replay the batch through the base version's layout.
+    updated = service.update(TelemetryBatch(records=records[:40]))
+    assert updated.metadata.feature_layout == layout
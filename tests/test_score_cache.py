@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+from app.domain import BatchScoreRequest, ScoreRequest, TelemetryBatch
+from app.services.score_cache import ScoreCache
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+
+
+def test_quantized_keys_match_near_duplicates():
+    exact = ScoreCache()
+    quantized = ScoreCache(quantum=0.01)
+    assert exact.key("v1", [1.0, 2.0]) != exact.key("v1", [1.001, 2.0])
+    assert quantized.key("v1", [1.0, 2.0]) == quantized.key("v1", [1.001, 2.0])
+    assert quantized.key("v1", [1.0, 2.0]) != quantized.key("v2", [1.0, 2.0])
+
+
+def test_lru_and_ttl_eviction(monkeypatch):
+    cache = ScoreCache(max_entries=2, ttl_seconds=10.0)
+    now = [100.0]
+    monkeypatch.setattr("app.services.score_cache.time.monotonic", lambda: now[0])
+    keys = [cache.key("v1", [float(i)]) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, float(i))
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) == 2.0
+    now[0] += 11.0
+    assert cache.get(keys[2]) is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 1)
+    assert stats.hit_ratio == pytest.approx(1 / 3)
+
+
+def _batch(seed: int) -> TelemetryBatch:
+    rng = np.random.default_rng(seed)
+    return TelemetryBatch(
+        records=[
+            {"vehicle_id": f"vehicle-{i}", "timestamp": datetime.now(tz=UTC), "feature_vector": row}
+            for i, row in enumerate(rng.normal(size=(64, 3)).tolist())
+        ]
+    )
+
+
+def test_repeated_vectors_skip_inference_until_latest_changes(tmp_path, monkeypatch):
+    service = IsolationForestScoringService(
+        tmp_path, IsolationForestConfig(n_estimators=25), score_cache=ScoreCache()
+    )
+    first = service.train(_batch(1)).model_version
+    assert service.warm_up() == first and len(service.score_cache) == 0
+    passes = []
+    original = service._decision_scores
+    monkeypatch.setattr(
+        service,
+        "_decision_scores",
+        lambda model, matrix: passes.append(matrix.shape[0]) or original(model, matrix),
+    )
+    request = ScoreRequest(
+        vehicle_id="parked", timestamp=datetime.now(tz=UTC), feature_vector=[0.1, 0.2, 0.3]
+    )
+
+    scores = [service.score(request).anomaly_score for _ in range(3)]
+    assert passes == [1] and len(set(scores)) == 1
+
+    repeated = request.model_dump(mode="json")
+    records = [repeated, {**repeated, "vehicle_id": "moving", "feature_vector": [1, 1, 1]}]
+    response = service.score_batch(BatchScoreRequest(records=records))
+    assert passes == [1, 1]
+    assert response.results[0].anomaly_score == scores[0]
+
+    second = service.train(_batch(2)).model_version
+    assert second != first and len(service.score_cache) == 0
+    assert service.score(request).model_version == second
+    assert passes == [1, 1, 1]
@@ -1,45 +1,72 @@
 from __future__ import annotations
 
+import time
 from datetime import UTC, datetime
 
+import pytest
 from fastapi.testclient import TestClient
 
-
-def _sample_batch():
-    timestamp = datetime.now(tz=UTC).isoformat()
-    return {
-        "records": [
-            {
-                "vehicle_id": "vehicle-1",
-                "timestamp": timestamp,
-                "feature_vector": [0.1, 0.2, 0.3],
-            },
-            {
-                "vehicle_id": "vehicle-2",
-                "timestamp": timestamp,
-                "feature_vector": [0.15, 0.22, 0.31],
-            },
-            {
-                "vehicle_id": "vehicle-3",
-                "timestamp": timestamp,
-                "feature_vector": [0.12, 0.19, 0.29],
-            },
-        ]
-    }
+from app.domain import TelemetryBatch
+from app.services.scoring import IsolationForestScoringService
+from app.services.training_jobs import InMemoryJobStatusStore, TrainingJobManager
+from tests.conftest import ingest, ndjson, sample_batch, wait_for_job
 
 
 def test_ingest_creates_model(client: TestClient):
-    response = client.post("/ingest", json=_sample_batch())
-    assert response.status_code == 201
-    body = response.json()
-    assert body["record_count"] == 3
+    response = client.post("/ingest", json=sample_batch())
+    assert response.status_code == 202
+    queued = response.json()
+    assert queued["state"] in ("queued", "running")
+    assert queued["records_seen"] == 3
+    assert queued["records_trained"] is None
+
+    job = wait_for_job(client, queued["job_id"])
+    assert job["state"] == "succeeded"
+    assert job["duration_seconds"] >= 0
+    assert job["records_trained"] == 3
+    body = job["result"]
+    assert body["records_seen"] == body["records_trained"] == 3
+    # The deprecated field is still returned for older clients.
+    assert job["record_count"] == body["record_count"] == 3
     assert "model_version" in body
     assert body["metadata"]["n_features"] == 3
 
 
+def test_ingest_job_failure_is_reported(client: TestClient):
+    payload = sample_batch()
+    payload["records"][1]["feature_vector"] = [0.1, 0.2]
+
+    response = client.post("/ingest", json=payload)
+    job = wait_for_job(client, response.json()["job_id"])
+    assert job["state"] == "failed"
+    assert job["error"]
+    assert job["result"] is None
+    assert job["duration_seconds"] >= 0
+
+
+def test_job_status_is_shared_between_workers(tmp_path):
+    store = InMemoryJobStatusStore()
+    submitting, polling = TrainingJobManager(store=store), TrainingJobManager(store=store)
+    try:
+        service = IsolationForestScoringService(tmp_path)
+        job_id = submitting.submit(service, TelemetryBatch(**sample_batch())).job_id
+        deadline = time.monotonic() + 60.0
+        while (job := polling.get(job_id)) is None or job.state != "succeeded":
+            assert time.monotonic() < deadline, job
+            time.sleep(0.05)
+        assert job.result.model_version == submitting.get(job_id).result.model_version
+        assert [status.job_id for status in polling.list()] == [job_id]
+    finally:
+        submitting.shutdown()
+        polling.shutdown()
+
+
+def test_unknown_training_job_returns_404(client: TestClient):
+    assert client.get("/ingest/jobs/does-not-exist").status_code == 404
+
+
 def test_score_uses_latest_model_by_default(client: TestClient):
-    ingest_response = client.post("/ingest", json=_sample_batch())
-    model_version = ingest_response.json()["model_version"]
+    model_version = ingest(client)["model_version"]
 
     telemetry = {
         "vehicle_id": "vehicle-1",
@@ -56,8 +83,7 @@ def test_score_uses_latest_model_by_default(client: TestClient):
 
 
 def test_score_specific_version(client: TestClient):
-    ingest_response = client.post("/ingest", json=_sample_batch())
-    model_version = ingest_response.json()["model_version"]
+    model_version = ingest(client)["model_version"]
 
     telemetry = {
         "vehicle_id": "vehicle-2",
@@ -83,3 +109,107 @@ def test_score_unknown_version_returns_404(client: TestClient):
     assert response.status_code == 404
     assert "not available" in response.json()["detail"]
 
+
+def test_score_feature_width_mismatch_returns_400(client: TestClient):
+    ingest(client)
+
+    telemetry = {
+        "vehicle_id": "vehicle-2",
+        "timestamp": datetime.now(tz=UTC).isoformat(),
+        "feature_vector": [0.16, 0.21],
+    }
+
+    response = client.post("/score", json=telemetry)
+    assert response.status_code == 400
+    assert "features" in response.json()["detail"]
+
+
+def test_batch_score_preserves_order_and_reports_row_errors(client: TestClient):
+    model_version = ingest(client)["model_version"]
+    timestamp = datetime.now(tz=UTC).isoformat()
+
+    payload = {
+        "records": [
+            {"vehicle_id": "vehicle-1", "timestamp": timestamp, "feature_vector": [0.13, 0.2, 0.3]},
+            {"vehicle_id": "vehicle-2", "timestamp": timestamp, "feature_vector": []},
+            {"vehicle_id": "vehicle-3", "timestamp": timestamp, "feature_vector": [0.1, 0.2]},
+            {"vehicle_id": "vehicle-4", "timestamp": timestamp, "feature_vector": [9.0, 9.0, 9.0]},
+        ]
+    }
+    response = client.post("/score/batch", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3]
+    assert body["scored_count"] == 2
+    assert body["error_count"] == 2
+    assert body["results"][1]["error"].startswith("feature_vector")
+    assert "expects 3" in body["results"][2]["error"]
+
+    single = client.post("/score", json=payload["records"][3]).json()
+    batched = body["results"][3]
+    assert batched["model_version"] == model_version
+    assert batched["anomaly_score"] == pytest.approx(single["anomaly_score"])
+    assert batched["is_anomaly"] == single["is_anomaly"]
+
+
+def test_batch_score_unknown_version_is_per_record_error(client: TestClient):
+    payload = {
+        "model_version": "non-existent",
+        "records": [
+            {
+                "vehicle_id": "vehicle-1",
+                "timestamp": datetime.now(tz=UTC).isoformat(),
+                "feature_vector": [0.1, 0.2, 0.3],
+            }
+        ],
+    }
+    response = client.post("/score/batch", json=payload)
+    assert response.status_code == 200
+    assert "not available" in response.json()["results"][0]["error"]
+
+
+def test_ingest_stream_trains_from_ndjson(client: TestClient):
+    records = sample_batch()["records"] * 500
+    response = client.post(
+        "/ingest/stream?model_version=streamed",
+        content=ndjson(records),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 202
+    job = wait_for_job(client, response.json()["job_id"])
+    assert job["state"] == "succeeded", job["error"]
+    assert job["result"]["model_version"] == "streamed"
+    assert job["records_seen"] == job["result"]["records_seen"] == 1500
+    assert job["result"]["metadata"]["n_features"] == 3
+
+
+def test_ingest_stream_rejects_inconsistent_width(client: TestClient):
+    records = sample_batch()["records"]
+    records[2]["feature_vector"] = [0.1]
+    response = client.post(
+        "/ingest/stream", content=ndjson(records), headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "line 3: expected 3 features, got 1"
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b'{"vehicle_id": "v", "timestamp": 0, "feature_vector": [0.1, NaN, 0.3]}',
+        b'{"vehicle_id": "v", "timestamp": 0, "feature_vector": [0.1, 1e400, 0.3]}',
+        b'{"vehicle_id": "v", "timestamp": Infinity, "feature_vector": [0.1, 0.2, 0.3]}',
+    ],
+)
+def test_ingest_stream_rejects_non_finite_values(client: TestClient, line: bytes):
+    body = ndjson(sample_batch()["records"]) + line + b"\n"
+    response = client.post(
+        "/ingest/stream", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("line 4: ")
+
+
+def test_ingest_stream_requires_ndjson_content_type(client: TestClient):
+    response = client.post("/ingest/stream", json=sample_batch())
+    assert response.status_code == 415
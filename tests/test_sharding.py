@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain import TELEMETRY_MEDIA_TYPE, BatchScoreRequest, ScoreRequest, TelemetryBatch
+from app.domain.binary import encode_telemetry_frame
+from app.services.model_cache import ModelCache
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+from app.services.sharding import shard_key_function, shard_version
+from tests.conftest import wait_for_job
+
+
+def _fleet_batch(timestamp: datetime, sharded: bool = True) -> TelemetryBatch:
+    rng = np.random.default_rng(11)
+    records = []
+    for fleet, centre in (("truck", 0.0), ("van", 10.0)):
+        for i, row in enumerate(rng.normal(loc=centre, size=(60, 2)).tolist()):
+            records.append(
+                {"vehicle_id": f"{fleet}-{i}", "timestamp": timestamp, "feature_vector": row}
+            )
+    records.append({"vehicle_id": "bus-1", "timestamp": timestamp, "feature_vector": [5.0, 5.0]})
+    return TelemetryBatch(records=records, sharded=sharded)
+
+
+def test_shard_key_function():
+    assert shard_key_function("vehicle_id", "")("van-7") == "van-7"
+    segment = shard_key_function("segment", r"^([a-z]+)-")
+    assert (segment("van-7"), segment("7")) == ("van", None)
+    with pytest.raises(ValueError, match="Unknown shard key"):
+        shard_key_function("fleet", "")
+
+
+def test_records_are_routed_to_their_shard_model(tmp_path):
+    timestamp = datetime.now(tz=UTC)
+    service = IsolationForestScoringService(
+        tmp_path,
+        IsolationForestConfig(
+            n_estimators=50, shard_by="segment", shard_segment_pattern=r"^(\w+?)-"
+        ),
+        shard_cache=ModelCache(max_entries=1, name="shards"),
+    )
+    trained = service.train(_fleet_batch(timestamp))
+    version = trained.model_version
+    assert trained.metadata.shards == {
+        "truck": shard_version(version, "truck"),
+        "van": shard_version(version, "van"),
+    }
+
+    # Normal for vans, anomalous for the trucks' profile and vice versa.
+    van = service.score(
+        ScoreRequest(vehicle_id="van-1", timestamp=timestamp, feature_vector=[10.0, 10.0])
+    )
+    truck = service.score(
+        ScoreRequest(vehicle_id="truck-1", timestamp=timestamp, feature_vector=[10.0, 10.0])
+    )
+    bus = service.score(
+        ScoreRequest(vehicle_id="bus-1", timestamp=timestamp, feature_vector=[10.0, 10.0])
+    )
+    assert (van.model_version, van.is_anomaly) == (shard_version(version, "van"), False)
+    assert (truck.model_version, truck.is_anomaly) == (shard_version(version, "truck"), True)
+    assert bus.model_version == version
+
+    records = [
+        {"vehicle_id": vehicle_id, "timestamp": timestamp.isoformat(), "feature_vector": [0, 0]}
+        for vehicle_id in ("van-1", "truck-1", "van-2", "bus-1")
+    ]
+    response = service.score_batch(BatchScoreRequest(records=records))
+    assert [result.model_version for result in response.results] == [
+        shard_version(version, "van"),
+        shard_version(version, "truck"),
+        shard_version(version, "van"),
+        version,
+    ]
+    # One shard model stays resident; the other is evicted and loaded again on demand.
+    assert len(service.shard_cache) == 1
+    assert service.shard_cache.stats().evictions >= 2
+
+
+def test_ingest_trains_shards_on_request(client: TestClient, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "shard_by", "segment")
+    monkeypatch.setattr(settings, "shard_segment_pattern", r"^(\w+?)-")
+    timestamp = datetime.now(tz=UTC)
+    job = client.post("/ingest", json=_fleet_batch(timestamp).model_dump(mode="json")).json()
+    version = wait_for_job(client, job["job_id"])["result"]["model_version"]
+
+    telemetry = {"vehicle_id": "van-1", "timestamp": timestamp.isoformat(), "feature_vector": [0, 0]}
+    response = client.post("/score", json=telemetry).json()
+    assert (response["model_version"], response["is_anomaly"]) == (
+        shard_version(version, "van"),
+        True,
+    )
+    # Binary frames are routed to the same shard models as JSON records.
+    headers = {"Content-Type": TELEMETRY_MEDIA_TYPE}
+    frame = encode_telemetry_frame(["van-1"], np.array([timestamp.timestamp()]), np.zeros((1, 2)))
+    binary = client.post("/score", content=frame, headers=headers).json()
+    assert binary["model_version"] == response["model_version"]
+    assert binary["anomaly_score"] == pytest.approx(response["anomaly_score"])
+
+    frame = encode_telemetry_frame(
+        ["van-1", "bus-1"], np.full(2, timestamp.timestamp()), np.zeros((2, 2))
+    )
+    batch = client.post("/score/batch", content=frame, headers=headers).json()
+    assert [result["model_version"] for result in batch["results"]] == [
+        shard_version(version, "van"),
+        version,
+    ]
+    assert batch["results"][0]["anomaly_score"] == pytest.approx(response["anomaly_score"])
+
+
+def test_ingest_stream_builds_rolling_features_and_shards(client: TestClient, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "shard_by", "segment")
+    monkeypatch.setattr(settings, "shard_segment_pattern", r"^(\w+?)-")
+    monkeypatch.setattr(settings, "rolling_window", 4)
+    lines = [
+        json.dumps(record).encode()
+        for record in _fleet_batch(datetime.now(tz=UTC)).model_dump(mode="json")["records"]
+    ]
+    response = client.post(
+        "/ingest/stream?sharded=true",
+        content=b"\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    job = wait_for_job(client, response.json()["job_id"])
+    assert job["state"] == "succeeded", job["error"]
+    metadata = job["result"]["metadata"]
+    assert metadata["feature_layout"]["raw_features"] == 2
+    assert metadata["n_features"] == 12
+    assert set(metadata["shards"]) == {"truck", "van"}
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.config import settings
+from app.core.auth import create_access_token
+from app.domain import TelemetryBatch
+from app.services.scoring import get_scoring_service
+
+
+def _train(model_version: str) -> None:
+    rows = np.random.default_rng(2).normal(size=(64, 2)).tolist()
+    timestamp = datetime.now(tz=UTC)
+    get_scoring_service().train(
+        TelemetryBatch(
+            records=[
+                {"vehicle_id": "van-1", "timestamp": timestamp, "feature_vector": row}
+                for row in rows
+            ],
+            model_version=model_version,
+        )
+    )
+
+
+def test_stream_requires_a_token(client):
+    with pytest.raises(WebSocketDisconnect), client.websocket_connect("/score/stream"):
+        pass
+    with pytest.raises(WebSocketDisconnect), client.websocket_connect(
+        "/score/stream?token=not-a-jwt"
+    ):
+        pass
+
+
+def test_stream_scores_messages_with_the_pinned_version(client, monkeypatch):
+    monkeypatch.setattr(settings, "stream_batch_window_seconds", 0.05)
+    _train("v1")
+    token = create_access_token({"sub": "gateway-1"})
+    timestamp = datetime.now(tz=UTC).isoformat()
+
+    with client.websocket_connect(
+        "/score/stream", headers={"Authorization": f"Bearer {token}"}
+    ) as websocket:
+        ready = websocket.receive_json()
+        assert ready["type"] == "ready" and ready["model_version"] == "v1"
+
+        # LATEST moves, but the session keeps scoring with the version it pinned.
+        _train("v2")
+        record = {"vehicle_id": "van-1", "timestamp": timestamp, "feature_vector": [0.0, 0.0]}
+        websocket.send_json({**record, "id": 1, "model_version": "v2"})
+        websocket.send_json({"id": 2, "records": [record, {**record, "feature_vector": [1.0]}]})
+        websocket.send_text("not json")
+
+        first, second, third = (websocket.receive_json() for _ in range(3))
+        assert (first["id"], first["scored_count"]) == (1, 1)
+        assert first["results"][0]["model_version"] == "v1"
+        assert [result["index"] for result in second["results"]] == [0, 1]
+        assert (second["scored_count"], second["error_count"]) == (1, 1)
+        assert third["type"] == "error"
+
+
+def test_stream_rejects_unknown_versions(client):
+    token = create_access_token({"sub": "gateway-1"})
+    with client.websocket_connect(f"/score/stream?token={token}&model_version=missing") as ws:
+        assert "not available" in ws.receive_json()["detail"]
+        with pytest.raises(WebSocketDisconnect):
+            ws.receive_json()
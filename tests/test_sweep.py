@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.config import settings
+from app.domain import SweepRequest
+from app.services.scoring import IsolationForestConfig, IsolationForestScoringService
+from app.services.sweep import run_sweep, sweep_candidates
+from tests.conftest import wait_for_job
+
+
+def _records(rows: np.ndarray) -> list[dict]:
+    timestamp = datetime.now(tz=UTC)
+    return [
+        {"vehicle_id": "van-1", "timestamp": timestamp, "feature_vector": row}
+        for row in rows.tolist()
+    ]
+
+
+def test_sweep_publishes_only_the_chosen_candidate(tmp_path):
+    rng = np.random.default_rng(8)
+    service = IsolationForestScoringService(tmp_path)
+    request = SweepRequest(
+        records=_records(rng.normal(size=(300, 2))),
+        grid={"n_estimators": [5, 40], "contamination": [0.01, 0.2]},
+        model_version="swept",
+    )
+    assert len(sweep_candidates(request.grid)) == 4
+
+    trained = run_sweep(service, request, max_workers=1)
+    assert [result.index for result in trained.sweep if result.published] == [
+        trained.sweep[0].index
+    ]
+    assert trained.sweep[0].auc >= trained.sweep[-1].auc
+    assert all(result.model_bytes > 0 and result.fit_seconds > 0 for result in trained.sweep)
+    assert trained.metadata.n_estimators == trained.sweep[0].n_estimators
+    assert (trained.records_seen, trained.records_trained) == (300, 240)  # 20% held out
+    assert service.recent_versions(10) == ["swept"]
+
+    # A labelled set ranks by F1, where contamination matters.
+    normal, anomalous = rng.normal(size=(40, 2)), rng.normal(loc=6.0, size=(4, 2))
+    labelled = SweepRequest(
+        records=request.records,
+        grid=request.grid,
+        evaluation_records=_records(np.vstack([normal, anomalous])),
+        evaluation_labels=[False] * 40 + [True] * 4,
+        candidate=1,
+    )
+    trained = run_sweep(service, labelled, max_workers=1)
+    assert trained.sweep[0].f1 >= trained.sweep[-1].f1
+    assert [result.index for result in trained.sweep if result.published] == [1]
+    assert trained.metadata.contamination == 0.2
+
+
+def test_sweep_publishes_rolling_features(tmp_path):
+    rng = np.random.default_rng(2)
+    service = IsolationForestScoringService(
+        tmp_path, IsolationForestConfig(n_estimators=10, rolling_window=4)
+    )
+    request = SweepRequest(records=_records(rng.normal(size=(60, 2))), grid={"n_estimators": [5]})
+    trained = run_sweep(service, request, max_workers=1)
+    assert trained.metadata.feature_layout.raw_features == 2
+    assert trained.metadata.n_features == 12
+
+    labelled = SweepRequest(
+        records=request.records,
+        evaluation_records=_records(rng.normal(size=(6, 2))),
+        evaluation_labels=[False] * 5 + [True],
+    )
+    assert run_sweep(service, labelled, max_workers=1).metadata.n_features == 12
+
+
+def test_sweep_request_validation():
+    records = _records(np.zeros((4, 2)))
+    with pytest.raises(ValidationError, match="one each"):
+        SweepRequest(records=records, evaluation_labels=[True])
+    with pytest.raises(ValidationError, match="below the grid size"):
+        SweepRequest(records=records, candidate=1)
+    for max_samples in (0, -3, 1.5, 0.0, "all"):
+        with pytest.raises(ValidationError):
+            SweepRequest(records=records, grid={"max_samples": [max_samples]})
+    grid = SweepRequest(records=records, grid={"max_samples": [64, 0.5, 1.0, "auto"]}).grid
+    assert grid.max_samples == [64, 0.5, 1.0, "auto"]
+    assert isinstance(grid.max_samples[0], int)
+
+
+def test_sweep_endpoint_fits_candidates_in_parallel(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "sweep_max_candidates", 2)
+    monkeypatch.setattr(settings, "sweep_max_workers", 2)
+    payload = {
+        "records": _records(np.random.default_rng(9).normal(size=(100, 2))),
+        "grid": {"n_estimators": [10, 20]},
+    }
+    for record in payload["records"]:
+        record["timestamp"] = record["timestamp"].isoformat()
+
+    response = client.post("/ingest/sweep", json={**payload, "grid": {"n_estimators": [1, 2, 3]}})
+    assert response.status_code == 400
+    response = client.post("/ingest/sweep", json={**payload, "grid": {"max_samples": [0]}})
+    assert response.status_code == 422
+
+    response = client.post("/ingest/sweep", json=payload)
+    assert response.status_code == 202
+    job = wait_for_job(client, response.json()["job_id"], timeout=120.0)
+    assert job["state"] == "succeeded", job["error"]
+    assert sum(result["published"] for result in job["result"]["sweep"]) == 1
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.core.database import Base
+from app.main import app
+from app.services.telemetry_store import TelemetryRow, TelemetryWriter
+from tests.conftest import ndjson, sample_batch, wait_for_job
+
+
+def _row(index: int) -> tuple:
+    return ("score", f"vehicle-{index}", datetime.now(tz=UTC), [float(index), 1.0], "v1", 0.1)
+
+
+async def _count_rows(engine) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(TelemetryRow))).scalar_one()
+
+
+def test_writer_flushes_by_size_and_on_stop(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'telemetry.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        writer = TelemetryWriter(engine, flush_rows=4, flush_interval=60.0, max_buffered_rows=8)
+        assert not writer.use_copy
+        writer.start()
+        assert await writer.write([_row(index) for index in range(4)])
+        for _ in range(100):
+            if await _count_rows(engine) == 4:
+                break
+            await asyncio.sleep(0.01)
+        assert await _count_rows(engine) == 4
+
+        assert await writer.write([_row(4)])
+        await asyncio.sleep(0.05)
+        assert await _count_rows(engine) == 4  # below the size threshold, still buffered
+
+        await writer.stop()
+        count = await _count_rows(engine)
+        await engine.dispose()
+        return count
+
+    assert asyncio.run(scenario()) == 5
+
+
+def test_writer_drops_rows_when_database_stalls(tmp_path):
+    class StalledWriter(TelemetryWriter):
+        release: asyncio.Event
+
+        async def _write_rows(self, rows):
+            await self.release.wait()
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        writer = StalledWriter(
+            engine, flush_rows=2, flush_interval=60.0, max_buffered_rows=4, enqueue_timeout=0.05
+        )
+        writer.release = asyncio.Event()
+        writer.start()
+        assert await writer.write([_row(index) for index in range(4)])
+        accepted = await writer.write([_row(4)])
+        held = writer.held_rows
+        writer.release.set()
+        await writer.stop()
+        await engine.dispose()
+        return accepted, held, writer.held_rows
+
+    accepted, held, held_after_stop = asyncio.run(scenario())
+    assert not accepted
+    assert held == 4
+    assert held_after_stop == 0
+
+
+def test_ingest_and_score_are_persisted(tmp_path, monkeypatch):
+    database_path = tmp_path / "api.db"
+    monkeypatch.setattr(settings, "database_url", f"sqlite+aiosqlite:///{database_path}")
+    monkeypatch.setattr(settings, "debug", False)
+
+    with TestClient(app) as client:
+        batch = sample_batch()
+        response = client.post("/ingest", json=batch)
+        assert response.status_code == 202
+        wait_for_job(client, response.json()["job_id"])
+        response = client.post(
+            "/ingest/stream",
+            content=ndjson(batch["records"][:2]),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 202
+        wait_for_job(client, response.json()["job_id"])
+        record = batch["records"][0]
+        assert client.post("/score", json=record).status_code == 200
+
+    async def rows():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+        async with engine.connect() as conn:
+            result = await conn.execute(select(TelemetryRow.source, TelemetryRow.anomaly_score))
+            fetched = result.all()
+        await engine.dispose()
+        return fetched
+
+    persisted = asyncio.run(rows())
+    sources = [source for source, _ in persisted]
+    assert sources.count("ingest") == len(batch["records"]) + 2
+    assert sources.count("score") == 1
+    assert [score for source, score in persisted if source == "score"][0] is not None